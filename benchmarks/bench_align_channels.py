@@ -0,0 +1,76 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Compares aligning channels on x with consecutive outer merges (as before) and with a vectorized scatter.
+
+Every channel has its own, partially overlapping x values, like batch-level channels logged with
+different frequencies.
+
+Usage:
+
+    python -m benchmarks.bench_align_channels --channels 50 --points 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from neptunelib.utils import align_channels_on_x, merge_dataframes, _split_df_by_stems
+
+
+def synthetic_channels(channels_count, points_count):
+    columns = {}
+    for n in range(channels_count):
+        step = 1 + n % 3
+        columns['x_channel_{}'.format(n)] = np.arange(n, n + points_count * step, step, dtype=float)
+        columns['y_channel_{}'.format(n)] = np.random.random(points_count)
+    return pd.DataFrame(columns)
+
+
+def with_merges(dataframe):
+    channel_dfs, common_x = _split_df_by_stems(dataframe)
+    return merge_dataframes([common_x] + channel_dfs, on='x', how='outer')
+
+
+def measure(align, dataframe):
+    start = time.time()
+    aligned = align(dataframe)
+    return time.time() - start, aligned
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--channels', type=int, default=50)
+    parser.add_argument('--points', type=int, default=1000000)
+    parser.add_argument('--skip-merges', action='store_true', help='measure the vectorized alignment only')
+    args = parser.parse_args()
+
+    dataframe = synthetic_channels(args.channels, args.points)
+
+    vectorized_seconds, vectorized = measure(align_channels_on_x, dataframe)
+    print('{:<12} {:>8.2f} s'.format('vectorized', vectorized_seconds))
+
+    if not args.skip_merges:
+        merges_seconds, merged = measure(with_merges, dataframe)
+        print('{:<12} {:>8.2f} s'.format('merges', merges_seconds))
+        print('speedup: {:.1f}x, identical output: {}'.format(
+            merges_seconds / vectorized_seconds, merged.equals(vectorized)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Compares fetching a channel of many experiments with threads (`Project.get_numeric_channels_values`)
+and with coroutines on a single event loop (`AsyncProject.get_numeric_channels_values`).
+
+Every response of `benchmarks.stub_backend` is delayed by the given latency, to mimic a remote backend.
+
+Usage:
+
+    python -m benchmarks.bench_async --experiments 500 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.stub_backend import NAMESPACE, PROJECT_NAME, StubBackend, SyntheticProject
+from neptunelib.aio.session import AsyncSession
+from neptunelib.session import Session
+from neptunelib.transport import HttpTransport
+
+PROJECT = '{}/{}'.format(NAMESPACE, PROJECT_NAME)
+
+
+def fetch_with_threads(api_token, max_workers):
+    session = Session(api_token=api_token, swagger_spec_cache_dir=None,
+                      transport=HttpTransport(pool_size=max_workers))
+    project = session.get_projects(NAMESPACE)[PROJECT]
+    experiments = project.get_experiments(max_workers=max_workers)
+
+    start = time.time()
+    values = project.get_numeric_channels_values(experiments, 'channel_0', max_workers=max_workers)
+    return time.time() - start, len(values)
+
+
+def fetch_with_coroutines(api_token, connection_limit):
+    async def fetch():
+        async with AsyncSession(api_token=api_token, swagger_spec_cache_dir=None,
+                                connection_limit=connection_limit) as session:
+            project = (await session.get_projects(NAMESPACE))[PROJECT]
+            experiments = await project.get_experiments()
+
+            start = time.time()
+            values = await project.get_numeric_channels_values(experiments, 'channel_0')
+            return time.time() - start, len(values)
+
+    return asyncio.get_event_loop().run_until_complete(fetch())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--experiments', type=int, default=500)
+    parser.add_argument('--points', type=int, default=1000)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[4, 16, 64])
+    args = parser.parse_args()
+
+    project = SyntheticProject(experiments=args.experiments, channels=1, points=args.points)
+    with StubBackend(project, latency=args.latency) as backend:
+        print('{:<24} {:>10} {:>8}'.format('', 'time [s]', 'rows'))
+        for concurrency in args.concurrency:
+            for name, fetch in [('threads', fetch_with_threads), ('coroutines', fetch_with_coroutines)]:
+                seconds, rows = fetch(backend.api_token, concurrency)
+                print('{:<24} {:>10.2f} {:>8}'.format('{} ({})'.format(name, concurrency), seconds, rows))
+
+
+if __name__ == '__main__':
+    main()
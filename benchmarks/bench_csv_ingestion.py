@@ -0,0 +1,100 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Compares peak memory of reading a channel CSV through a decoded, buffered copy (as before) with streaming it.
+
+Each variant runs in a fresh subprocess against `benchmarks.stub_backend`, which serves a single channel
+of the given number of points (about 26 bytes per point). The peak resident set size of the subprocess
+is reported relative to its size right before the download.
+
+Usage:
+
+    python -m benchmarks.bench_csv_ingestion --points 8000000
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from io import StringIO
+
+import pandas as pd
+
+from benchmarks.stub_backend import StubBackend, SyntheticProject
+
+VARIANTS = ['buffered', 'streamed']
+
+
+def read_buffered(client, experiment_id, channel_id):
+    csv = StringIO()
+    csv.write(client.backend_swagger_client.api.getChannelValuesCSV(
+        experimentId=experiment_id, channelId=channel_id).response().incoming_response.text)
+    csv.seek(0)
+    return pd.read_csv(csv, header=None, names=['x', 'y'], dtype=float)
+
+
+def read_streamed(client, experiment_id, channel_id):
+    return pd.read_csv(client.get_channel_points_csv(experiment_id, channel_id),
+                       header=None, names=['x', 'y'], dtype=float)
+
+
+def peak_rss_bytes():
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def run_variant(variant, api_token):
+    from neptunelib.session import Session
+
+    session = Session(api_token=api_token)
+    # pylint: disable=protected-access
+    client = session._client
+    read = read_buffered if variant == 'buffered' else read_streamed
+
+    baseline = peak_rss_bytes()
+    start = time.time()
+    values = read(client, 'exp-00000000', 'channel-0')
+    seconds = time.time() - start
+
+    print(json.dumps({'seconds': seconds, 'peak_bytes': peak_rss_bytes() - baseline, 'rows': len(values)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--points', type=int, default=8000000)
+    parser.add_argument('--variant', choices=VARIANTS, help=argparse.SUPPRESS)
+    parser.add_argument('--api-token', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args.variant, args.api_token)
+        return
+
+    with StubBackend(SyntheticProject(experiments=1, channels=1, points=args.points)) as backend:
+        print('{:<10} {:>10} {:>16}'.format('', 'time [s]', 'peak memory [MB]'))
+        for variant in VARIANTS:
+            output = subprocess.check_output(
+                [sys.executable, '-m', 'benchmarks.bench_csv_ingestion',
+                 '--variant', variant, '--api-token', backend.api_token])
+            result = json.loads(output.decode().strip().splitlines()[-1])
+            print('{:<10} {:>10.2f} {:>16.1f}'.format(variant, result['seconds'], result['peak_bytes'] / 2.0 ** 20))
+
+
+if __name__ == '__main__':
+    main()
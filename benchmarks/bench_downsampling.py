@@ -0,0 +1,92 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Compares reading a long channel whole and downsampling it for plotting with downsampling it while streaming.
+
+Each variant runs in a fresh subprocess against `benchmarks.stub_backend`, which serves a single channel
+of the given number of points. The 'full' variant reads all the values with `get_numeric_channels_values`
+and downsamples them with LTTB afterwards, the other ones pass `max_points` with their downsampling method.
+The peak resident set size of the subprocess is reported relative to its size right before the download.
+
+Usage:
+
+    python -m benchmarks.bench_downsampling --points 5000000 --max-points 2000
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.stub_backend import NAMESPACE, PROJECT_NAME, StubBackend, SyntheticProject
+
+VARIANTS = ['full', 'lttb', 'minmax', 'stride']
+CHANNEL_NAME = 'channel_0'
+
+
+def peak_rss_bytes():
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def run_variant(variant, max_points, api_token):
+    from neptunelib.downsampling import downsample
+    from neptunelib.session import Session
+
+    session = Session(api_token=api_token, swagger_spec_cache_dir=None)
+    experiment = session.get_projects(NAMESPACE)['{}/{}'.format(NAMESPACE, PROJECT_NAME)].get_experiments()[0]
+
+    baseline = peak_rss_bytes()
+    start = time.time()
+    if variant == 'full':
+        values = experiment.get_numeric_channels_values(CHANNEL_NAME)
+        x, _ = downsample(values['x'].values, values[CHANNEL_NAME].values, max_points, method='lttb')
+    else:
+        values = experiment.get_numeric_channels_values(CHANNEL_NAME, max_points=max_points, downsampling=variant)
+        x = values['x'].values
+    seconds = time.time() - start
+
+    print(json.dumps({'seconds': seconds, 'peak_bytes': peak_rss_bytes() - baseline, 'points': len(x)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--points', type=int, default=5000000)
+    parser.add_argument('--max-points', type=int, default=2000)
+    parser.add_argument('--variant', choices=VARIANTS, help=argparse.SUPPRESS)
+    parser.add_argument('--api-token', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args.variant, args.max_points, args.api_token)
+        return
+
+    with StubBackend(SyntheticProject(experiments=1, channels=1, points=args.points)) as backend:
+        print('{:<10} {:>10} {:>16} {:>10}'.format('', 'time [s]', 'peak memory [MB]', 'points'))
+        for variant in VARIANTS:
+            output = subprocess.check_output(
+                [sys.executable, '-m', 'benchmarks.bench_downsampling', '--variant', variant,
+                 '--max-points', str(args.max_points), '--api-token', backend.api_token])
+            result = json.loads(output.decode().strip().splitlines()[-1])
+            print('{:<10} {:>10.2f} {:>16.1f} {:>10}'.format(
+                variant, result['seconds'], result['peak_bytes'] / 2.0 ** 20, result['points']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Compares building the leaderboard DataFrame row by row (as before), column by column,
+and column by column with a few columns picked (`columns`/`parameters`/`channels` of `Project.get_leaderboard`).
+
+Entries are generated with `benchmarks.synthetic`.
+
+Usage:
+
+    python -m benchmarks.bench_leaderboard_dataframe --entries 20000 --parameters 100 --channels 100
+"""
+
+import argparse
+import timeit
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_entry_dtos
+from neptunelib.leaderboard import LeaderboardDataFrameBuilder, leaderboard_column_names
+from neptunelib.model import LeaderboardEntry
+from neptunelib.project import Project
+from neptunelib.utils import map_keys
+
+
+def row_by_row(entries):
+    """The leaderboard DataFrame construction replaced by `LeaderboardDataFrameBuilder`."""
+
+    def make_row(entry):
+        channels = dict(
+            ('channel_{}'.format(ch.name), ch.trimmed_y) for ch in entry.channels
+        )
+
+        parameters = map_keys('parameter_{}'.format, entry.parameters)
+        properties = map_keys('property_{}'.format, entry.properties)
+
+        r = {}
+        r.update(entry.system_properties)
+        r.update(channels)
+        r.update(parameters)
+        r.update(properties)
+        return r
+
+    rows = ((n, make_row(e)) for (n, e) in enumerate(entries))
+
+    # pylint: disable=protected-access
+    df = pd.DataFrame.from_dict(data=dict(rows), orient='index')
+    return df.reindex(Project._sort_leaderboard_columns(df.columns), axis='columns')
+
+
+def column_by_column(entries):
+    # pylint: disable=protected-access
+    builder = LeaderboardDataFrameBuilder().add_all(entries)
+    return builder.build(Project._sort_leaderboard_columns(builder.column_names))
+
+
+def projected(column_names):
+    def build(entries):
+        # pylint: disable=protected-access
+        return Project._leaderboard_entries_to_dataframe(entries, column_names=column_names)
+
+    return build
+
+
+def measure(build, entries, repeat):
+    seconds = min(timeit.repeat(lambda: build(entries), number=1, repeat=repeat))
+
+    tracemalloc.start()
+    build(entries)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return seconds, peak_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entries', type=int, default=10000)
+    parser.add_argument('--parameters', type=int, default=50)
+    parser.add_argument('--channels', type=int, default=50)
+    parser.add_argument('--properties', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    entries = [
+        LeaderboardEntry(dto)
+        for dto in synthetic_entry_dtos(args.entries, args.parameters, args.channels, args.properties)
+    ]
+
+    entry_dto = entries[0].project_leaderboard_entry_dto
+    column_names = leaderboard_column_names(columns=['name', 'owner'],
+                                            parameters=[entry_dto.parameters[0].name],
+                                            channels=[entry_dto.channelsLastValues[0].channelName])
+
+    results = {}
+    for name, build in [('row_by_row', row_by_row), ('column_by_column', column_by_column),
+                        ('projected', projected(column_names))]:
+        results[name] = measure(build, entries, args.repeat)
+        print('{:<18} {:>8.3f} s {:>10.1f} MB peak'.format(name, results[name][0], results[name][1] / 2.0 ** 20))
+
+    print('speedup: {:.1f}x'.format(results['row_by_row'][0] / results['column_by_column'][0]))
+
+
+if __name__ == '__main__':
+    main()
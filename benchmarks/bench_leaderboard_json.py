@@ -0,0 +1,139 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Compares parse throughput of leaderboard pages unmarshalled by bravado into swagger models (the default)
+with decoding them from JSON into plain DTOs (`Session(raw_leaderboard=True)`), with json and with orjson.
+
+Every variant turns the bodies of recorded pages into `LeaderboardEntry` objects and reads their system
+properties. Pages are generated with `benchmarks.stub_backend.SyntheticProject` by default. Bodies of pages
+recorded from a real backend, e.g. with `curl`, can be read from a directory of *.json files instead.
+
+Usage:
+
+    python -m benchmarks.bench_leaderboard_json --entries 10000 --page-size 100
+    python -m benchmarks.bench_leaderboard_json --pages recorded_pages/
+"""
+
+import argparse
+import glob
+import json
+import os
+import timeit
+
+from bravado_core.response import IncomingResponse, unmarshal_response
+
+import neptunelib.model
+from benchmarks.stub_backend import SyntheticProject, leaderboard_spec
+from neptunelib.client import swagger_client_from_spec
+from neptunelib.model import LeaderboardEntry, leaderboard_page_from_json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class RecordedResponse(IncomingResponse):
+    def __init__(self, body):
+        self.status_code = 200
+        self.reason = 'OK'
+        self.headers = {'content-type': 'application/json'}
+        self.raw_bytes = body
+
+    @property
+    def text(self):
+        return self.raw_bytes.decode('utf-8')
+
+    def json(self, **kwargs):
+        return json.loads(self.text, **kwargs)
+
+
+def synthetic_pages(entries, page_size, parameters, channels):
+    project = SyntheticProject(experiments=entries, channels=channels, parameters=parameters)
+    return [
+        json.dumps(project.leaderboard({'offset': [str(offset)], 'limit': [str(page_size)]})).encode('utf-8')
+        for offset in range(0, entries, page_size)
+    ]
+
+
+def recorded_pages(directory):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.json'))):
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+    return pages
+
+
+def bravado_parser():
+    swagger_client = swagger_client_from_spec('leaderboard', leaderboard_spec(),
+                                              'http://localhost/api/leaderboard/swagger.json')
+    operation = swagger_client.api.getLeaderboard.operation
+    return lambda body: unmarshal_response(RecordedResponse(body), operation)
+
+
+def raw_parser(loads):
+    def parse(body):
+        default_loads, neptunelib.model.loads_json = neptunelib.model.loads_json, loads
+        try:
+            return leaderboard_page_from_json(body)
+        finally:
+            neptunelib.model.loads_json = default_loads
+
+    return parse
+
+
+def parse_pages(parse, pages):
+    entries = [LeaderboardEntry(dto) for page in pages for dto in parse(page).entries]
+    for entry in entries:
+        entry.system_properties.get('created')
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entries', type=int, default=10000)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--parameters', type=int, default=20)
+    parser.add_argument('--channels', type=int, default=20)
+    parser.add_argument('--pages', help='directory of recorded bodies of leaderboard pages')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = recorded_pages(args.pages)
+    else:
+        pages = synthetic_pages(args.entries, args.page_size, args.parameters, args.channels)
+    entry_count = len(parse_pages(raw_parser(json.loads), pages))
+    megabytes = sum(len(page) for page in pages) / 2.0 ** 20
+    print('{} pages, {} entries, {:.1f} MB of JSON'.format(len(pages), entry_count, megabytes))
+
+    variants = [('bravado', bravado_parser()), ('raw json', raw_parser(json.loads))]
+    if orjson is not None:
+        variants.append(('raw orjson', raw_parser(orjson.loads)))
+
+    results = {}
+    print('{:<12} {:>10} {:>12} {:>10}'.format('', 'time [s]', 'entries/s', 'MB/s'))
+    for name, parse in variants:
+        seconds = min(timeit.repeat(lambda parse=parse: parse_pages(parse, pages), number=1, repeat=args.repeat))
+        results[name] = seconds
+        print('{:<12} {:>10.3f} {:>12.0f} {:>10.1f}'.format(name, seconds, entry_count / seconds, megabytes / seconds))
+
+    fastest = min(results, key=results.get)
+    print('speedup of {} over bravado: {:.1f}x'.format(fastest, results['bravado'] / results[fastest]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Compares leaderboard entry models rebuilding their views on every access (as before) with cached views.
+
+The access pattern mimics `Project.get_leaderboard` followed by `Experiment.get_numeric_channels_values`
+for a few channels of every experiment. Entries are generated with `benchmarks.synthetic`.
+
+Usage:
+
+    python -m benchmarks.bench_model --entries 100000 --channels 20
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks.synthetic import synthetic_entry_dtos
+from neptunelib.model import LeaderboardEntry
+
+
+class UncachedChannelWithLastValue(object):
+    def __init__(self, channel_with_value_dto):
+        self.channel_with_value_dto = channel_with_value_dto
+
+    @property
+    def id(self):
+        return self.channel_with_value_dto.channelId
+
+    @property
+    def name(self):
+        return self.channel_with_value_dto.channelName
+
+
+class UncachedLeaderboardEntry(object):
+    def __init__(self, project_leaderboard_entry_dto):
+        self.project_leaderboard_entry_dto = project_leaderboard_entry_dto
+
+    @property
+    def channels(self):
+        return [UncachedChannelWithLastValue(ch) for ch in self.project_leaderboard_entry_dto.channelsLastValues]
+
+    @property
+    def channels_dict_by_name(self):
+        return dict(
+            (ch.name, ch) for ch in self.channels
+        )
+
+    @property
+    def parameters(self):
+        return dict(
+            (p.name, p.value) for p in self.project_leaderboard_entry_dto.parameters
+        )
+
+    @property
+    def properties(self):
+        return dict(
+            (p.key, p.value) for p in self.project_leaderboard_entry_dto.properties
+        )
+
+
+def access_views(entries, channel_names):
+    for entry in entries:
+        for _ in entry.channels:
+            pass
+        entry.parameters.get('')
+        entry.properties.get('')
+        for channel_name in channel_names:
+            _ = entry.channels_dict_by_name[channel_name].id
+
+
+def measure(entry_class, entry_dtos, channel_names):
+    gc.collect()
+    start = time.time()
+    entries = [entry_class(dto) for dto in entry_dtos]
+    access_views(entries, channel_names)
+    seconds = time.time() - start
+
+    # The second pass shows the cost of repeated accesses alone.
+    start = time.time()
+    access_views(entries, channel_names)
+    repeated_seconds = time.time() - start
+
+    del entries
+    gc.collect()
+    tracemalloc.start()
+    entries = [entry_class(dto) for dto in entry_dtos]
+    access_views(entries, channel_names)
+    retained_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return seconds, repeated_seconds, retained_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entries', type=int, default=100000)
+    parser.add_argument('--parameters', type=int, default=10)
+    parser.add_argument('--channels', type=int, default=20)
+    parser.add_argument('--properties', type=int, default=5)
+    parser.add_argument('--requested-channels', type=int, default=5)
+    args = parser.parse_args()
+
+    entry_dtos = synthetic_entry_dtos(args.entries, args.parameters, args.channels, args.properties)
+    channel_names = [ch.channelName for ch in entry_dtos[0].channelsLastValues[:args.requested_channels]]
+
+    print('{:<26} {:>10} {:>10} {:>12}'.format('', 'first [s]', 'again [s]', 'retained [MB]'))
+    for name, entry_class in [('rebuilt on every access', UncachedLeaderboardEntry),
+                              ('cached', LeaderboardEntry)]:
+        seconds, repeated_seconds, retained_bytes = measure(entry_class, entry_dtos, channel_names)
+        print('{:<26} {:>10.2f} {:>10.2f} {:>12.1f}'.format(
+            name, seconds, repeated_seconds, retained_bytes / 2.0 ** 20))
+
+
+if __name__ == '__main__':
+    main()
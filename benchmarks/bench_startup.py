@@ -0,0 +1,96 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Measures how long it takes to create a session and make the first call with it.
+
+Every variant runs in a fresh subprocess against `benchmarks.stub_backend`, delaying each response
+by the given latency to mimic a remote backend:
+
+* eager - specs are downloaded and the API token is exchanged when the session is created (as before),
+* lazy, cold cache - the first call downloads the specs and stores them on disk,
+* lazy, warm cache - the first call reads the specs from disk.
+
+Usage:
+
+    python -m benchmarks.bench_startup --latency 0.1
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.stub_backend import NAMESPACE, StubBackend, SyntheticProject
+
+VARIANTS = [('eager', 'eager'), ('lazy, cold cache', 'lazy'), ('lazy, warm cache', 'lazy')]
+
+
+def run_variant(variant, api_token, spec_cache_dir):
+    start = time.time()
+    from neptunelib.session import Session
+    import_seconds = time.time() - start
+
+    start = time.time()
+    if variant == 'eager':
+        session = Session(api_token=api_token, swagger_spec_cache_dir=None)
+        # pylint: disable=protected-access,pointless-statement
+        session._client.backend_swagger_client
+        session._client.leaderboard_swagger_client
+    else:
+        session = Session(api_token=api_token, swagger_spec_cache_dir=spec_cache_dir)
+    session_seconds = time.time() - start
+
+    start = time.time()
+    session.get_projects(NAMESPACE)
+    first_call_seconds = time.time() - start
+
+    print(json.dumps({'import': import_seconds, 'session': session_seconds, 'first_call': first_call_seconds}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency', type=float, default=0.1)
+    parser.add_argument('--variant', help=argparse.SUPPRESS)
+    parser.add_argument('--api-token', help=argparse.SUPPRESS)
+    parser.add_argument('--spec-cache-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args.variant, args.api_token, args.spec_cache_dir)
+        return
+
+    spec_cache_dir = tempfile.mkdtemp()
+    try:
+        with StubBackend(SyntheticProject(experiments=1), latency=args.latency) as backend:
+            print('{:<18} {:>10} {:>12} {:>16} {:>9}'.format(
+                '', 'import [s]', 'session [s]', 'first call [s]', 'requests'))
+            for name, variant in VARIANTS:
+                backend.reset_requests()
+                output = subprocess.check_output(
+                    [sys.executable, '-m', 'benchmarks.bench_startup', '--variant', variant,
+                     '--api-token', backend.api_token, '--spec-cache-dir', spec_cache_dir])
+                result = json.loads(output.decode().strip().splitlines()[-1])
+                print('{:<18} {:>10.2f} {:>12.2f} {:>16.2f} {:>9}'.format(
+                    name, result['import'], result['session'], result['first_call'], len(backend.requests)))
+    finally:
+        shutil.rmtree(spec_cache_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,486 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""A local stub of the Neptune backend for benchmarks.
+
+The stub serves swagger specs of the backend and leaderboard APIs, exchanges API tokens for OAuth tokens,
+and serves paginated leaderboards and channel/metrics CSVs of a synthetic project, generated on the fly.
+
+Usage:
+
+    >>> with StubBackend(SyntheticProject(experiments=1000, channels=10, points=10000)) as backend:
+    ...     session = Session(api_token=backend.api_token)
+"""
+
+import base64
+import json
+import os
+import re
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qs, urlparse
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qs, urlparse
+
+import jwt
+import numpy as np
+
+NAMESPACE = 'bench'
+PROJECT_NAME = 'stub'
+CSV_BLOCK_SIZE = 2 ** 16
+FINISHED_STATES = ['succeeded', 'failed', 'aborted']
+
+
+def _definitions():
+    string = {'type': 'string'}
+    integer = {'type': 'integer', 'format': 'int64'}
+    number = {'type': 'number', 'format': 'double'}
+
+    def strings(*names):
+        return dict((name, string) for name in names)
+
+    return {
+        'NeptuneOauthToken': {'type': 'object', 'properties': strings('accessToken', 'refreshToken', 'username')},
+        'ProjectDTO': {'type': 'object', 'properties': strings('id', 'name', 'organizationName')},
+        'ProjectListDTO': {
+            'type': 'object',
+            'properties': {'entries': {'type': 'array', 'items': {'$ref': '#/definitions/ProjectDTO'}}}
+        },
+        'RegisteredMemberInfoDTO': {'type': 'object', 'properties': strings('username', 'firstName', 'lastName')},
+        'ProjectMemberDTO': {
+            'type': 'object',
+            'properties': {
+                'role': string,
+                'registeredMemberInfo': {'$ref': '#/definitions/RegisteredMemberInfoDTO'}
+            }
+        },
+        'KeyValueProperty': {'type': 'object', 'properties': strings('key', 'value')},
+        'Parameter': {'type': 'object', 'properties': strings('id', 'name', 'parameterType', 'value')},
+        'ChannelWithValueDTO': {
+            'type': 'object',
+            'properties': dict(strings('channelId', 'channelName', 'channelType', 'y'), x=number)
+        },
+        'LeaderboardEntryDTO': {
+            'type': 'object',
+            'properties': dict(
+                strings('id', 'shortId', 'entryType', 'projectId', 'state', 'name', 'description', 'owner',
+                        'environment', 'workerType', 'commitId', 'organizationName', 'projectName'),
+                timeOfCreation={'type': 'string', 'format': 'date-time'},
+                timeOfCompletion={'type': 'string', 'format': 'date-time'},
+                runningTime=integer,
+                size=integer,
+                sourceSize=integer,
+                tags={'type': 'array', 'items': string},
+                properties={'type': 'array', 'items': {'$ref': '#/definitions/KeyValueProperty'}},
+                parameters={'type': 'array', 'items': {'$ref': '#/definitions/Parameter'}},
+                channelsLastValues={'type': 'array', 'items': {'$ref': '#/definitions/ChannelWithValueDTO'}}
+            )
+        },
+        'LeaderboardEntries': {
+            'type': 'object',
+            'properties': {
+                'entries': {'type': 'array', 'items': {'$ref': '#/definitions/LeaderboardEntryDTO'}},
+                'matchingItemCount': integer
+            }
+        }
+    }
+
+
+def _operation(operation_id, parameters, schema=None, produces='application/json'):
+    response = {'description': ''}
+    if schema is not None:
+        response['schema'] = schema
+    return {
+        'operationId': operation_id,
+        'tags': ['api'],
+        'produces': [produces],
+        'parameters': parameters,
+        'responses': {'200': response}
+    }
+
+
+def _path_parameter(name):
+    return {'name': name, 'in': 'path', 'type': 'string', 'required': True}
+
+
+def _query_parameter(name, parameter_type='string', array=False):
+    if array:
+        return {'name': name, 'in': 'query', 'type': 'array', 'items': {'type': parameter_type},
+                'collectionFormat': 'multi', 'required': False}
+    return {'name': name, 'in': 'query', 'type': parameter_type, 'required': False}
+
+
+def backend_spec():
+    return {
+        'swagger': '2.0',
+        'info': {'title': 'Stub Neptune backend', 'version': '1'},
+        'basePath': '/api/backend',
+        'definitions': _definitions(),
+        'paths': {
+            '/v1/authorization/oauth-token': {'get': _operation(
+                'exchangeApiToken',
+                [{'name': 'X-Neptune-Api-Token', 'in': 'header', 'type': 'string', 'required': True}],
+                {'$ref': '#/definitions/NeptuneOauthToken'})},
+            '/v1/organizations/{organizationName}/projects': {'get': _operation(
+                'listProjectsInOrganization',
+                [_path_parameter('organizationName')],
+                {'$ref': '#/definitions/ProjectListDTO'})},
+            '/v1/projects/members': {'get': _operation(
+                'listProjectMembers',
+                [_query_parameter('projectIdentifier')],
+                {'type': 'array', 'items': {'$ref': '#/definitions/ProjectMemberDTO'}})},
+            '/v1/experiments/{experimentId}/channels/{channelId}/csv': {'get': _operation(
+                'getChannelValuesCSV',
+                [_path_parameter('experimentId'), _path_parameter('channelId')],
+                produces='text/csv')},
+            '/v1/experiments/{experimentId}/system/metrics/csv': {'get': _operation(
+                'getSystemMetricsCSV',
+                [_path_parameter('experimentId')],
+                produces='text/csv')}
+        }
+    }
+
+
+def leaderboard_spec():
+    parameters = [
+        _query_parameter('projectIdentifier'),
+        _query_parameter('entryType', array=True),
+        _query_parameter('shortId', array=True),
+        _query_parameter('groupShortId', array=True),
+        _query_parameter('state', array=True),
+        _query_parameter('owner', array=True),
+        _query_parameter('tags', array=True),
+        _query_parameter('minRunningTimeSeconds', 'integer'),
+        _query_parameter('sortBy', array=True),
+        _query_parameter('sortFieldType', array=True),
+        _query_parameter('sortDirection', array=True),
+        _query_parameter('limit', 'integer'),
+        _query_parameter('offset', 'integer')
+    ]
+    return {
+        'swagger': '2.0',
+        'info': {'title': 'Stub Neptune leaderboard', 'version': '1'},
+        'basePath': '/api/leaderboard',
+        'definitions': _definitions(),
+        'paths': {
+            '/v1/leaderboard': {'get': _operation(
+                'getLeaderboard', parameters, {'$ref': '#/definitions/LeaderboardEntries'})}
+        }
+    }
+
+
+class SyntheticProject(object):
+    """A project of experiments sharing parameter, channel and property names.
+
+    Channel values and hardware metrics are generated on the fly, deterministically for a given seed.
+    """
+
+    def __init__(self, experiments=100, channels=10, points=1000, parameters=10, properties=5,
+                 metrics_points=1000, running_fraction=0.0, seed=0):
+        self.channels_count = channels
+        self.points = points
+        self.metrics_points = metrics_points
+        self.seed = seed
+
+        random = np.random.RandomState(seed)
+        created = datetime(2019, 1, 1)
+        running_count = int(experiments * running_fraction)
+
+        self.entries = []
+        for n in range(experiments):
+            running = n >= experiments - running_count
+            experiment_created = created + timedelta(minutes=n)
+            self.entries.append({
+                'id': 'exp-{:08d}'.format(n),
+                'shortId': 'STB-{}'.format(n + 1),
+                'entryType': 'experiment',
+                'projectId': 'project',
+                'organizationName': NAMESPACE,
+                'projectName': PROJECT_NAME,
+                'state': 'running' if running else FINISHED_STATES[n % len(FINISHED_STATES)],
+                'name': 'experiment {}'.format(n),
+                'description': '',
+                'owner': 'user-{}'.format(n % 5),
+                'environment': 'stub',
+                'workerType': 'cpu',
+                'commitId': '',
+                'timeOfCreation': experiment_created.isoformat() + 'Z',
+                'timeOfCompletion': None if running else (experiment_created + timedelta(hours=1)).isoformat() + 'Z',
+                'runningTime': 3600,
+                'size': 1024,
+                'sourceSize': 512,
+                'tags': ['tag-{}'.format(n % 3)],
+                'properties': [{'key': 'property_{}'.format(i), 'value': str(n)} for i in range(properties)],
+                'parameters': [
+                    {'id': str(i), 'name': 'param_{}'.format(i), 'parameterType': 'double',
+                     'value': repr(float(random.uniform(0, 1)))}
+                    for i in range(parameters)
+                ],
+                'channelsLastValues': [
+                    {'channelId': 'channel-{}'.format(i), 'channelName': 'channel_{}'.format(i),
+                     'channelType': 'numeric', 'x': float(points - 1), 'y': repr(float(random.uniform(0, 1)))}
+                    for i in range(channels)
+                ]
+            })
+        self._entries_by_id = dict((entry['id'], entry) for entry in self.entries)
+
+    def experiment(self, experiment_id):
+        return self._entries_by_id.get(experiment_id)
+
+    def leaderboard(self, params):
+        entries = self.entries
+        filters = [('shortId', 'shortId'), ('state', 'state'), ('owner', 'owner')]
+        for param, field in filters:
+            if param in params:
+                entries = [e for e in entries if e[field] in params[param]]
+        if 'tags' in params:
+            entries = [e for e in entries if set(e['tags']) & set(params['tags'])]
+        if 'entryType' in params:
+            entries = [e for e in entries if e['entryType'] in params['entryType']]
+
+        sort_by = params.get('sortBy', ['shortId'])[0]
+        sort_field_type = params.get('sortFieldType', ['native'])[0]
+        descending = params.get('sortDirection', ['ascending'])[0] == 'descending'
+        if sort_by == 'shortId':
+            entries = sorted(entries, key=lambda e: int(e['shortId'].split('-')[1]), reverse=descending)
+        elif sort_field_type == 'native':
+            entries = sorted(entries, key=lambda e: e[sort_by], reverse=descending)
+        else:
+            # Entries are kept in the order of short ids within equal values, and ones without values go last.
+            values = [_user_defined_value(e, sort_field_type, sort_by) for e in entries]
+            with_values = [(v, e) for v, e in zip(values, entries) if v is not None]
+            entries = [e for _, e in sorted(with_values, key=lambda item: item[0], reverse=descending)] + \
+                [e for v, e in zip(values, entries) if v is None]
+
+        offset = int(params.get('offset', ['0'])[0])
+        limit = int(params.get('limit', [str(len(entries))])[0])
+        return {'entries': entries[offset:offset + limit], 'matchingItemCount': len(entries)}
+
+    def channel_csv_blocks(self, experiment_id, channel_id):
+        n = int(experiment_id.split('-')[1])
+        i = int(channel_id.split('-')[1])
+        return _csv_blocks(self.points, seed=(self.seed, n, i), x_format='{}')
+
+    def metrics_csv_blocks(self, experiment_id):
+        n = int(experiment_id.split('-')[1])
+        names = ['ram', 'cpu', 'gpu_util_0', 'gpu_mem_0']
+        header = ','.join('x_{0},y_{0}'.format(name) for name in names) + '\n'
+        yield header.encode()
+
+        random = np.random.RandomState((self.seed, n))
+        for start in range(0, self.metrics_points, CSV_BLOCK_SIZE):
+            stop = min(start + CSV_BLOCK_SIZE, self.metrics_points)
+            xs = np.arange(start, stop) * 1000
+            values = random.uniform(0, 100, size=(stop - start, len(names)))
+            lines = [','.join('{},{:.3f}'.format(x, v) for v in row) for x, row in zip(xs, values)]
+            yield ('\n'.join(lines) + '\n').encode()
+
+
+def _user_defined_value(entry, sort_field_type, name):
+    if sort_field_type == 'numericChannels':
+        values = [float(c['y']) for c in entry['channelsLastValues'] if c['channelName'] == name]
+    elif sort_field_type == 'parameter':
+        values = [float(p['value']) for p in entry['parameters'] if p['name'] == name]
+    else:
+        values = [p['value'] for p in entry['properties'] if p['key'] == name]
+    return values[0] if values else None
+
+
+def _csv_blocks(points, seed, x_format):
+    random = np.random.RandomState(seed)
+    for start in range(0, points, CSV_BLOCK_SIZE):
+        stop = min(start + CSV_BLOCK_SIZE, points)
+        ys = random.uniform(0, 1, size=stop - start)
+        lines = [(x_format + ',{!r}').format(x, y) for x, y in zip(range(start, stop), ys.tolist())]
+        yield ('\n'.join(lines) + '\n').encode()
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class StubBackend(object):
+    """Serves a `SyntheticProject` over HTTP on a local port, in a background thread.
+
+    Attributes:
+        api_address(str): Address of the stub.
+        api_token(str): An API token of the stub, accepted by `neptunelib.session.Session`.
+        requests(list): (method, operation) of every served request, in order.
+        latency(float): Number of seconds every response is delayed by, to mimic a remote backend.
+    """
+
+    def __init__(self, project, host='127.0.0.1', port=0, token_lifetime=3600, latency=0.0):
+        self.project = project
+        self.token_lifetime = token_lifetime
+        self.latency = latency
+        self.requests = []
+        self._requests_lock = threading.Lock()
+        self._server = _ThreadingHTTPServer((host, port), _handler_class(self))
+        self._thread = None
+        # The stub speaks plain HTTP, which oauthlib refuses to send tokens over unless told otherwise.
+        os.environ.setdefault('OAUTHLIB_INSECURE_TRANSPORT', '1')
+
+    @property
+    def api_address(self):
+        host, port = self._server.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+    @property
+    def api_token(self):
+        token = {'api_address': self.api_address, 'api_key': 'stub'}
+        return base64.b64encode(json.dumps(token).encode()).decode()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_):
+        self.stop()
+
+    def reset_requests(self):
+        with self._requests_lock:
+            del self.requests[:]
+
+    def operation_counts(self):
+        counts = {}
+        with self._requests_lock:
+            for _, operation in self.requests:
+                counts[operation] = counts.get(operation, 0) + 1
+        return counts
+
+    def record(self, method, operation):
+        with self._requests_lock:
+            self.requests.append((method, operation))
+
+    def oauth_tokens(self):
+        issuer = '{}/auth/realms/neptune'.format(self.api_address)
+        claims = {'exp': int(time.time()) + self.token_lifetime, 'azp': 'neptune-cli', 'iss': issuer}
+        return {
+            'accessToken': _decoded(jwt.encode(claims, 'stub', algorithm='HS256')),
+            'refreshToken': _decoded(jwt.encode(dict(claims, typ='Refresh'), 'stub', algorithm='HS256')),
+            'username': 'stub'
+        }
+
+
+def _decoded(token):
+    return token.decode() if isinstance(token, bytes) else token
+
+
+def _handler_class(backend):
+    project = backend.project
+
+    routes = [
+        ('GET', r'/api/backend/swagger.json$', 'backendSwagger', lambda handler: handler.send_json(backend_spec())),
+        ('GET', r'/api/leaderboard/swagger.json$', 'leaderboardSwagger',
+         lambda handler: handler.send_json(leaderboard_spec())),
+        ('GET', r'/api/backend/v1/authorization/oauth-token$', 'exchangeApiToken',
+         lambda handler: handler.send_json(backend.oauth_tokens())),
+        ('POST', r'/auth/realms/neptune/protocol/openid-connect/token$', 'refreshToken',
+         lambda handler: handler.send_refreshed_token()),
+        ('GET', r'/api/backend/v1/organizations/(?P<namespace>[^/]+)/projects$', 'listProjectsInOrganization',
+         lambda handler, namespace: handler.send_json(
+             {'entries': [{'id': 'project', 'name': PROJECT_NAME, 'organizationName': NAMESPACE}]
+                         if namespace == NAMESPACE else []})),
+        ('GET', r'/api/backend/v1/projects/members$', 'listProjectMembers',
+         lambda handler: handler.send_json([{'role': 'manager', 'registeredMemberInfo': {'username': 'user-0'}}])),
+        ('GET', r'/api/backend/v1/experiments/(?P<experiment_id>[^/]+)/channels/(?P<channel_id>[^/]+)/csv$',
+         'getChannelValuesCSV',
+         lambda handler, experiment_id, channel_id: handler.send_chunked(
+             project.channel_csv_blocks(experiment_id, channel_id), 'text/csv')),
+        ('GET', r'/api/backend/v1/experiments/(?P<experiment_id>[^/]+)/system/metrics/csv$', 'getSystemMetricsCSV',
+         lambda handler, experiment_id: handler.send_chunked(project.metrics_csv_blocks(experiment_id), 'text/csv')),
+        ('GET', r'/api/leaderboard/v1/leaderboard$', 'getLeaderboard',
+         lambda handler: handler.send_json(project.leaderboard(handler.query))),
+    ]
+    routes = [(method, re.compile(pattern), operation, handle) for method, pattern, operation, handle in routes]
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            self.dispatch('GET')
+
+        def do_POST(self):
+            self.dispatch('POST')
+
+        def dispatch(self, method):
+            url = urlparse(self.path)
+            self.query = parse_qs(url.query)
+            for route_method, pattern, operation, handle in routes:
+                match = pattern.match(url.path)
+                if route_method == method and match:
+                    backend.record(method, operation)
+                    if backend.latency:
+                        time.sleep(backend.latency)
+                    try:
+                        handle(self, **match.groupdict())
+                    except (socket.error, IOError):
+                        # The client stopped reading the response.
+                        self.close_connection = True
+                    return
+            self.send_json({'message': 'Not found: {}'.format(url.path)}, status=404)
+
+        def send_json(self, body, status=200):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def send_chunked(self, blocks, content_type):
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for block in blocks:
+                if block:
+                    self.wfile.write('{:x}\r\n'.format(len(block)).encode() + block + b'\r\n')
+            self.wfile.write(b'0\r\n\r\n')
+
+        def send_refreshed_token(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            self.rfile.read(length)
+            tokens = backend.oauth_tokens()
+            self.send_json({
+                'access_token': tokens['accessToken'],
+                'refresh_token': tokens['refreshToken'],
+                'token_type': 'bearer',
+                'expires_in': backend.token_lifetime
+            })
+
+        def log_message(self, *_):
+            pass
+
+    return Handler
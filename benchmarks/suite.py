@@ -0,0 +1,320 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Runs timed scenarios of the public API against `benchmarks.stub_backend`, and stores their results
+as JSON, to be compared with the results of another revision.
+
+Scenarios:
+
+* session_startup_cold - `Session()` and its first call, downloading the API specs,
+* session_startup_warm - `Session()` and its first call, reading the API specs from disk,
+* get_leaderboard - `Project.get_leaderboard` of all experiments,
+* get_experiments - `Project.get_experiments` of all experiments,
+* get_numeric_channels_values - `Experiment.get_numeric_channels_values` of all channels of an experiment,
+* project_numeric_channels_values - `Project.get_numeric_channels_values` of a channel of many experiments,
+* get_hardware_utilization - `Experiment.get_hardware_utilization`.
+
+The synthetic project is generated from a fixed seed, so runs with the same configuration fetch the same data.
+Every scenario is run once to warm up, then timed `--repeat` times; the fastest run is compared.
+Scenarios of the small project take tens of milliseconds and vary by 10-20% between runs,
+so compare results of the medium or large one before drawing conclusions from small differences.
+
+Usage:
+
+    python -m benchmarks.suite --size medium --output benchmarks/results/master.json
+    python -m benchmarks.suite --size medium --compare benchmarks/results/master.json
+
+With `--compare`, the exit status is 1 when a scenario got slower than the baseline by more than `--tolerance`.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+from collections import OrderedDict
+from datetime import datetime
+
+from benchmarks.stub_backend import NAMESPACE, PROJECT_NAME, StubBackend, SyntheticProject
+from neptunelib.instrumentation import Instrumentation
+from neptunelib.session import Session
+
+PROJECT = '{}/{}'.format(NAMESPACE, PROJECT_NAME)
+
+RESULTS_FORMAT_VERSION = 1
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+DEFAULT_TOLERANCE = 0.2
+
+SIZES = OrderedDict([
+    ('small', dict(experiments=100, channels=5, points=1000, metrics_points=1000)),
+    ('medium', dict(experiments=1000, channels=10, points=10000, metrics_points=10000)),
+    ('large', dict(experiments=10000, channels=20, points=100000, metrics_points=100000)),
+])
+
+
+class Scenario(object):
+    """A timed call of the API.
+
+    `setup` is called with the benchmark context before every run and returns the arguments of `run`,
+    so only `run` is timed.
+    """
+
+    def __init__(self, name, run, setup=None):
+        self.name = name
+        self.run = run
+        self.setup = setup or (lambda context: ())
+
+
+class BenchmarkContext(object):
+    """A stub backend with a session connected to it, shared by the scenarios.
+
+    All sessions of the context record their requests with the same instrumentation.
+    """
+
+    def __init__(self, backend, spec_cache_dir, config):
+        self.backend = backend
+        self.spec_cache_dir = spec_cache_dir
+        self.config = config
+        self.instrumentation = Instrumentation()
+        self.session = self.new_session(spec_cache_dir)
+        self.project = self.session.get_projects(NAMESPACE)[PROJECT]
+        self.experiment = self.project.get_experiments(id=['STB-1'])[0]
+
+    def new_session(self, spec_cache_dir):
+        return Session(api_token=self.backend.api_token, swagger_spec_cache_dir=spec_cache_dir,
+                       instrumentation=self.instrumentation)
+
+    def sample_experiments(self):
+        ids = ['STB-{}'.format(n + 1) for n in range(min(self.config['channel_experiments'],
+                                                          self.config['experiments']))]
+        return self.project.get_experiments(id=ids)
+
+
+def _start_session(context, spec_cache_dir):
+    session = context.new_session(spec_cache_dir)
+    session.get_projects(NAMESPACE)
+    return session
+
+
+def _channel_names(context):
+    return ['channel_{}'.format(i) for i in range(context.config['channels'])]
+
+
+SCENARIOS = [
+    Scenario('session_startup_cold', lambda context: _start_session(context, None),
+             setup=lambda context: (context,)),
+    Scenario('session_startup_warm', lambda context: _start_session(context, context.spec_cache_dir),
+             setup=lambda context: (context,)),
+    Scenario('get_leaderboard', lambda project: project.get_leaderboard(),
+             setup=lambda context: (context.project,)),
+    Scenario('get_experiments', lambda project: project.get_experiments(),
+             setup=lambda context: (context.project,)),
+    Scenario('get_numeric_channels_values',
+             lambda experiment, channel_names: experiment.get_numeric_channels_values(*channel_names),
+             setup=lambda context: (context.experiment, _channel_names(context))),
+    Scenario('project_numeric_channels_values',
+             lambda project, experiments: project.get_numeric_channels_values(experiments, 'channel_0'),
+             setup=lambda context: (context.project, context.sample_experiments())),
+    Scenario('get_hardware_utilization', lambda experiment: experiment.get_hardware_utilization(),
+             setup=lambda context: (context.experiment,)),
+]
+
+
+def run_scenario(scenario, context, repeat, warmup=1):
+    """Runs a scenario `warmup` times, then times it `repeat` times.
+
+    Returns:
+        dict: Durations of the timed runs in seconds, with the fastest and median ones, and the numbers
+            of requests of every API operation and of received bytes in a single run.
+    """
+    for _ in range(warmup):
+        scenario.run(*scenario.setup(context))
+
+    seconds = []
+    requests = {}
+    bytes_received = 0
+    for _ in range(repeat):
+        args = scenario.setup(context)
+        gc.collect()
+        context.backend.reset_requests()
+        context.instrumentation.reset()
+        start = timeit.default_timer()
+        scenario.run(*args)
+        seconds.append(timeit.default_timer() - start)
+        requests = context.backend.operation_counts()
+        bytes_received = sum(request['bytes_received']
+                             for request in context.instrumentation.to_dict()['requests'].values())
+
+    ordered = sorted(seconds)
+    return {
+        'seconds': seconds,
+        'min_seconds': ordered[0],
+        'median_seconds': ordered[len(ordered) // 2],
+        'requests': requests,
+        'bytes_received': bytes_received
+    }
+
+
+def run_suite(config, scenario_names=None, repeat=5, warmup=1, report=None):
+    """Runs the scenarios against a stub backend serving a synthetic project of the given configuration.
+
+    Args:
+        config(dict): Size of the project: 'experiments', 'channels', 'points', 'metrics_points',
+            and 'channel_experiments', 'latency' and 'seed'.
+        scenario_names(list): Names of the scenarios to run. All of them are run when omitted.
+        repeat(int): Number of timed runs of every scenario.
+        warmup(int): Number of untimed runs of every scenario before the timed ones.
+        report(function): Called with the name and the result of every scenario once it has been run.
+
+    Returns:
+        dict: The results, as stored by `store_results`.
+    """
+    scenarios = [s for s in SCENARIOS if scenario_names is None or s.name in scenario_names]
+    project = SyntheticProject(experiments=config['experiments'], channels=config['channels'],
+                               points=config['points'], metrics_points=config['metrics_points'],
+                               seed=config['seed'])
+
+    results = OrderedDict()
+    spec_cache_dir = tempfile.mkdtemp()
+    try:
+        with StubBackend(project, latency=config['latency']) as backend:
+            context = BenchmarkContext(backend, spec_cache_dir, config)
+            for scenario in scenarios:
+                results[scenario.name] = run_scenario(scenario, context, repeat=repeat, warmup=warmup)
+                if report is not None:
+                    report(scenario.name, results[scenario.name])
+    finally:
+        shutil.rmtree(spec_cache_dir)
+
+    return {
+        'version': RESULTS_FORMAT_VERSION,
+        'created': datetime.utcnow().isoformat() + 'Z',
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': config,
+        'repeat': repeat,
+        'scenarios': results
+    }
+
+
+def compare_results(baseline, current, tolerance=DEFAULT_TOLERANCE):
+    """Compares the fastest runs of scenarios present in both results.
+
+    Returns:
+        list: (name, baseline seconds, current seconds, ratio, regressed) tuples, where `regressed` tells
+            whether the scenario got slower by more than the `tolerance` fraction.
+    """
+    comparison = []
+    for name, result in current['scenarios'].items():
+        if name not in baseline['scenarios']:
+            continue
+        before = baseline['scenarios'][name]['min_seconds']
+        after = result['min_seconds']
+        ratio = after / before if before > 0 else float('inf')
+        comparison.append((name, before, after, ratio, ratio > 1 + tolerance))
+    return comparison
+
+
+def store_results(results, path):
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    with open(path, 'w') as results_file:
+        json.dump(results, results_file, indent=2)
+
+
+def load_results(path):
+    with open(path) as results_file:
+        results = json.load(results_file)
+    if results.get('version') != RESULTS_FORMAT_VERSION:
+        raise ValueError('Unsupported version of benchmark results in {}: {}'.format(path, results.get('version')))
+    return results
+
+
+def _git_revision():
+    try:
+        output = subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.PIPE,
+                                         cwd=os.path.dirname(os.path.abspath(__file__)))
+        return output.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_result(name, result):
+    requests = sum(result['requests'].values())
+    print('{:<32} {:>10.3f} {:>12.3f} {:>9} {:>14.1f}'.format(
+        name, result['min_seconds'], result['median_seconds'], requests, result['bytes_received'] / 2.0 ** 20))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', choices=list(SIZES), default='small')
+    parser.add_argument('--experiments', type=int)
+    parser.add_argument('--channels', type=int)
+    parser.add_argument('--points', type=int)
+    parser.add_argument('--metrics-points', type=int)
+    parser.add_argument('--channel-experiments', type=int, default=50,
+                        help='Number of experiments of project_numeric_channels_values.')
+    parser.add_argument('--latency', type=float, default=0.0, help='Delay of every response of the stub, in seconds.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--scenario', action='append', choices=[s.name for s in SCENARIOS],
+                        help='Scenario to run; may be given many times. All of them are run when omitted.')
+    parser.add_argument('--output', help='Path of the JSON file to store the results in. '
+                                         'Defaults to benchmarks/results/<size>-<timestamp>.json.')
+    parser.add_argument('--compare', help='Path of the JSON file with results to compare with.')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Fraction by which a scenario may get slower before it is reported as a regression.')
+    args = parser.parse_args()
+
+    config = dict(SIZES[args.size])
+    for name in config:
+        if getattr(args, name) is not None:
+            config[name] = getattr(args, name)
+    config.update(channel_experiments=args.channel_experiments, latency=args.latency, seed=args.seed)
+
+    baseline = load_results(args.compare) if args.compare else None
+    if baseline is not None and baseline['config'] != config:
+        print('Warning: the baseline was run with a different configuration: {}'.format(baseline['config']))
+
+    print('{:<32} {:>10} {:>12} {:>9} {:>14}'.format('', 'min [s]', 'median [s]', 'requests', 'received [MB]'))
+    results = run_suite(config, scenario_names=args.scenario, repeat=args.repeat, warmup=args.warmup,
+                        report=_print_result)
+
+    output = args.output or os.path.join(
+        DEFAULT_RESULTS_DIR, '{}-{}.json'.format(args.size, datetime.utcnow().strftime('%Y%m%d-%H%M%S')))
+    store_results(results, output)
+    print('Results stored in {}'.format(output))
+
+    if baseline is not None:
+        comparison = compare_results(baseline, results, tolerance=args.tolerance)
+        print('\n{:<32} {:>12} {:>12} {:>8}'.format('', 'baseline [s]', 'current [s]', 'ratio'))
+        for name, before, after, ratio, regressed in comparison:
+            print('{:<32} {:>12.3f} {:>12.3f} {:>8.2f}{}'.format(
+                name, before, after, ratio, '  REGRESSION' if regressed else ''))
+        if any(regressed for _, _, _, _, regressed in comparison):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
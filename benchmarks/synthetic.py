@@ -0,0 +1,64 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Synthetic Neptune API objects for benchmarks.
+
+Entries are generated with the factories from `tests.neptunelib.api_objects_factory` and copied
+to plain objects, so that mock attribute lookups do not dominate the measurements.
+"""
+
+import random
+
+from tests.neptunelib.api_objects_factory import a_channel_value, a_parameter, a_property, \
+    an_experiment_leaderboard_entry_dto
+
+ENTRY_FIELDS = [
+    'entryType', 'id', 'shortId', 'projectId', 'state', 'name', 'organizationName', 'projectName', 'description',
+    'timeOfCreation', 'timeOfCompletion', 'runningTime', 'owner', 'size', 'tags', 'environment', 'workerType',
+    'hostname', 'sourceSize', 'sourceMd5', 'commitId', 'trashed', 'deleted', 'isBestExperiment'
+]
+
+
+class PlainDto(object):
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+def synthetic_entry_dtos(count, parameters_count, channels_count, properties_count):
+    """Generates entries sharing parameter, channel and property names, like experiments of a single project."""
+    parameter_names = [a_parameter().name for _ in range(parameters_count)]
+    channel_names = [a_channel_value().channelName for _ in range(channels_count)]
+    property_keys = [a_property().key for _ in range(properties_count)]
+    template = an_experiment_leaderboard_entry_dto()
+
+    entry_dtos = []
+    for n in range(count):
+        fields = dict((field, getattr(template, field)) for field in ENTRY_FIELDS)
+        fields.update(
+            shortId='BEN-{}'.format(n),
+            parameters=[
+                PlainDto(name=name, parameterType='double', value=str(random.uniform(-100, 100)))
+                for name in parameter_names
+            ],
+            channelsLastValues=[
+                PlainDto(channelId=str(i), channelName=name, channelType='numeric',
+                         x=float(n), y=str(random.uniform(0, 1)))
+                for i, name in enumerate(channel_names)
+            ],
+            properties=[PlainDto(key=key, value=str(n)) for key in property_keys]
+        )
+        entry_dtos.append(PlainDto(**fields))
+    return entry_dtos
@@ -0,0 +1,350 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import json
+
+import aiohttp
+from bravado.client import construct_request
+from bravado.exception import make_http_exception
+from bravado.http_future import unmarshal_response
+from bravado_core.exception import SwaggerMappingError
+from bravado_core.response import IncomingResponse
+from multidict import MultiDict
+
+from neptunelib.aio.oauth import AsyncNeptuneAuthenticator
+from neptunelib.client import DEFAULT_LEADERBOARD_PAGE_SIZE, Pagination, leaderboard_request_params, \
+    swagger_client_from_spec, swagger_spec_url
+from neptunelib.instrumentation import Instrumentation, clock
+from neptunelib.model import LeaderboardEntry, leaderboard_page_from_json
+from neptunelib.transport import DEFAULT_CONNECTION_POOL_SIZE, DEFAULT_MAX_RETRIES, DEFAULT_RETRY_BACKOFF_FACTOR, \
+    IDEMPOTENT_METHODS, RETRIED_STATUSES
+
+
+class AsyncClient(object):
+    """Sends requests of the Neptune APIs with aiohttp, without blocking the event loop.
+
+    Requests are built from the same swagger specs as requests of `neptunelib.client.Client`,
+    and responses are turned into the same models, but they are sent on the running event loop.
+    The underlying `aiohttp.ClientSession` is created on the first request, so the client has to be used
+    and closed within a single event loop.
+
+    Requests failing to connect are retried with an exponential backoff, and so are idempotent requests
+    losing their connections, or answered with 429, 502, 503 or 504.
+
+    Requests are recorded by the instrumentation of the client, as the ones of `neptunelib.client.Client`,
+    except that sizes of bodies are counted after decompression, and that CSVs are parsed after the requests,
+    in the executor of the loop, so their parsing does not count as decoding time.
+
+    Args:
+        api_address(str): Address of the Neptune API.
+        api_token(str): API token exchanged for OAuth tokens on the first authenticated request.
+        connection_limit(int): Maximum number of connections open at a time.
+            Requests sent when all of them are busy wait for a free one.
+        swagger_spec_cache(`neptunelib.swagger_spec_cache.SwaggerSpecCache`): Cache of swagger specs, optional.
+        raw_leaderboard(bool): Whether pages of leaderboards are decoded straight from JSON into plain DTOs,
+            instead of being unmarshalled into swagger models.
+        instrumentation(`neptunelib.instrumentation.Instrumentation`): Instrumentation recording the requests.
+            A new one is created when omitted.
+    """
+
+    def __init__(self, api_address, api_token, connection_limit=DEFAULT_CONNECTION_POOL_SIZE,
+                 swagger_spec_cache=None, raw_leaderboard=False, instrumentation=None):
+        self.api_address = api_address
+        self.api_token = api_token
+        self.connection_limit = connection_limit
+        self.swagger_spec_cache = swagger_spec_cache
+        self.raw_leaderboard = raw_leaderboard
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+        # Channel values are not cached by the async client.
+        self.channel_values_cache = None
+
+        self._http_session = None
+        self._swagger_clients = {}
+        # Names of the APIs whose cached specs turned out outdated, and were fetched again.
+        self._refetched_spec_api_names = set()
+        self._authenticator = None
+        # Locks of building swagger clients and of exchanging the API token, created lazily by their names.
+        # They are separate, as the token is exchanged with the backend swagger client, which may be rebuilt then.
+        self._locks = {}
+
+    async def close(self):
+        if self._http_session is not None:
+            await self._http_session.close()
+            self._http_session = None
+
+    async def get_projects(self, namespace):
+        result = await self._call('backend', 'listProjectsInOrganization', organizationName=namespace)
+        return result.entries
+
+    async def get_project_members(self, project_identifier):
+        return await self._call('backend', 'listProjectMembers', projectIdentifier=project_identifier)
+
+    async def get_leaderboard_entries(self, namespace, project_name,
+                                      entry_types=None, ids=None, group_ids=None,
+                                      states=None, owners=None, tags=None,
+                                      min_running_time=None, sort_by='id', ascending=True, limit=None,
+                                      page_size=DEFAULT_LEADERBOARD_PAGE_SIZE, select=None):
+        params = leaderboard_request_params(namespace, project_name,
+                                            entry_types, ids, group_ids,
+                                            states, owners, tags,
+                                            min_running_time, sort_by, ascending)
+
+        async def get_portion(limit, offset):
+            return await self._get_leaderboard_portion(limit=limit, offset=offset, **params)
+
+        def to_entries(portion):
+            entries = [LeaderboardEntry(e) for e in portion]
+            return select(entries) if select is not None else entries
+
+        return await self._get_all_items(get_portion, step=page_size, select=to_entries, limit=limit)
+
+    async def iter_leaderboard_entries(self, namespace, project_name,
+                                       entry_types=None, ids=None, group_ids=None,
+                                       states=None, owners=None, tags=None,
+                                       min_running_time=None, sort_by='id', ascending=True,
+                                       page_size=DEFAULT_LEADERBOARD_PAGE_SIZE):
+        params = leaderboard_request_params(namespace, project_name,
+                                            entry_types, ids, group_ids,
+                                            states, owners, tags,
+                                            min_running_time, sort_by, ascending)
+
+        offset = 0
+        next_portion = asyncio.ensure_future(
+            self._get_leaderboard_portion(limit=page_size, offset=offset, **params))
+        try:
+            while next_portion is not None:
+                items = list((await next_portion).entries)
+                offset += len(items)
+                next_portion = None
+                if len(items) >= page_size:
+                    # The next portion is requested while the current one is being consumed.
+                    next_portion = asyncio.ensure_future(
+                        self._get_leaderboard_portion(limit=page_size, offset=offset, **params))
+                if items:
+                    yield [LeaderboardEntry(e) for e in items]
+        finally:
+            if next_portion is not None:
+                next_portion.cancel()
+
+    async def get_channel_points_csv(self, experiment_internal_id, channel_internal_id):
+        response = await self._request('backend', 'getChannelValuesCSV',
+                                       experimentId=experiment_internal_id, channelId=channel_internal_id)
+        return response.raw_bytes
+
+    async def get_metrics_csv(self, experiment_internal_id):
+        response = await self._request('backend', 'getSystemMetricsCSV', experimentId=experiment_internal_id)
+        return response.raw_bytes
+
+    @staticmethod
+    async def _get_all_items(get_portion, step, select=None, limit=None):
+        """Fetches all items of a paginated listing, like `neptunelib.client.Client._get_all_items`.
+
+        Portions planned by `neptunelib.client.Pagination` are fetched concurrently.
+        """
+        pagination = Pagination(step, select=select, limit=limit)
+
+        async def fetch(offset):
+            return pagination.select_portion((await get_portion(limit=pagination.step, offset=offset)).entries)
+
+        first_portion = await get_portion(limit=pagination.step, offset=0)
+        pagination.add(*pagination.select_portion(first_portion.entries))
+        for portion in await asyncio.gather(*[fetch(offset) for offset in pagination.planned_offsets(first_portion)]):
+            pagination.add(*portion)
+
+        offset = pagination.next_offset()
+        while offset is not None:
+            pagination.add(*await fetch(offset))
+            offset = pagination.next_offset()
+
+        return pagination.result()
+
+    async def _get_leaderboard_portion(self, **params):
+        if self.raw_leaderboard:
+            return await self._request('leaderboard', 'getLeaderboard',
+                                       decode=lambda response: leaderboard_page_from_json(response.raw_bytes),
+                                       **params)
+        return await self._call('leaderboard', 'getLeaderboard', **params)
+
+    async def _call(self, api_name, operation_name, authenticated=True, **params):
+        # As in `neptunelib.client.Client`, a response of an idempotent operation which cannot be unmarshalled
+        # with a cached spec is requested once more, with the spec fetched again.
+        try:
+            return await self._call_once(api_name, operation_name, authenticated, params)
+        except SwaggerMappingError:
+            operation = await self._get_operation(api_name, operation_name)
+            if operation.http_method.upper() not in IDEMPOTENT_METHODS or not self._drop_cached_spec(api_name):
+                raise
+        return await self._call_once(api_name, operation_name, authenticated, params)
+
+    async def _call_once(self, api_name, operation_name, authenticated, params):
+        operation = await self._get_operation(api_name, operation_name)
+        start = clock()
+        response = await self._send_operation(operation, authenticated, params)
+        network_end = clock()
+        try:
+            unmarshal_response(response, operation)
+        finally:
+            self._record_request(operation_name, response, start, network_end)
+        return response.swagger_result
+
+    async def _request(self, api_name, operation_name, decode=None, **params):
+        # Responses are not unmarshalled, which spares decoding the bodies of e.g. CSVs into text.
+        operation = await self._get_operation(api_name, operation_name)
+        start = clock()
+        response = await self._send_operation(operation, True, params)
+        network_end = clock()
+        try:
+            if response.status_code >= 400:
+                raise make_http_exception(response=response)
+            return decode(response) if decode is not None else response
+        finally:
+            self._record_request(operation_name, response, start, network_end)
+
+    def _record_request(self, operation_name, response, start, network_end):
+        end = clock()
+        self.instrumentation.record_request(
+            operation_name, end - start, network_seconds=network_end - start, decode_seconds=end - network_end,
+            bytes_received=len(response.raw_bytes), retries=response.retries, error=response.status_code >= 400)
+
+    async def _get_operation(self, api_name, operation_name):
+        swagger_client = await self._get_swagger_client(api_name)
+        if not hasattr(getattr(swagger_client, 'api', None), operation_name) and self._drop_cached_spec(api_name):
+            swagger_client = await self._get_swagger_client(api_name)
+        return getattr(swagger_client.api, operation_name).operation
+
+    def _drop_cached_spec(self, api_name):
+        """Drops the cached spec of an API and the swagger client built from it, so that the spec is fetched again.
+
+        Returns False when specs are not cached or the spec of the API was already fetched again.
+        """
+        if self.swagger_spec_cache is None or api_name in self._refetched_spec_api_names:
+            return False
+        self._refetched_spec_api_names.add(api_name)
+        self.swagger_spec_cache.invalidate(swagger_spec_url(self.api_address, api_name))
+        self._swagger_clients.pop(api_name, None)
+        return True
+
+    async def _send_operation(self, operation, authenticated, params):
+        request = construct_request(operation, {}, **params)
+
+        headers = dict(request.get('headers', {}))
+        if authenticated:
+            authenticator = await self._get_authenticator()
+            headers.update(await authenticator.headers(self._get_http_session()))
+
+        return await self._send(request['method'], request['url'],
+                                params=_query_params(request.get('params')), headers=headers,
+                                data=request.get('data'))
+
+    async def _send(self, method, url, **kwargs):
+        # As with `HttpTransport`, requests which may have reached the server are retried only when idempotent.
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        retry = 0
+        while True:
+            try:
+                async with self._get_http_session().request(method, url, **kwargs) as response:
+                    body = await response.read()
+                    if not idempotent or response.status not in RETRIED_STATUSES or retry >= DEFAULT_MAX_RETRIES:
+                        return _AiohttpIncomingResponse(response, body, retries=retry)
+            except aiohttp.ClientConnectorError:
+                if retry >= DEFAULT_MAX_RETRIES:
+                    raise
+            except aiohttp.ClientConnectionError:
+                if not idempotent or retry >= DEFAULT_MAX_RETRIES:
+                    raise
+            await asyncio.sleep(DEFAULT_RETRY_BACKOFF_FACTOR * 2 ** retry)
+            retry += 1
+
+    async def _get_swagger_client(self, api_name):
+        swagger_client = self._swagger_clients.get(api_name)
+        if swagger_client is not None:
+            return swagger_client
+
+        async with self._get_lock('swagger_clients'):
+            if api_name not in self._swagger_clients:
+                spec_url = swagger_spec_url(self.api_address, api_name)
+                spec = self.swagger_spec_cache.load(spec_url) if self.swagger_spec_cache is not None else None
+                if spec is None:
+                    spec = await self._fetch_spec(spec_url)
+                    if self.swagger_spec_cache is not None:
+                        self.swagger_spec_cache.store(spec_url, spec)
+                self._swagger_clients[api_name] = swagger_client_from_spec(api_name, spec, spec_url)
+            return self._swagger_clients[api_name]
+
+    async def _fetch_spec(self, spec_url):
+        response = await self._send('GET', spec_url)
+        if response.status_code >= 400:
+            raise make_http_exception(response=response)
+        return response.json()
+
+    async def _get_authenticator(self):
+        if self._authenticator is None:
+            async with self._get_lock('authenticator'):
+                if self._authenticator is None:
+                    auth_tokens = await self._call('backend', 'exchangeApiToken', authenticated=False,
+                                                   X_Neptune_Api_Token=self.api_token)
+                    self._authenticator = AsyncNeptuneAuthenticator(auth_tokens)
+        return self._authenticator
+
+    def _get_lock(self, name):
+        # Locks are created lazily, so that they belong to the loop the client is used in.
+        if name not in self._locks:
+            self._locks[name] = asyncio.Lock()
+        return self._locks[name]
+
+    def _get_http_session(self):
+        if self._http_session is None:
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.connection_limit))
+        return self._http_session
+
+
+def _query_params(params):
+    if not params:
+        return None
+
+    items = []
+    for name, value in params.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        items.extend((name, _query_param_value(v)) for v in values if v is not None)
+    return MultiDict(items)
+
+
+def _query_param_value(value):
+    # Booleans are sent lower-cased, as by bravado.
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+class _AiohttpIncomingResponse(IncomingResponse):
+    """A response of aiohttp, with its body already read, for bravado-core."""
+
+    def __init__(self, response, body, retries=0):
+        self.status_code = response.status
+        self.retries = retries
+        self.reason = response.reason
+        self.headers = response.headers
+        self.raw_bytes = body
+        self._encoding = response.charset or 'utf-8'
+
+    @property
+    def text(self):
+        return self.raw_bytes.decode(self._encoding)
+
+    def json(self, **kwargs):
+        return json.loads(self.text, **kwargs)
@@ -0,0 +1,163 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+from collections import OrderedDict
+from io import BytesIO
+
+import pandas as pd
+from pandas.errors import EmptyDataError
+
+from neptunelib.downsampling import DEFAULT_DOWNSAMPLING_METHOD, get_downsampling_method, \
+    read_downsampled_channel_csv
+from neptunelib.exceptions import ChannelValuesFetchError
+from neptunelib.hardware_utilization import DEFAULT_HARDWARE_UTILIZATION_AGGREGATION, read_hardware_utilization, \
+    resample_hardware_utilization
+from neptunelib.experiment import Experiment
+from neptunelib.utils import CSV_CHUNK_SIZE, align_channels_on_x, iter_csv_chunks
+
+
+class AsyncExperiment(Experiment):
+    """An `Experiment` fetching its data without blocking the event loop.
+
+    Properties are the same as the ones of `Experiment`, while methods fetching data are coroutines.
+    CSVs are downloaded on the event loop and parsed in the default executor of the loop,
+    so that parsing long channels does not stall other coroutines.
+
+    Args:
+        client(`neptunelib.aio.client.AsyncClient`): AsyncClient object
+        leaderboard_entry(`neptunelib.model.LeaderboardEntry`): LeaderboardEntry object
+
+    Examples:
+        >>> from neptunelib.aio.session import AsyncSession
+        >>> async with AsyncSession() as session:
+        ...     project = (await session.get_projects('neptune-ml'))['neptune-ml/Salt-Detection']
+        ...     experiment = (await project.get_experiments(id='SAL-1609'))[0]
+        ...     await experiment.get_numeric_channels_values('unet_0 epoch_val sum loss')
+    """
+
+    # Coroutines deliberately override the blocking methods of `Experiment`, as in `AsyncProject`,
+    # so that both classes share their properties and their helpers processing the fetched data.
+    # pylint: disable=invalid-overridden-method,arguments-differ
+
+    async def get_hardware_utilization(self, **kwargs):
+        """Coroutine version of `Experiment.get_hardware_utilization`.
+
+        Accepts the `compact`, `interval` and `aggregation` keyword arguments of `Experiment.get_hardware_utilization`.
+        """
+        compact, interval, aggregation = self._pop_hardware_utilization_options(kwargs)
+        if compact:
+            return await self._fetch_hardware_utilization(interval, aggregation)
+
+        metrics_csv = await self._client.get_metrics_csv(self._leaderboard_entry.internal_id)
+        return await _in_executor(_read_metrics_csv, metrics_csv)
+
+    async def get_numeric_channels_values(self, *channel_names, **kwargs):
+        """Coroutine version of `Experiment.get_numeric_channels_values`.
+
+        Values of all the channels are downloaded concurrently.
+        Accepts the `max_points` and `downsampling` keyword arguments of `Experiment.get_numeric_channels_values`.
+        """
+        channels_values = await self._fetch_channels_values(channel_names, **kwargs)
+        with self._client.instrumentation.timed('align_channels'):
+            return align_channels_on_x(pd.concat(channels_values.values(), axis=1, sort=False))
+
+    async def get_numeric_channels_arrays(self, *channel_names, **kwargs):
+        """Coroutine version of `Experiment.get_numeric_channels_arrays`."""
+        frames = await self.get_numeric_channels_frames(*channel_names, **kwargs)
+        return dict((channel_name, values.values.T) for channel_name, values in frames.items())
+
+    async def get_numeric_channels_frames(self, *channel_names, **kwargs):
+        """Coroutine version of `Experiment.get_numeric_channels_frames`."""
+        channels_values = await self._fetch_channels_values(channel_names, **kwargs)
+        for values in channels_values.values():
+            values.columns = ['x', 'y']
+        return channels_values
+
+    async def iter_channel_values(self, channel_name, chunk_size=CSV_CHUNK_SIZE):
+        """Asynchronous generator version of `Experiment.iter_channel_values`.
+
+        `AsyncClient` downloads the CSV of the channel in full, so unlike in `Experiment` the whole CSV is held
+        in memory. Chunks are parsed one at a time in the default executor of the loop.
+        """
+        channel_id = self._get_channel_id(channel_name)
+        csv = await self._client.get_channel_points_csv(self._leaderboard_entry.internal_id, channel_id)
+        chunks = iter_csv_chunks(BytesIO(csv), ['x', 'y'], chunk_size)
+        while True:
+            chunk = await _in_executor(next, chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    def __str__(self):
+        return 'AsyncExperiment({})'.format(self.id)
+
+    async def _fetch_hardware_utilization(self, interval=None, aggregation=DEFAULT_HARDWARE_UTILIZATION_AGGREGATION):
+        metrics_csv = await self._client.get_metrics_csv(self._leaderboard_entry.internal_id)
+        return await _in_executor(_read_hardware_utilization, metrics_csv, interval, aggregation)
+
+    async def _fetch_channels_values(self, channel_names, **kwargs):
+        max_points = kwargs.pop('max_points', None)
+        downsampling = kwargs.pop('downsampling', DEFAULT_DOWNSAMPLING_METHOD)
+        if kwargs:
+            raise TypeError('Unexpected keyword arguments: {}'.format(', '.join(kwargs)))
+        get_downsampling_method(downsampling, max_points)
+
+        channel_ids = [(name, self._get_channel_id(name)) for name in OrderedDict.fromkeys(channel_names)]
+
+        results = await asyncio.gather(*[
+            self._fetch_channel_values(name, channel_id, max_points, downsampling) for name, channel_id in channel_ids
+        ], return_exceptions=True)
+
+        errors = dict((name, result) for (name, _), result in zip(channel_ids, results)
+                      if isinstance(result, Exception))
+        if errors:
+            raise ChannelValuesFetchError(errors, experiment_id=self.id)
+
+        return OrderedDict((name, values) for (name, _), values in zip(channel_ids, results))
+
+    async def _fetch_channel_values(self, channel_name, channel_id, max_points=None,
+                                    downsampling=DEFAULT_DOWNSAMPLING_METHOD):
+        columns = ['x_{}'.format(channel_name), 'y_{}'.format(channel_name)]
+        csv = await self._client.get_channel_points_csv(self._leaderboard_entry.internal_id, channel_id)
+        if max_points is not None:
+            return await _in_executor(read_downsampled_channel_csv, BytesIO(csv), columns, max_points, downsampling)
+        return await _in_executor(_read_channel_points_csv, csv, columns)
+
+
+async def _in_executor(f, *args):
+    return await asyncio.get_event_loop().run_in_executor(None, f, *args)
+
+
+def _read_metrics_csv(csv):
+    try:
+        return pd.read_csv(BytesIO(csv))
+    except EmptyDataError:
+        return pd.DataFrame()
+
+
+def _read_hardware_utilization(csv, interval, aggregation):
+    utilization = read_hardware_utilization(csv)
+    if interval is not None:
+        return resample_hardware_utilization(utilization, interval, aggregation)
+    return utilization
+
+
+def _read_channel_points_csv(csv, columns):
+    try:
+        return pd.read_csv(BytesIO(csv), header=None, names=columns, dtype=float)
+    except EmptyDataError:
+        return pd.DataFrame(columns=columns, dtype=float)
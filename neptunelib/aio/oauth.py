@@ -0,0 +1,75 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import time
+
+import jwt
+
+from neptunelib.oauth import refresh_time
+
+
+class AsyncNeptuneAuthenticator(object):
+    """Adds an OAuth access token to requests of `neptunelib.aio.client.AsyncClient`.
+
+    The access token is refreshed when it is about to expire, as by `neptunelib.oauth.NeptuneAuth`.
+    Concurrent requests wait for a single refresh.
+
+    Args:
+        auth_tokens: Tokens returned by the exchangeApiToken operation.
+    """
+
+    def __init__(self, auth_tokens):
+        decoded_json_token = jwt.decode(auth_tokens.accessToken, verify=False)
+        self.client_name = decoded_json_token.get(u'azp')
+        self.refresh_url = u'{realm_url}/protocol/openid-connect/token'.format(
+            realm_url=decoded_json_token.get(u'iss'))
+        self._access_token = auth_tokens.accessToken
+        self._refresh_token = auth_tokens.refreshToken
+        self._refresh_at = refresh_time(decoded_json_token.get(u'exp'))
+        self._refresh_lock = asyncio.Lock()
+
+    async def headers(self, http_session):
+        """Returns headers authorizing a request, refreshing the access token first when needed.
+
+        Args:
+            http_session(`aiohttp.ClientSession`): Session used to refresh the access token.
+
+        Returns:
+            dict: The Authorization header.
+        """
+        if self._expired():
+            async with self._refresh_lock:
+                if self._expired():
+                    await self._refresh(http_session)
+        return {'Authorization': 'Bearer {}'.format(self._access_token)}
+
+    def _expired(self):
+        return time.time() >= self._refresh_at
+
+    async def _refresh(self, http_session):
+        data = {
+            'grant_type': 'refresh_token',
+            'refresh_token': self._refresh_token,
+            'client_id': self.client_name
+        }
+        async with http_session.post(self.refresh_url, data=data) as response:
+            response.raise_for_status()
+            token = await response.json()
+
+        self._access_token = token['access_token']
+        self._refresh_token = token.get('refresh_token', self._refresh_token)
+        self._refresh_at = refresh_time(time.time() + token['expires_in'])
@@ -0,0 +1,269 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+from collections import OrderedDict
+
+from neptunelib.aio.experiment import AsyncExperiment
+from neptunelib.client import DEFAULT_LEADERBOARD_PAGE_SIZE
+from neptunelib.downsampling import DEFAULT_DOWNSAMPLING_METHOD, get_downsampling_method
+from neptunelib.exceptions import ChannelValuesFetchError, HardwareUtilizationFetchError
+from neptunelib.leaderboard import leaderboard_column_names
+from neptunelib.leaderboard_store import LeaderboardStore
+from neptunelib.project import Project
+
+
+class AsyncProject(Project):
+    # Coroutines deliberately override the blocking methods of `Project`, as in `AsyncExperiment`.
+    # pylint: disable=redefined-builtin,invalid-overridden-method,arguments-differ
+
+    """A `Project` fetching its data without blocking the event loop.
+
+    Methods fetching data are coroutines, or asynchronous generators in the case of `iter_*` methods.
+    They accept the same criteria as the ones of `Project`, and return `AsyncExperiment` objects.
+    All the pages of a leaderboard are fetched concurrently.
+
+    Args:
+        client(`neptunelib.aio.client.AsyncClient`): AsyncClient object
+        internal_id:
+        namespace(str): It can either be your organization or user name.
+        name(str): short project name.
+
+    Examples:
+        >>> from neptunelib.aio.session import AsyncSession
+        >>> async with AsyncSession() as session:
+        ...     project = (await session.get_projects('neptune-ml'))['neptune-ml/Salt-Detection']
+        ...     leaderboard = await project.get_leaderboard(state=['succeeded'])
+    """
+
+    async def get_members(self):
+        """Coroutine version of `Project.get_members`."""
+        project_members = await self.client.get_project_members(self.internal_id)
+        return [member.registeredMemberInfo.username for member in project_members if member.registeredMemberInfo]
+
+    async def get_experiments(self, id=None, group=None, state=None, owner=None, tag=None, min_running_time=None,
+                              page_size=DEFAULT_LEADERBOARD_PAGE_SIZE, query=None,
+                              sort_by='id', ascending=True, limit=None):
+        """Coroutine version of `Project.get_experiments`."""
+        leaderboard_entries = await self._fetch_leaderboard(id, group, state, owner, tag, min_running_time,
+                                                            page_size, query, sort_by, ascending, limit)
+        return [AsyncExperiment(self.client, entry) for entry in leaderboard_entries]
+
+    async def get_leaderboard(self, id=None, group=None, state=None, owner=None, tag=None, min_running_time=None,
+                              page_size=DEFAULT_LEADERBOARD_PAGE_SIZE,
+                              columns=None, parameters=None, channels=None, properties=None, query=None,
+                              sort_by='id', ascending=True, limit=None):
+        """Coroutine version of `Project.get_leaderboard`."""
+        leaderboard_entries = await self._fetch_leaderboard(id, group, state, owner, tag, min_running_time,
+                                                            page_size, query, sort_by, ascending, limit)
+        column_names = leaderboard_column_names(columns, parameters, channels, properties)
+        with self.client.instrumentation.timed('leaderboard_dataframe'):
+            return self._leaderboard_entries_to_dataframe(leaderboard_entries, column_names=column_names)
+
+    async def iter_experiments(self, id=None, group=None, state=None, owner=None, tag=None, min_running_time=None,
+                               page_size=DEFAULT_LEADERBOARD_PAGE_SIZE, query=None, sort_by='id', ascending=True):
+        """Asynchronous generator version of `Project.iter_experiments`.
+
+        Examples:
+            >>> async for experiment in project.iter_experiments(state=['succeeded']):
+            ...     print(experiment.id)
+        """
+        async for leaderboard_entries in self._iter_leaderboard(id, group, state, owner, tag, min_running_time,
+                                                                page_size, query, sort_by, ascending):
+            for entry in leaderboard_entries:
+                yield AsyncExperiment(self.client, entry)
+
+    async def iter_leaderboard_chunks(self, id=None, group=None, state=None, owner=None, tag=None,
+                                      min_running_time=None, page_size=DEFAULT_LEADERBOARD_PAGE_SIZE,
+                                      columns=None, parameters=None, channels=None, properties=None, query=None,
+                                      sort_by='id', ascending=True):
+        """Asynchronous generator version of `Project.iter_leaderboard_chunks`."""
+        column_names = leaderboard_column_names(columns, parameters, channels, properties)
+        first_row_index = 0
+        async for leaderboard_entries in self._iter_leaderboard(id, group, state, owner, tag, min_running_time,
+                                                                page_size, query, sort_by, ascending):
+            with self.client.instrumentation.timed('leaderboard_dataframe'):
+                chunk = self._leaderboard_entries_to_dataframe(leaderboard_entries, first_row_index, column_names)
+            yield chunk
+            first_row_index += len(leaderboard_entries)
+
+    async def sync_leaderboard(self, store_path, page_size=DEFAULT_LEADERBOARD_PAGE_SIZE,
+                               columns=None, parameters=None, channels=None, properties=None):
+        """Coroutine version of `Project.sync_leaderboard`.
+
+        Batches of unfinished experiments are refreshed concurrently. The snapshot is read and written
+        on the event loop, as these are quick local operations.
+        """
+        with LeaderboardStore(store_path, self.full_id) as store:
+            await self._sync_leaderboard_store(store, page_size)
+            leaderboard_entries = store.load()
+
+        column_names = leaderboard_column_names(columns, parameters, channels, properties)
+        with self.client.instrumentation.timed('leaderboard_dataframe'):
+            return self._leaderboard_entries_to_dataframe(leaderboard_entries, column_names=column_names)
+
+    async def get_numeric_channels_values(self, experiments_or_filters, *channel_names, **kwargs):
+        """Coroutine version of `Project.get_numeric_channels_values`.
+
+        Values of all the (experiment, channel) pairs are downloaded concurrently.
+
+        Args:
+            experiments_or_filters: An `AsyncExperiment`, a list of them or a dict of criteria
+                accepted by `get_experiments`.
+            *channel_names: variable length list of names of the channels to retrieve values for.
+            wide(bool): Keyword-only. Whether to return the DataFrame in the wide format.
+            max_points(int): Keyword-only. Maximum number of values of every channel to keep.
+            downsampling(str): Keyword-only. Name of the downsampling method used with `max_points`.
+        """
+        # pylint: disable=protected-access
+        wide = kwargs.pop('wide', False)
+        max_points = kwargs.pop('max_points', None)
+        downsampling = kwargs.pop('downsampling', DEFAULT_DOWNSAMPLING_METHOD)
+        if kwargs:
+            raise TypeError('Unexpected keyword arguments: {}'.format(', '.join(kwargs)))
+        get_downsampling_method(downsampling, max_points)
+
+        downloads = [
+            (experiment, channel_name)
+            for experiment in await self._as_experiments(experiments_or_filters)
+            for channel_name in OrderedDict.fromkeys(channel_names)
+            if channel_name in experiment.channels
+        ]
+
+        results = await asyncio.gather(*[
+            experiment._fetch_channel_values(channel_name, experiment._get_channel_id(channel_name),
+                                             max_points, downsampling)
+            for experiment, channel_name in downloads
+        ], return_exceptions=True)
+
+        errors = dict(
+            ((experiment.id, channel_name), result)
+            for (experiment, channel_name), result in zip(downloads, results) if isinstance(result, Exception)
+        )
+        if errors:
+            raise ChannelValuesFetchError(errors)
+
+        for values in results:
+            values.columns = ['x', 'y']
+        keys = [(experiment.id, channel_name) for experiment, channel_name in downloads]
+        with self.client.instrumentation.timed('channels_dataframe'):
+            if wide:
+                return self._channels_values_to_wide_dataframe(keys, results)
+            return self._channels_values_to_long_dataframe(keys, results)
+
+    async def get_hardware_utilization(self, experiments_or_filters, **kwargs):
+        """Coroutine version of `Project.get_hardware_utilization`.
+
+        Metrics of all the experiments are downloaded concurrently.
+
+        Args:
+            experiments_or_filters: An `AsyncExperiment`, a list of them or a dict of criteria
+                accepted by `get_experiments`.
+            interval(float): Keyword-only. Length of resampling intervals in seconds.
+            aggregation(str or list): Keyword-only. Aggregation of values within a resampling interval.
+        """
+        # pylint: disable=protected-access
+        kwargs['compact'] = True
+        _, interval, aggregation = AsyncExperiment._pop_hardware_utilization_options(kwargs)
+
+        experiments = await self._as_experiments(experiments_or_filters)
+
+        results = await asyncio.gather(*[
+            experiment._fetch_hardware_utilization(interval, aggregation) for experiment in experiments
+        ], return_exceptions=True)
+
+        errors = dict((experiment.id, result) for experiment, result in zip(experiments, results)
+                      if isinstance(result, Exception))
+        if errors:
+            raise HardwareUtilizationFetchError(errors)
+
+        with self.client.instrumentation.timed('hardware_utilization_dataframe'):
+            return self._hardware_utilization_to_dataframe([experiment.id for experiment in experiments], results)
+
+    async def get_experiment_groups(self):
+        """Coroutine version of `Project.get_experiment_groups`."""
+        group_entries = await self.client.get_leaderboard_entries(namespace=self.namespace,
+                                                                  project_name=self.name,
+                                                                  entry_types=['group'])
+        return [entry.id for entry in group_entries]
+
+    def __str__(self):
+        return 'AsyncProject({})'.format(self.full_id)
+
+    async def _fetch_leaderboard(self, id, group, state, owner, tag, min_running_time, page_size, query=None,
+                                 sort_by='id', ascending=True, limit=None):
+        filters = self._leaderboard_filters(id, group, state, owner, tag, min_running_time, query)
+        if filters is None:
+            return []
+        if query is not None:
+            filters['select'] = query.select
+
+        return await self.client.get_leaderboard_entries(
+            namespace=self.namespace, project_name=self.name,
+            sort_by=sort_by, ascending=ascending, limit=limit,
+            page_size=page_size,
+            **filters)
+
+    async def _iter_leaderboard(self, id, group, state, owner, tag, min_running_time, page_size, query=None,
+                                sort_by='id', ascending=True):
+        filters = self._leaderboard_filters(id, group, state, owner, tag, min_running_time, query)
+        if filters is None:
+            return
+
+        async for leaderboard_entries in self.client.iter_leaderboard_entries(
+                namespace=self.namespace, project_name=self.name,
+                sort_by=sort_by, ascending=ascending, page_size=page_size, **filters):
+            if query is not None:
+                leaderboard_entries = query.select(leaderboard_entries)
+            if leaderboard_entries:
+                yield leaderboard_entries
+
+    async def _sync_leaderboard_store(self, store, page_size):
+        stored_ids = store.ids()
+        if not stored_ids:
+            store.save(await self.client.get_leaderboard_entries(
+                namespace=self.namespace, project_name=self.name, page_size=page_size))
+            return
+
+        unfinished_ids = store.unfinished_ids()
+        batches_entries = await asyncio.gather(*[
+            self.client.get_leaderboard_entries(
+                namespace=self.namespace, project_name=self.name, ids=ids, page_size=page_size)
+            for ids in self._id_batches(unfinished_ids, page_size)
+        ])
+        refreshed_entries = [entry for batch_entries in batches_entries for entry in batch_entries]
+
+        new_entries = []
+        pages = self.client.iter_leaderboard_entries(
+            namespace=self.namespace, project_name=self.name, sort_by='created', ascending=False, page_size=page_size)
+        try:
+            async for leaderboard_entries in pages:
+                page_new_entries = [entry for entry in leaderboard_entries if entry.id not in stored_ids]
+                new_entries += page_new_entries
+                if len(page_new_entries) < len(leaderboard_entries):
+                    break
+        finally:
+            # Closing the pages right away cancels the prefetched next one.
+            await pages.aclose()
+
+        self._update_leaderboard_store(store, unfinished_ids, refreshed_entries, new_entries)
+
+    async def _as_experiments(self, experiments_or_filters):
+        if isinstance(experiments_or_filters, dict):
+            return await self.get_experiments(**experiments_or_filters)
+        if isinstance(experiments_or_filters, AsyncExperiment):
+            return [experiments_or_filters]
+        return list(experiments_or_filters)
@@ -0,0 +1,99 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+
+from neptunelib.aio.client import AsyncClient
+from neptunelib.aio.project import AsyncProject
+from neptunelib.credentials import Credentials
+from neptunelib.swagger_spec_cache import DEFAULT_SWAGGER_SPEC_CACHE_DIR, SwaggerSpecCache
+from neptunelib.transport import DEFAULT_CONNECTION_POOL_SIZE
+
+
+class AsyncSession(object):
+    """A `neptunelib.session.Session` for asyncio applications.
+
+    Requests are sent with aiohttp on the running event loop, so many lookups can run concurrently
+    in a single thread. Projects, experiments and their methods fetching data are coroutines.
+    It requires the `aiohttp` package, installed with the `aio` extra: `pip install neptune-lib[aio]`.
+
+    The session has to be created, used and closed within a single event loop.
+    Closing it, directly or by leaving its `async with` block, closes its connections.
+
+    Args:
+        api_token(str): This is a secret API key that you can retrieve by running
+            `$ neptune account api-token get`. It is taken from the NEPTUNE_API_TOKEN environment variable
+            when omitted.
+        swagger_spec_cache_dir(str): Directory for a persistent cache of the API specs. Specs are downloaded
+            by every session when it is None.
+        connection_limit(int): Maximum number of connections open at a time.
+        raw_leaderboard(bool): Whether pages of leaderboards are decoded straight from JSON into plain objects,
+            as with `neptunelib.session.Session`.
+        instrumentation(`neptunelib.instrumentation.Instrumentation`): Instrumentation recording the requests
+            and processing of the session. A new one is created for the session when omitted.
+
+    Attributes:
+        credentials (`neptunelib.Credentials`): `Credentials` object instance that authenticates your
+            calls to Neptune API.
+        instrumentation (`neptunelib.instrumentation.Instrumentation`): Metrics of the requests and processing
+            of the session.
+
+    Examples:
+        >>> from neptunelib.aio.session import AsyncSession
+        >>> async def best_losses(experiment_ids):
+        ...     async with AsyncSession() as session:
+        ...         project = (await session.get_projects('neptune-ml'))['neptune-ml/Salt-Detection']
+        ...         experiments = await project.get_experiments(id=experiment_ids)
+        ...         losses = await asyncio.gather(*[e.get_numeric_channels_values('loss') for e in experiments])
+        ...         return [l['loss'].min() for l in losses]
+    """
+
+    def __init__(self, api_token=None, swagger_spec_cache_dir=DEFAULT_SWAGGER_SPEC_CACHE_DIR,
+                 connection_limit=DEFAULT_CONNECTION_POOL_SIZE, raw_leaderboard=False,
+                 instrumentation=None):
+        credentials = Credentials(api_token) if api_token else Credentials.from_env()
+
+        swagger_spec_cache = None
+        if swagger_spec_cache_dir is not None:
+            swagger_spec_cache = SwaggerSpecCache(os.path.expanduser(swagger_spec_cache_dir))
+
+        self.credentials = credentials
+        self._client = AsyncClient(self.credentials.api_address, self.credentials.api_token,
+                                   connection_limit=connection_limit,
+                                   swagger_spec_cache=swagger_spec_cache,
+                                   raw_leaderboard=raw_leaderboard,
+                                   instrumentation=instrumentation)
+        self.instrumentation = self._client.instrumentation
+
+    async def get_projects(self, namespace):
+        """Coroutine version of `neptunelib.session.Session.get_projects`.
+
+        Returns:
+            dict: Dictionary of "NAMESPACE/PROJECT_NAME" and `neptunelib.aio.project.AsyncProject` object pairs.
+        """
+        projects = [
+            AsyncProject(self._client, p.id, namespace, p.name) for p in await self._client.get_projects(namespace)
+        ]
+        return dict((p.full_id, p) for p in projects)
+
+    async def close(self):
+        await self._client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        await self.close()
@@ -0,0 +1,165 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+from neptunelib.utils import remove_file, replace_file
+
+DEFAULT_CHANNEL_CACHE_MAX_SIZE = 2 ** 30
+
+
+class ChannelValuesCache(object):
+    """Persistent cache of channel values, keyed by experiment and channel internal ids.
+
+    Values of a channel are stored as a single (2, n) float64 NumPy array of x and y values.
+    Values of channels of finished experiments are complete and they are served without any requests.
+    Values of channels of other experiments are partial: they are refreshed on every access, either
+    incrementally, when the backend supports it, or by downloading all the values again.
+
+    When the total size of stored values exceeds `max_size` bytes, least recently used channels are evicted.
+    The cache directory is scanned for eviction only when the size of the values stored since the previous scan
+    may have exceeded the limit, so values stored by other processes are accounted for at the next scan.
+
+    With `mmap` enabled, values are returned as read-only arrays memory-mapped from the cache files,
+    so they are paged in only when accessed and can be released by the operating system at any time.
+
+    Args:
+        directory(str): Directory storing the cached values. It is created when missing.
+        max_size(int): Maximum total size of the stored values, in bytes.
+        mmap(bool): Whether to return arrays memory-mapped from the cache files.
+    """
+
+    COMPLETE_SUFFIX = '-complete.npy'
+    PARTIAL_SUFFIX = '-partial.npy'
+
+    def __init__(self, directory, max_size=DEFAULT_CHANNEL_CACHE_MAX_SIZE, mmap=False):
+        self.directory = directory
+        self.max_size = max_size
+        self.mmap = mmap
+        self._eviction_lock = threading.Lock()
+        # Upper bound of the total size of the stored values, or None until the directory is first scanned.
+        self._stored_size = None
+
+    def get_values(self, experiment_id, channel_id, complete, fetch_values, incremental=False):
+        """Returns cached values of a channel, fetching the missing ones with `fetch_values`.
+
+        Args:
+            experiment_id(str): Internal id of the experiment.
+            channel_id(str): Internal id of the channel.
+            complete(bool): Whether the channel will not get any new values, i.e. the experiment is finished.
+            fetch_values(callable): Called with an offset (number of values to skip or None)
+                and returning a (2, n) array of x and y values.
+            incremental(bool): Whether `fetch_values` skips the given number of values.
+
+        Returns:
+            `numpy.ndarray`: A (2, n) array of x and y values.
+        """
+        values = self._load(self._path(experiment_id, channel_id, self.COMPLETE_SUFFIX))
+        if values is not None:
+            return values
+
+        cached_values = self._load(self._path(experiment_id, channel_id, self.PARTIAL_SUFFIX))
+        if cached_values is not None and incremental:
+            new_values = fetch_values(cached_values.shape[1])
+            if cached_values.shape[1]:
+                new_values = new_values[:, new_values[0] > cached_values[0, -1]]
+            values = np.concatenate([cached_values, new_values], axis=1)
+        else:
+            values = fetch_values(None)
+
+        path = self._store(experiment_id, channel_id, values, complete)
+        self._evict(_file_size(path))
+
+        if self.mmap:
+            # Drops the downloaded values in favour of the stored ones, unless they have been evicted meanwhile.
+            stored_values = self._load(path)
+            if stored_values is not None:
+                return stored_values
+        return values
+
+    def _path(self, experiment_id, channel_id, suffix):
+        return os.path.join(self.directory, str(experiment_id), str(channel_id) + suffix)
+
+    def _load(self, path):
+        try:
+            if self.mmap:
+                values = np.load(path, mmap_mode='r')
+            else:
+                with open(path, 'rb') as f:
+                    values = np.load(f)
+            # Marks the channel as recently used.
+            os.utime(path, None)
+            return values
+        except (IOError, OSError, ValueError):
+            return None
+
+    def _store(self, experiment_id, channel_id, values, complete):
+        path = self._path(experiment_id, channel_id, self.COMPLETE_SUFFIX if complete else self.PARTIAL_SUFFIX)
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                if not os.path.isdir(directory):
+                    raise
+
+        fd, temporary_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, np.ascontiguousarray(values, dtype=np.float64))
+        replace_file(temporary_path, path)
+
+        if complete:
+            remove_file(self._path(experiment_id, channel_id, self.PARTIAL_SUFFIX))
+
+        return path
+
+    def _evict(self, stored_size):
+        with self._eviction_lock:
+            if self._stored_size is not None:
+                # Replaced and removed files are not subtracted, which only makes the next scan come earlier.
+                self._stored_size += stored_size
+                if self._stored_size <= self.max_size:
+                    return
+
+            files = []
+            for root, _, names in os.walk(self.directory):
+                for name in names:
+                    if name.endswith('.npy'):
+                        path = os.path.join(root, name)
+                        try:
+                            stat = os.stat(path)
+                        except OSError:
+                            continue
+                        files.append((stat.st_mtime, stat.st_size, path))
+
+            total_size = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total_size <= self.max_size:
+                    break
+                remove_file(path)
+                total_size -= size
+            self._stored_size = total_size
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
@@ -14,103 +14,504 @@
 # limitations under the License.
 #
 
-from io import StringIO
+import numbers
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-from bravado.client import SwaggerClient
-from bravado.requests_client import RequestsClient
+from bravado.client import SwaggerClient, construct_request
+from bravado.exception import make_http_exception
+from bravado.requests_client import RequestsResponseAdapter
+from bravado.swagger_model import load_url
+from bravado_core.exception import SwaggerMappingError
 from bravado_core.formatter import SwaggerFormat
 
-from neptunelib.model import LeaderboardEntry
+from neptunelib.instrumentation import Instrumentation, MeteredStream, clock, received_bytes, retry_count
+from neptunelib.model import LeaderboardEntry, leaderboard_page_from_json
 from neptunelib.oauth import NeptuneAuthenticator
+from neptunelib.request_cache import memoized
+from neptunelib.transport import DEFAULT_CONNECTION_POOL_SIZE, IDEMPOTENT_METHODS, HttpTransport
+from neptunelib.utils import map_concurrently, unique_by_id
+
+DEFAULT_LEADERBOARD_PAGE_SIZE = 100
+DEFAULT_MAX_WORKERS = 4
+
+# Fields of leaderboard entries the leaderboard can be sorted by natively, by the names of their columns.
+NATIVE_SORT_FIELDS = {
+    'id': 'shortId',
+    'name': 'name',
+    'created': 'timeOfCreation',
+    'finished': 'timeOfCompletion',
+    'running_time': 'runningTime',
+    'owner': 'owner',
+    'state': 'state',
+    'size': 'size',
+    'notes': 'description'
+}
+
+# Arguments filtering leaderboard entries whose values are sets, in whatever order they are listed.
+LEADERBOARD_FILTERS = ('entry_types', 'ids', 'group_ids', 'states', 'owners', 'tags')
+
+# Sort field types of the leaderboard columns of user-defined values, by the prefixes of their names.
+SORT_FIELD_TYPES = {
+    'channel_': 'numericChannels',
+    'parameter_': 'parameter',
+    'property_': 'property'
+}
 
 
 class Client(object):
-    def __init__(self, api_address, api_token):
+    def __init__(self, api_address, api_token, transport=None, channel_values_cache=None, swagger_spec_cache=None,
+                 raw_leaderboard=False, request_cache=None, instrumentation=None, connection_pool_size=None):
         self.api_address = api_address
         self.api_token = api_token
+        self.channel_values_cache = channel_values_cache
+        self.swagger_spec_cache = swagger_spec_cache
+        # Pages of leaderboards are decoded from JSON into plain DTOs, instead of being unmarshalled by bravado.
+        self.raw_leaderboard = raw_leaderboard
+        # Results of requests of projects, members and leaderboards are reused when a cache is given.
+        self.request_cache = request_cache
+        # Every request is recorded, with the time split between waiting for the network and decoding.
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+
+        # Connections are pooled by the transport, which may be shared with clients of other sessions.
+        # The size of the pool may be given instead, for a transport of the client alone.
+        if transport is not None and connection_pool_size is not None:
+            raise ValueError('connection_pool_size applies only to the transport created by the client; '
+                             'set pool_size of the given transport instead')
+        if transport is None:
+            transport = HttpTransport(pool_size=connection_pool_size or DEFAULT_CONNECTION_POOL_SIZE)
+        self.transport = transport
+        self._http_client = self.transport.http_client()
+
+        # Swagger clients are built, and the API token is exchanged, only when they are first used.
+        self._swagger_clients = {}
+        self._swagger_clients_lock = threading.RLock()
+        # Swagger clients built from cached specs, replaced by ones built from specs fetched again, by API names.
+        self._replaced_swagger_clients = {}
+
+    @property
+    def backend_swagger_client(self):
+        return self._get_swagger_client('backend')
+
+    @property
+    def leaderboard_swagger_client(self):
+        return self._get_swagger_client('leaderboard')
+
+    def _get_swagger_client(self, api_name, authenticated=True):
+        swagger_client = self._swagger_clients.get(api_name)
+        if swagger_client is not None and (self._http_client.authenticator is not None or not authenticated):
+            return swagger_client
+
+        with self._swagger_clients_lock:
+            if api_name not in self._swagger_clients:
+                self._swagger_clients[api_name] = self._build_swagger_client(api_name)
 
-        http_client = RequestsClient()
+            if authenticated and self._http_client.authenticator is None:
+                backend_swagger_client = self._get_swagger_client('backend', authenticated=False)
+                self._http_client.authenticator = NeptuneAuthenticator(
+                    self._call(backend_swagger_client, 'exchangeApiToken', X_Neptune_Api_Token=self.api_token))
 
-        self.backend_swagger_client = SwaggerClient.from_url(
-            '{}/api/backend/swagger.json'.format(self.api_address),
-            config=dict(
-                validate_swagger_spec=False,
-                formats=[uuid_format]),
-            http_client=http_client)
+            return self._swagger_clients[api_name]
 
-        self.leaderboard_swagger_client = SwaggerClient.from_url(
-            '{}/api/leaderboard/swagger.json'.format(self.api_address),
-            config=dict(
-                validate_swagger_spec=False,
-                validate_responses=False,  # TODO!!!
-                formats=[uuid_format]),
-            http_client=http_client)
+    def _build_swagger_client(self, api_name):
+        spec_url = swagger_spec_url(self.api_address, api_name)
 
-        http_client.authenticator = NeptuneAuthenticator(
-            self.backend_swagger_client.api.exchangeApiToken(X_Neptune_Api_Token=api_token).response().result)
+        def fetch_spec():
+            return load_url(spec_url, http_client=self._http_client)
 
+        if self.swagger_spec_cache is None:
+            spec = fetch_spec()
+        else:
+            spec = self.swagger_spec_cache.get_spec(spec_url, fetch_spec)
+
+        return swagger_client_from_spec(api_name, spec, spec_url, http_client=self._http_client)
+
+    def _refetch_swagger_client(self, swagger_client):
+        """Returns a swagger client built from a freshly fetched spec, in place of one built from a cached spec.
+
+        A cached spec is outdated when the API changed before it expired. The spec of every API is fetched again
+        at most once, and None is returned when it already was or when specs are not cached.
+        """
+        if self.swagger_spec_cache is None:
+            return None
+
+        with self._swagger_clients_lock:
+            for api_name, replaced_swagger_client in self._replaced_swagger_clients.items():
+                if replaced_swagger_client is swagger_client:
+                    return self._swagger_clients[api_name]
+                if self._swagger_clients[api_name] is swagger_client:
+                    return None
+
+            for api_name, current_swagger_client in self._swagger_clients.items():
+                if current_swagger_client is swagger_client:
+                    self.swagger_spec_cache.invalidate(swagger_spec_url(self.api_address, api_name))
+                    self._replaced_swagger_clients[api_name] = swagger_client
+                    self._swagger_clients[api_name] = self._build_swagger_client(api_name)
+                    return self._swagger_clients[api_name]
+            return None
+
+    def _current_swagger_client(self, swagger_client, operation_name):
+        """Returns the swagger client, or one built from a spec fetched again when its spec lacks the operation."""
+        if hasattr(getattr(swagger_client, 'api', None), operation_name):
+            return swagger_client
+        return self._refetch_swagger_client(swagger_client) or swagger_client
+
+    @memoized()
     def get_projects(self, namespace):
-        r = self.backend_swagger_client.api.listProjectsInOrganization(
-            organizationName=namespace
-        ).response()
-        return r.result.entries
+        result = self._call(self.backend_swagger_client, 'listProjectsInOrganization', organizationName=namespace)
+        return result.entries
 
+    @memoized()
     def get_project_members(self, project_identifier):
-        r = self.backend_swagger_client.api.listProjectMembers(
-            projectIdentifier=project_identifier
-        ).response()
-
-        return r.result
+        return self._call(self.backend_swagger_client, 'listProjectMembers', projectIdentifier=project_identifier)
 
+    @memoized(unordered=LEADERBOARD_FILTERS)
     def get_leaderboard_entries(self, namespace, project_name,
                                 entry_types=None, ids=None, group_ids=None,
                                 states=None, owners=None, tags=None,
-                                min_running_time=None):
-        if entry_types is None:
-            entry_types = ['experiment', 'notebook']
+                                min_running_time=None, sort_by='id', ascending=True, limit=None,
+                                page_size=DEFAULT_LEADERBOARD_PAGE_SIZE, max_workers=DEFAULT_MAX_WORKERS,
+                                select=None):
+        """Returns the entries of `fetch_leaderboard_entries`, reused by identical calls when requests are cached."""
+        return self.fetch_leaderboard_entries(namespace, project_name,
+                                              entry_types, ids, group_ids,
+                                              states, owners, tags,
+                                              min_running_time, sort_by, ascending, limit,
+                                              page_size, max_workers, select)
+
+    def fetch_leaderboard_entries(self, namespace, project_name,
+                                  entry_types=None, ids=None, group_ids=None,
+                                  states=None, owners=None, tags=None,
+                                  min_running_time=None, sort_by='id', ascending=True, limit=None,
+                                  page_size=DEFAULT_LEADERBOARD_PAGE_SIZE, max_workers=DEFAULT_MAX_WORKERS,
+                                  select=None):
+        """Fetches leaderboard entries matching the filters, in the order of the `sort_by` column.
+
+        The entries are always requested, even when results of identical calls are cached.
+        With `limit`, only the first `limit` entries are fetched, page by page, and no further pages are requested.
+
+        `select`, when given, is called with the entries of every page as soon as the page arrives
+        and returns the entries to keep, so that the rest of them is discarded early.
+        The `limit` applies to the selected entries then.
+        """
+        get_portion = self._leaderboard_portion_getter(namespace, project_name,
+                                                       entry_types, ids, group_ids,
+                                                       states, owners, tags,
+                                                       min_running_time, sort_by, ascending)
+
+        def to_entries(portion):
+            entries = [LeaderboardEntry(e) for e in portion]
+            return select(entries) if select is not None else entries
+
+        return self._get_all_items(get_portion, step=page_size, max_workers=max_workers, select=to_entries,
+                                   limit=limit)
+
+    def iter_leaderboard_entries(self, namespace, project_name,
+                                 entry_types=None, ids=None, group_ids=None,
+                                 states=None, owners=None, tags=None,
+                                 min_running_time=None, sort_by='id', ascending=True,
+                                 page_size=DEFAULT_LEADERBOARD_PAGE_SIZE, prefetch=True):
+        """Yields pages of leaderboard entries matching the filters, in the order of the `sort_by` column.
+
+        With `prefetch`, the next page is requested while the current one is being consumed.
+        Without it, pages are requested only when they are needed, so no request is wasted
+        when the iteration is stopped early.
+        """
+        get_portion = self._leaderboard_portion_getter(namespace, project_name,
+                                                       entry_types, ids, group_ids,
+                                                       states, owners, tags,
+                                                       min_running_time, sort_by, ascending)
+
+        for portion in self._iter_portions(get_portion, step=page_size, prefetch=prefetch):
+            yield [LeaderboardEntry(e) for e in portion]
+
+    def _leaderboard_portion_getter(self, namespace, project_name,
+                                    entry_types, ids, group_ids,
+                                    states, owners, tags,
+                                    min_running_time, sort_by, ascending):
+        params = leaderboard_request_params(namespace, project_name,
+                                            entry_types, ids, group_ids,
+                                            states, owners, tags,
+                                            min_running_time, sort_by, ascending)
 
         def get_portion(limit, offset):
-            return self.leaderboard_swagger_client.api.getLeaderboard(
-                projectIdentifier="{}/{}".format(namespace, project_name),
-                entryType=entry_types,
-                shortId=ids, groupShortId=group_ids, state=states, owner=owners, tags=tags,
-                minRunningTimeSeconds=min_running_time,
-                sortBy=['shortId'], sortFieldType=['native'], sortDirection=['ascending'],
-                limit=limit, offset=offset
-            ).response().result.entries
-
-        return [LeaderboardEntry(e) for e in self._get_all_items(get_portion, step=100)]
-
-    def get_channel_points_csv(self, experiment_internal_id, channel_internal_id):
-        csv = StringIO()
-        csv.write(
-            self.backend_swagger_client.api.getChannelValuesCSV(
-                experimentId=experiment_internal_id, channelId=channel_internal_id
-            ).response().incoming_response.text
-        )
-        csv.seek(0)
-        return csv
+            return self._call(self.leaderboard_swagger_client, 'getLeaderboard', limit=limit, offset=offset, **params)
+
+        def get_raw_portion(limit, offset):
+            start = clock()
+            response = self._send(self.leaderboard_swagger_client, 'getLeaderboard', limit=limit, offset=offset,
+                                  **params)
+            body = response.content
+            network_end = clock()
+            page = leaderboard_page_from_json(body)
+            end = clock()
+            self.instrumentation.record_request(
+                'getLeaderboard', end - start, network_seconds=network_end - start, decode_seconds=end - network_end,
+                bytes_received=received_bytes(response.raw, len(body)), retries=retry_count(response.raw))
+            return page
+
+        return get_raw_portion if self.raw_leaderboard else get_portion
+
+    def get_channel_points_csv(self, experiment_internal_id, channel_internal_id, offset=None):
+        params = dict(experimentId=experiment_internal_id, channelId=channel_internal_id)
+        if offset is not None:
+            params['offset'] = offset
+
+        return self._stream_response(self.backend_swagger_client, 'getChannelValuesCSV', **params)
+
+    @property
+    def supports_channel_points_offset(self):
+        return 'offset' in self.backend_swagger_client.api.getChannelValuesCSV.operation.params
 
     def get_metrics_csv(self, experiment_internal_id):
-        csv = StringIO()
-        csv.write(
-            self.backend_swagger_client.api.getSystemMetricsCSV(
-                experimentId=experiment_internal_id
-            ).response().incoming_response.text
-        )
-        csv.seek(0)
-        return csv
+        return self._stream_response(self.backend_swagger_client, 'getSystemMetricsCSV',
+                                     experimentId=experiment_internal_id)
+
+    def _stream_response(self, swagger_client, operation_name, **params):
+        """Sends a request of a swagger operation and returns a binary file-like object streaming the response body.
+
+        Bravado reads and decodes the whole body of a response before returning it. Streaming the raw body
+        instead lets parsers consume it in chunks, without holding any copies of the entire payload.
+        """
+        start = clock()
+        response = self._send(swagger_client, operation_name, stream=True, **params)
+        response.raw.decode_content = True
+        return MeteredStream(response.raw, self.instrumentation, operation_name, start,
+                             network_seconds=clock() - start, retries=retry_count(response.raw))
+
+    def _call(self, swagger_client, operation_name, **params):
+        """Sends a request of a swagger operation, records it and returns its result unmarshalled by bravado.
+
+        When the spec of the swagger client may be outdated, because it lacks the operation or the response
+        of an idempotent operation cannot be unmarshalled with it, the spec is fetched again and used instead.
+        """
+        swagger_client = self._current_swagger_client(swagger_client, operation_name)
+        try:
+            return self._call_once(swagger_client, operation_name, **params)
+        except SwaggerMappingError:
+            operation = getattr(swagger_client.api, operation_name).operation
+            refetched_swagger_client = None
+            if operation.http_method.upper() in IDEMPOTENT_METHODS:
+                refetched_swagger_client = self._refetch_swagger_client(swagger_client)
+            if refetched_swagger_client is None:
+                raise
+        return self._call_once(refetched_swagger_client, operation_name, **params)
+
+    def _call_once(self, swagger_client, operation_name, **params):
+        start = clock()
+        try:
+            response = getattr(swagger_client.api, operation_name)(**params).response()
+        except Exception:
+            seconds = clock() - start
+            self.instrumentation.record_request(operation_name, seconds, network_seconds=seconds, error=True)
+            raise
+
+        metadata = response.metadata
+        # pylint: disable=protected-access
+        raw = getattr(getattr(metadata.incoming_response, '_delegate', None), 'raw', None)
+        self.instrumentation.record_request(
+            operation_name, metadata.elapsed_time, network_seconds=metadata.request_elapsed_time,
+            decode_seconds=metadata.elapsed_time - metadata.request_elapsed_time,
+            bytes_received=received_bytes(raw, len(metadata.incoming_response.raw_bytes)), retries=retry_count(raw))
+        return response.result
+
+    def _send(self, swagger_client, operation_name, stream=False, **params):
+        """Sends a request of a swagger operation and returns its `requests.Response`, without unmarshalling it."""
+        swagger_client = self._current_swagger_client(swagger_client, operation_name)
+        operation = getattr(swagger_client.api, operation_name).operation
+        request_params, _ = self._http_client.separate_params(construct_request(operation, {}, **params))
+        session = self._http_client.session
+
+        start = clock()
+        response = session.send(
+            session.prepare_request(self._http_client.authenticated_request(request_params)),
+            stream=stream)
+        if response.status_code >= 400:
+            seconds = clock() - start
+            self.instrumentation.record_request(operation_name, seconds, network_seconds=seconds,
+                                                retries=retry_count(response.raw), error=True)
+            raise make_http_exception(response=RequestsResponseAdapter(response))
+        return response
 
     @staticmethod
-    def _get_all_items(get_portion, step):
-        items = []
+    def _get_all_items(get_portion, step, max_workers=1, select=None, limit=None):
+        """Fetches all items of a paginated listing.
+
+        The first portion is used as a probe: when it reports `matchingItemCount`, the remaining offsets
+        are planned upfront and fetched concurrently. Portions are merged in the order of their offsets,
+        so the ordering requested from the server is preserved.
+        Items that appeared after the probe are picked up by fetching the next portions one by one.
+
+        `select`, when given, maps the items of every portion to the ones to keep, right after the portion
+        has been fetched. Offsets of the next portions are still counted with all fetched items.
+
+        With `limit`, only the first `limit` (selected) items are returned and no further portions are fetched.
+        Without `select`, portions are not larger than the limit and all of them are planned upfront.
+        With `select`, portions are fetched one by one, since it is not known how many of them hold enough items.
+        """
+        pagination = Pagination(step, select=select, limit=limit)
+
+        def fetch(offset):
+            return pagination.select_portion(get_portion(limit=pagination.step, offset=offset).entries)
+
+        first_portion = get_portion(limit=pagination.step, offset=0)
+        pagination.add(*pagination.select_portion(first_portion.entries))
+        for portion in map_concurrently(fetch, pagination.planned_offsets(first_portion), max_workers=max_workers):
+            pagination.add(*portion)
+
+        offset = pagination.next_offset()
+        while offset is not None:
+            pagination.add(*fetch(offset))
+            offset = pagination.next_offset()
+
+        return pagination.result()
+
+    @staticmethod
+    def _iter_portions(get_portion, step, prefetch=True):
+        """Yields consecutive non-empty portions of a paginated listing.
+
+        With `prefetch`, the next portion is requested in the background while the current one is being consumed.
+        """
+        if not prefetch:
+            offset = 0
+            while True:
+                items = list(get_portion(limit=step, offset=offset).entries)
+                offset += len(items)
+                if items:
+                    yield items
+                if len(items) < step:
+                    return
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            offset = 0
+            next_portion = executor.submit(get_portion, limit=step, offset=offset)
+            while next_portion is not None:
+                items = list(next_portion.result().entries)
+                offset += len(items)
+                next_portion = executor.submit(get_portion, limit=step, offset=offset) if len(items) >= step else None
+                if items:
+                    yield items
+
+
+class Pagination(object):
+    """Plans the portions of a paginated listing to fetch, and merges the fetched ones.
+
+    It is shared by `Client` and `neptunelib.aio.client.AsyncClient`, which fetch the portions it plans
+    as described by `Client._get_all_items`: the first portion, then the planned offsets concurrently,
+    then next offsets one by one, until there are none.
+
+    Args:
+        step(int): Requested size of the portions.
+        select(callable): Maps the items of every portion to the ones to keep. All of them are kept when None.
+        limit(int): Maximum number of (selected) items to return, or None.
+    """
+
+    def __init__(self, step, select=None, limit=None):
+        self.select = select or list
+        self.limit = limit
+        # Without `select`, portions are not larger than the limit.
+        self.step = min(step, limit) if limit is not None and self.select is list else step
+        self.item_count = 0
+        self.items = []
+        self._exhausted = False
+
+    def select_portion(self, portion_items):
+        """Returns the number of items of a fetched portion and the selected ones, to be passed to `add`."""
+        portion_items = list(portion_items)
+        return len(portion_items), list(self.select(portion_items))
+
+    def add(self, portion_item_count, selected_items):
+        """Merges the next portion, in the order of offsets. An empty portion ends the listing."""
+        self.item_count += portion_item_count
+        self.items += selected_items
+        self._exhausted = self._exhausted or not portion_item_count
+
+    def planned_offsets(self, first_portion):
+        """Returns offsets of the portions to fetch concurrently after the first one, according to the
+        `matchingItemCount` it reports. With `select` and `limit`, nothing is planned, since it is not known
+        how many portions hold enough items.
+        """
+        matching_item_count = getattr(first_portion, 'matchingItemCount', None)
+        if self.item_count < self.step or not isinstance(matching_item_count, numbers.Integral) \
+                or self._has_enough_items():
+            return []
+        planned_item_count = matching_item_count
+        if self.limit is not None:
+            planned_item_count = min(matching_item_count, self.limit) if self.select is list else self.step
+        return list(range(self.step, planned_item_count, self.step))
+
+    def next_offset(self):
+        """Returns the offset of the next portion to fetch, e.g. of items added after the first portion,
+        or None when the listing ended or enough items were fetched.
+        """
+        if self._exhausted or not self.item_count or self.item_count % self.step or self._has_enough_items():
+            return None
+        return self.item_count
+
+    def result(self):
+        """Returns the merged items, without duplicates, up to the limit."""
+        return unique_by_id(self.items)[:self.limit]
+
+    def _has_enough_items(self):
+        return self.limit is not None and len(self.items) >= self.limit
+
+
+def swagger_spec_url(api_address, api_name):
+    return '{}/api/{}/swagger.json'.format(api_address, api_name)
+
+
+def swagger_client_from_spec(api_name, spec, spec_url, http_client=None):
+    config = dict(validate_swagger_spec=False, formats=[uuid_format])
+    if api_name == 'leaderboard':
+        config['validate_responses'] = False  # TODO!!!
+
+    return SwaggerClient.from_spec(spec, origin_url=spec_url, http_client=http_client, config=config)
+
+
+def leaderboard_request_params(namespace, project_name,
+                               entry_types, ids, group_ids,
+                               states, owners, tags,
+                               min_running_time, sort_by='id', ascending=True):
+    """Returns parameters of the getLeaderboard operation, except for the limit and offset of a page."""
+    if entry_types is None:
+        entry_types = ['experiment', 'notebook']
+
+    params = dict(
+        projectIdentifier="{}/{}".format(namespace, project_name),
+        entryType=entry_types,
+        shortId=ids, groupShortId=group_ids, state=states, owner=owners, tags=tags,
+        minRunningTimeSeconds=min_running_time
+    )
+    params.update(leaderboard_sort_params(sort_by, ascending))
+    return params
+
+
+def leaderboard_sort_params(sort_by, ascending):
+    """Returns the sorting parameters of the getLeaderboard operation for a leaderboard column.
+
+    Entries with equal values are ordered by their short ids, so that pages of a listing do not overlap.
+
+    Args:
+        sort_by(str): Name of a leaderboard column, e.g. 'running_time', 'channel_loss' or 'parameter_lr'.
+        ascending(bool): Whether to sort in the ascending order.
 
-        previous_items = None
-        while previous_items is None or len(previous_items) >= step:
-            previous_items = get_portion(limit=step, offset=len(items))
-            items += previous_items
+    Raises:
+        ValueError: When the leaderboard cannot be sorted by the column.
+    """
+    if sort_by in NATIVE_SORT_FIELDS:
+        sort_field, sort_field_type = NATIVE_SORT_FIELDS[sort_by], 'native'
+    else:
+        prefix = next((p for p in SORT_FIELD_TYPES if sort_by.startswith(p)), None)
+        if prefix is None:
+            raise ValueError('Cannot sort the leaderboard by column {!r}'.format(sort_by))
+        sort_field, sort_field_type = sort_by[len(prefix):], SORT_FIELD_TYPES[prefix]
 
-        return items
+    sort_direction = 'ascending' if ascending else 'descending'
+    if sort_field == 'shortId':
+        return dict(sortBy=[sort_field], sortFieldType=[sort_field_type], sortDirection=[sort_direction])
+    return dict(sortBy=[sort_field, 'shortId'],
+                sortFieldType=[sort_field_type, 'native'],
+                sortDirection=[sort_direction, 'ascending'])
 
 
 uuid_format = SwaggerFormat(
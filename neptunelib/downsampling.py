@@ -0,0 +1,205 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Downsampling of channel values, e.g. to plot long channels.
+
+Every method picks at most `max_points` of the original points, so the downsampled values are actual values
+of the channel. Methods return indices of the picked points, in the increasing order:
+
+    - 'lttb': Largest-Triangle-Three-Buckets, which keeps the visual shape of a series,
+    - 'minmax': the minimum and the maximum of every bucket of consecutive points, which keeps all spikes,
+    - 'stride': every n-th point, which is the fastest one.
+"""
+
+import numpy as np
+import pandas as pd
+
+from neptunelib.utils import CSV_CHUNK_SIZE, iter_csv_chunks
+
+DEFAULT_DOWNSAMPLING_METHOD = 'lttb'
+
+
+def lttb(x, y, max_points):
+    """Returns indices of points picked with the Largest-Triangle-Three-Buckets algorithm.
+
+    The first and the last points are always picked. The rest of the points is split into `max_points - 2`
+    buckets of consecutive points, and the point forming the largest triangle with the point picked from
+    the previous bucket and the average of the next bucket is picked from every bucket.
+    Areas of triangles are computed for whole buckets at once.
+    """
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+    if max_points < 3:
+        return np.array([0, n - 1][:max_points], dtype=np.int64)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+
+    # Averages of all buckets, with the last point as the one after the last bucket.
+    bucket_sizes = np.diff(edges)
+    average_x = np.append(np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / bucket_sizes, x[n - 1])
+    average_y = np.append(np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / bucket_sizes, y[n - 1])
+
+    indices = np.empty(max_points, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for bucket in range(max_points - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        ax, ay = x[a], y[a]
+        cx, cy = average_x[bucket + 1], average_y[bucket + 1]
+        areas = np.abs((ax - cx) * (y[start:stop] - ay) - (ax - x[start:stop]) * (cy - ay))
+        a = start + int(np.argmax(areas))
+        indices[bucket + 1] = a
+    return indices
+
+
+# x values are unused by some methods, which all share the (x, y, max_points) signature.
+def minmax(x, y, max_points):  # pylint: disable=unused-argument
+    """Returns indices of the minimum and the maximum of every bucket of consecutive points.
+
+    Points are split into `max_points // 2` buckets of equal sizes, except for the last one.
+    """
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+
+    bucket_count = max(max_points // 2, 1)
+    bucket_size = -(-n // bucket_count)
+    bucket_count = -(-n // bucket_size)
+    offsets = np.arange(bucket_count) * bucket_size
+
+    y = np.asarray(y, dtype=np.float64)
+    padded = np.full(bucket_count * bucket_size, np.inf)
+    padded[:n] = y
+    minimums = padded.reshape(bucket_count, bucket_size).argmin(axis=1) + offsets
+    padded[:n] = y
+    padded[n:] = -np.inf
+    maximums = padded.reshape(bucket_count, bucket_size).argmax(axis=1) + offsets
+    return np.unique(np.concatenate([minimums, maximums]))
+
+
+def stride(x, y, max_points):  # pylint: disable=unused-argument
+    """Returns indices of every n-th point, with n chosen to pick at most `max_points` points."""
+    n = len(y)
+    return np.arange(0, n, max(-(-n // max_points), 1))
+
+
+DOWNSAMPLING_METHODS = {
+    'lttb': lttb,
+    'minmax': minmax,
+    'stride': stride
+}
+
+# Minimum numbers of points the methods can downsample to, as 'minmax' keeps pairs of points.
+MIN_MAX_POINTS = {
+    'lttb': 1,
+    'minmax': 2,
+    'stride': 1
+}
+
+
+def get_downsampling_method(name, max_points=None):
+    """Returns the downsampling method of the given name, checking the number of points to keep if given.
+
+    Raises:
+        ValueError: When there is no such method or `max_points` is lower than the method can keep.
+    """
+    if name not in DOWNSAMPLING_METHODS:
+        raise ValueError('Unknown downsampling method {!r}, expected one of: {}'.format(
+            name, ', '.join(sorted(DOWNSAMPLING_METHODS))))
+    if max_points is not None and max_points < MIN_MAX_POINTS[name]:
+        raise ValueError('Expected max_points of {!r} downsampling to be at least {}, got {!r}'.format(
+            name, MIN_MAX_POINTS[name], max_points))
+    return DOWNSAMPLING_METHODS[name]
+
+
+def downsample(x, y, max_points, method=DEFAULT_DOWNSAMPLING_METHOD):
+    """Downsamples values of a channel to at most `max_points` points.
+
+    Args:
+        x(`numpy.ndarray`): x values of the channel.
+        y(`numpy.ndarray`): y values of the channel.
+        max_points(int): Maximum number of points to keep.
+        method(str): Name of the downsampling method: 'lttb', 'minmax' or 'stride'.
+
+    Returns:
+        tuple: x and y values of the picked points.
+    """
+    indices = get_downsampling_method(method, max_points)(x, y, max_points)
+    return np.asarray(x)[indices], np.asarray(y)[indices]
+
+
+class StreamingDownsampler(object):
+    """Downsamples values of a channel added in consecutive chunks, holding a bounded number of them.
+
+    Every chunk is downsampled to `max_points` points as soon as it is added, and the points kept so far are
+    downsampled again whenever there are `compaction_factor` times as many of them. The result is then
+    downsampled once more.
+    The 'minmax' method keeps the minimum and the maximum of the whole series this way, while the result
+    of the other methods approximates the one of downsampling the whole series at once.
+    """
+
+    def __init__(self, max_points, method=DEFAULT_DOWNSAMPLING_METHOD, compaction_factor=8):
+        self.max_points = max_points
+        self.method = method
+        self.compaction_factor = compaction_factor
+        self._downsample = get_downsampling_method(method, max_points)
+        self._xs = []
+        self._ys = []
+        self._count = 0
+
+    def add(self, x, y):
+        if len(y) > self.max_points:
+            indices = self._downsample(x, y, self.max_points)
+            x, y = x[indices], y[indices]
+        self._xs.append(x)
+        self._ys.append(y)
+        self._count += len(y)
+
+        if self._count > self.compaction_factor * self.max_points:
+            x, y = self._result()
+            self._xs, self._ys, self._count = [x], [y], len(y)
+
+    def result(self):
+        """Returns x and y values of the picked points."""
+        return self._result()
+
+    def _result(self):
+        if not self._xs:
+            return np.empty(0), np.empty(0)
+        x, y = np.concatenate(self._xs), np.concatenate(self._ys)
+        indices = self._downsample(x, y, self.max_points)
+        return x[indices], y[indices]
+
+
+def read_downsampled_channel_csv(csv, columns, max_points, method=DEFAULT_DOWNSAMPLING_METHOD,
+                                 chunk_size=CSV_CHUNK_SIZE):
+    """Reads values of a channel from a headerless CSV of x and y values, downsampling them while parsing.
+
+    The CSV is parsed in chunks of `chunk_size` rows, so all the values of the channel are never held in memory.
+
+    Returns:
+        `pandas.DataFrame`: DataFrame of the picked points, with the given columns.
+    """
+    downsampler = StreamingDownsampler(max_points, method)
+    for chunk in iter_csv_chunks(csv, columns, chunk_size):
+        values = chunk.values
+        downsampler.add(values[:, 0], values[:, 1])
+
+    x, y = downsampler.result()
+    return pd.DataFrame(dict(zip(columns, (x, y))), columns=columns)
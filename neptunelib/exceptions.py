@@ -16,3 +16,21 @@
 
 class InvalidApiToken(Exception):
     pass
+
+
+class ChannelValuesFetchError(Exception):
+    def __init__(self, errors, experiment_id=None):
+        self.errors = errors
+        self.experiment_id = experiment_id
+        super(ChannelValuesFetchError, self).__init__(
+            'Failed to fetch values of channels{}: {}'.format(
+                ' of experiment {}'.format(experiment_id) if experiment_id is not None else '',
+                ', '.join('{} ({!r})'.format(channel, error) for channel, error in errors.items())))
+
+
+class HardwareUtilizationFetchError(Exception):
+    def __init__(self, errors):
+        self.errors = errors
+        super(HardwareUtilizationFetchError, self).__init__(
+            'Failed to fetch hardware utilization of experiments: {}'.format(
+                ', '.join('{} ({!r})'.format(experiment_id, error) for experiment_id, error in errors.items())))
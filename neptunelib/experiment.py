@@ -14,10 +14,19 @@
 # limitations under the License.
 #
 
+from collections import OrderedDict
+from contextlib import closing
+
 import pandas as pd
 from pandas.errors import EmptyDataError
 
-from neptunelib.utils import map_values, align_channels_on_x
+from neptunelib.client import DEFAULT_MAX_WORKERS
+from neptunelib.downsampling import DEFAULT_DOWNSAMPLING_METHOD, downsample, get_downsampling_method, \
+    read_downsampled_channel_csv
+from neptunelib.exceptions import ChannelValuesFetchError
+from neptunelib.hardware_utilization import DEFAULT_HARDWARE_UTILIZATION_AGGREGATION, read_hardware_utilization, \
+    resample_hardware_utilization, validate_resampling
+from neptunelib.utils import CSV_CHUNK_SIZE, map_values, align_channels_on_x, iter_csv_chunks, map_concurrently
 
 
 class Experiment(object):
@@ -204,7 +213,7 @@ class Experiment(object):
         """
         return self._simple_dict_to_dataframe(self._leaderboard_entry.properties)
 
-    def get_hardware_utilization(self):
+    def get_hardware_utilization(self, **kwargs):
         """Retrieve RAM, CPU and GPU utilization throughout the experiment.
 
         The returned DataFrame contains 2 columns (x_*, y_*) for each of: RAM, CPU and each GPU.
@@ -224,6 +233,18 @@ class Experiment(object):
 
         The returned DataFrame may contain NaNs if one of the metrics has more values than others.
 
+        With `compact=True` the returned DataFrame is indexed by the time (in milliseconds) instead,
+        and contains a single float32 column for each metric, e.g. ram, cpu, gpu_util_0, gpu_mem_0.
+        It takes less than half of the memory of the default format.
+        Compact metrics can be resampled to a fixed `interval`, e.g. to 10 second maximums.
+
+        Args:
+            compact(bool): Keyword-only. Whether to return the metrics in the compact format.
+            interval(float): Keyword-only. Length of resampling intervals in seconds, used with `compact=True`.
+                The returned DataFrame is indexed by the starts of intervals then.
+            aggregation(str or list): Keyword-only. Aggregation of values within a resampling interval:
+                'mean' (default), 'max', 'min', 'median', 'first' or 'last', or a list of them.
+
         Returns:
             `pandas.DataFrame`: Dataframe containing the hardware utilization metrics throughout the experiment.
 
@@ -244,16 +265,25 @@ class Experiment(object):
 
             Get hardware utilization channels.
 
-            >>> experiment.get_hardware_utilization
+            >>> experiment.get_hardware_utilization()
+
+            Get peak utilization in every minute.
+
+            >>> experiment.get_hardware_utilization(compact=True, interval=60, aggregation='max')
 
         """
-        metrics_csv = self._client.get_metrics_csv(self._leaderboard_entry.internal_id)
-        try:
-            return pd.read_csv(metrics_csv)
-        except EmptyDataError:
-            return pd.DataFrame()
+        compact, interval, aggregation = self._pop_hardware_utilization_options(kwargs)
+        if compact:
+            return self._fetch_hardware_utilization(interval, aggregation)
 
-    def get_numeric_channels_values(self, *channel_names):
+        # Closing the stream returns its connection to the pool, also when parsing fails half way.
+        with closing(self._client.get_metrics_csv(self._leaderboard_entry.internal_id)) as metrics_csv:
+            try:
+                return pd.read_csv(metrics_csv)
+            except EmptyDataError:
+                return pd.DataFrame()
+
+    def get_numeric_channels_values(self, *channel_names, **kwargs):
         """
         Retrieve values of specified numeric channels.
 
@@ -264,12 +294,26 @@ class Experiment(object):
 
         The returned DataFrame may contain NaNs if one of the channels has more values than others.
 
+        Values of the channels are downloaded concurrently.
+
+        Long channels can be downsampled with `max_points`, e.g. for plotting. Every channel is downsampled
+        separately, while its CSV is being parsed, so all of its values are never held in memory.
+        Downsampled channels usually keep different x values, so they are best retrieved one at a time.
+
         Args:
             *channel_names: variable length list of names of the channels to retrieve values for.
+            max_workers(int): Keyword-only. Maximum number of channels downloaded concurrently.
+            max_points(int): Keyword-only. Maximum number of values of every channel to keep.
+            downsampling(str): Keyword-only. Name of the downsampling method used with `max_points`:
+                'lttb' (default), 'minmax' or 'stride'. See `neptunelib.downsampling` for details.
 
         Returns:
             `pandas.DataFrame`: Dataframe containing the values for the requested numerical channels.
 
+        Raises:
+            `neptunelib.exceptions.ChannelValuesFetchError`: When values of any of the channels could not be fetched.
+                Its `errors` attribute maps names of these channels to the errors that occurred.
+
         Examples:
             Instantiate a session.
 
@@ -290,28 +334,116 @@ class Experiment(object):
             >>> batch_channels = exp.get_numeric_channels_values('unet_0 batch sum loss', 'unet_1 batch sum loss')
             >>> epoch_channels = exp.get_numeric_channels_values('unet_0 epoch_val sum loss', 'Learning Rate')
 
+            Get at most 2000 values of a long channel to plot it:
+
+            >>> batch_loss = exp.get_numeric_channels_values('unet_0 batch sum loss', max_points=2000)
+
         Note:
             Remember to fetch the dataframe for the channels that have a common temporal/iteration axis x.
             For example combine epoch channels to one dataframe and batch channels to the other
         """
 
-        channels_data = {}
-        for channel_name in channel_names:
-            channel_id = self._leaderboard_entry.channels_dict_by_name[channel_name].id
-            try:
-                channels_data[channel_name] = pd.read_csv(
-                    self._client.get_channel_points_csv(self._leaderboard_entry.internal_id, channel_id),
-                    header=None,
-                    names=['x_{}'.format(channel_name), 'y_{}'.format(channel_name)],
-                    dtype=float
-                )
-            except EmptyDataError:
-                channels_data[channel_name] = pd.DataFrame(
-                    columns=['x_{}'.format(channel_name), 'y_{}'.format(channel_name)],
-                    dtype=float
-                )
+        max_workers = kwargs.pop('max_workers', DEFAULT_MAX_WORKERS)
+        max_points = kwargs.pop('max_points', None)
+        downsampling = kwargs.pop('downsampling', DEFAULT_DOWNSAMPLING_METHOD)
+        if kwargs:
+            raise TypeError('Unexpected keyword arguments: {}'.format(', '.join(kwargs)))
+
+        channels_values = self._fetch_channels_values(channel_names, max_workers, max_points, downsampling)
+        with self._client.instrumentation.timed('align_channels'):
+            return align_channels_on_x(pd.concat(channels_values.values(), axis=1, sort=False))
+
+    def get_numeric_channels_arrays(self, *channel_names, **kwargs):
+        """Retrieve values of specified numeric channels as NumPy arrays.
+
+        Unlike `get_numeric_channels_values`, channels are not aligned on a common x, so their values are not copied.
+        When the session keeps channel values on disk with `channel_cache_mmap=True`, the returned arrays are
+        read-only views memory-mapped from the cache files, which lets you work with many long channels
+        without loading all of them into memory.
 
-        return align_channels_on_x(pd.concat(channels_data.values(), axis=1, sort=False))
+        Args:
+            *channel_names: variable length list of names of the channels to retrieve values for.
+            max_workers(int): Keyword-only. Maximum number of channels downloaded concurrently.
+            max_points(int): Keyword-only. Maximum number of values of every channel to keep.
+            downsampling(str): Keyword-only. Name of the downsampling method used with `max_points`.
+
+        Returns:
+            dict: A dictionary mapping a channel name to a (2, n) float64 array,
+            with x values in the first row and y values in the second one.
+
+        Raises:
+            `neptunelib.exceptions.ChannelValuesFetchError`: When values of any of the channels could not be fetched.
+
+        Examples:
+            >>> session = Session(channel_cache_dir='~/.neptune/channels', channel_cache_mmap=True)
+            >>> project = session.get_projects('neptune-ml')['neptune-ml/Salt-Detection']
+            >>> exp = project.get_experiments(id='SAL-1609')[0]
+            >>> x, y = exp.get_numeric_channels_arrays('unet_0 batch sum loss')['unet_0 batch sum loss']
+            >>> y.max()
+
+        """
+        return dict(
+            (channel_name, values.values.T)
+            for channel_name, values in self.get_numeric_channels_frames(*channel_names, **kwargs).items()
+        )
+
+    def get_numeric_channels_frames(self, *channel_names, **kwargs):
+        """Retrieve values of specified numeric channels as separate DataFrames.
+
+        Every DataFrame contains x and y columns backed by the arrays returned by `get_numeric_channels_arrays`,
+        so they are memory-mapped too, when the session keeps channel values on disk with `channel_cache_mmap=True`.
+
+        Args:
+            *channel_names: variable length list of names of the channels to retrieve values for.
+            max_workers(int): Keyword-only. Maximum number of channels downloaded concurrently.
+            max_points(int): Keyword-only. Maximum number of values of every channel to keep.
+            downsampling(str): Keyword-only. Name of the downsampling method used with `max_points`.
+
+        Returns:
+            dict: A dictionary mapping a channel name to a `pandas.DataFrame` with x and y columns.
+
+        Raises:
+            `neptunelib.exceptions.ChannelValuesFetchError`: When values of any of the channels could not be fetched.
+
+        """
+        max_workers = kwargs.pop('max_workers', DEFAULT_MAX_WORKERS)
+        max_points = kwargs.pop('max_points', None)
+        downsampling = kwargs.pop('downsampling', DEFAULT_DOWNSAMPLING_METHOD)
+        if kwargs:
+            raise TypeError('Unexpected keyword arguments: {}'.format(', '.join(kwargs)))
+
+        channels_values = self._fetch_channels_values(channel_names, max_workers, max_points, downsampling)
+        for values in channels_values.values():
+            values.columns = ['x', 'y']
+        return channels_values
+
+    def iter_channel_values(self, channel_name, chunk_size=CSV_CHUNK_SIZE):
+        """Iterate over values of a numeric channel in chunks, streaming them from Neptune.
+
+        The CSV of the channel is parsed while it is being downloaded, one chunk at a time, so only a single chunk
+        of values is held in memory. This lets you aggregate values of channels far larger than the memory,
+        e.g. compute running minimums or percentiles. The channel cache of the session is not used.
+
+        The download is closed when the iteration is finished or abandoned.
+
+        Args:
+            channel_name(str): Name of the channel to retrieve values for.
+            chunk_size(int): Maximum number of values in a chunk.
+
+        Yields:
+            `pandas.DataFrame`: Consecutive chunks of values of the channel, with x and y columns.
+                Row labels continue across chunks.
+
+        Examples:
+            >>> exp = project.get_experiments(id='SAL-1609')[0]
+            >>> minimum = min(chunk['y'].min() for chunk in exp.iter_channel_values('unet_0 batch sum loss'))
+
+        """
+        channel_id = self._get_channel_id(channel_name)
+        internal_id = self._leaderboard_entry.internal_id
+        with closing(self._client.get_channel_points_csv(internal_id, channel_id)) as csv:
+            for chunk in iter_csv_chunks(csv, ['x', 'y'], chunk_size):
+                yield chunk
 
     def __str__(self):
         return 'Experiment({})'.format(self.id)
@@ -325,6 +457,80 @@ class Experiment(object):
     def __ne__(self, o):
         return not self.__eq__(o)
 
+    def _get_channel_id(self, channel_name):
+        return self._leaderboard_entry.channels_dict_by_name[channel_name].id
+
+    def _fetch_hardware_utilization(self, interval=None, aggregation=DEFAULT_HARDWARE_UTILIZATION_AGGREGATION):
+        with closing(self._client.get_metrics_csv(self._leaderboard_entry.internal_id)) as metrics_csv:
+            utilization = read_hardware_utilization(metrics_csv)
+        if interval is not None:
+            return resample_hardware_utilization(utilization, interval, aggregation)
+        return utilization
+
+    @staticmethod
+    def _pop_hardware_utilization_options(kwargs):
+        compact = kwargs.pop('compact', False)
+        interval = kwargs.pop('interval', None)
+        aggregation = kwargs.pop('aggregation', DEFAULT_HARDWARE_UTILIZATION_AGGREGATION)
+        if kwargs:
+            raise TypeError('Unexpected keyword arguments: {}'.format(', '.join(kwargs)))
+        if interval is not None and not compact:
+            raise ValueError('Hardware utilization can be resampled only with compact=True')
+        validate_resampling(interval, aggregation)
+        return compact, interval, aggregation
+
+    def _fetch_channels_values(self, channel_names, max_workers, max_points=None,
+                               downsampling=DEFAULT_DOWNSAMPLING_METHOD):
+        get_downsampling_method(downsampling, max_points)
+        channel_ids = [(name, self._get_channel_id(name)) for name in OrderedDict.fromkeys(channel_names)]
+
+        def fetch_channel_values(channel):
+            try:
+                return self._fetch_channel_values(channel[0], channel[1], max_points, downsampling), None
+            except Exception as e:
+                return None, e
+
+        results = map_concurrently(fetch_channel_values, channel_ids, max_workers=max_workers)
+
+        errors = dict((name, error) for (name, _), (_, error) in zip(channel_ids, results) if error is not None)
+        if errors:
+            raise ChannelValuesFetchError(errors, experiment_id=self.id)
+
+        return OrderedDict((name, values) for (name, _), (values, _) in zip(channel_ids, results))
+
+    def _fetch_channel_values(self, channel_name, channel_id, max_points=None,
+                              downsampling=DEFAULT_DOWNSAMPLING_METHOD):
+        columns = ['x_{}'.format(channel_name), 'y_{}'.format(channel_name)]
+
+        cache = self._client.channel_values_cache
+        if cache is None:
+            return self._read_channel_points_csv(channel_id, columns, max_points=max_points,
+                                                 downsampling=downsampling)
+
+        def fetch_values(offset):
+            return self._read_channel_points_csv(channel_id, columns, offset).values.T
+
+        values = cache.get_values(self._leaderboard_entry.internal_id, channel_id,
+                                  complete=self._leaderboard_entry.finished,
+                                  fetch_values=fetch_values,
+                                  incremental=self._client.supports_channel_points_offset)
+        if max_points is not None:
+            values = downsample(values[0], values[1], max_points, downsampling)
+            return pd.DataFrame(dict(zip(columns, values)), columns=columns)
+        # Values are not copied, so the DataFrame is backed by memory-mapped arrays, when the cache returns them.
+        return pd.DataFrame(values.T, columns=columns, copy=False)
+
+    def _read_channel_points_csv(self, channel_id, columns, offset=None, max_points=None,
+                                 downsampling=DEFAULT_DOWNSAMPLING_METHOD):
+        internal_id = self._leaderboard_entry.internal_id
+        with closing(self._client.get_channel_points_csv(internal_id, channel_id, offset=offset)) as csv:
+            if max_points is not None:
+                return read_downsampled_channel_csv(csv, columns, max_points, downsampling)
+            try:
+                return pd.read_csv(csv, header=None, names=columns, dtype=float)
+            except EmptyDataError:
+                return pd.DataFrame(columns=columns, dtype=float)
+
     @staticmethod
     def _simple_dict_to_dataframe(d):
         return pd.DataFrame.from_dict(map_values(lambda x: [x], d))
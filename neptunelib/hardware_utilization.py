@@ -0,0 +1,101 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Compact hardware utilization metrics, e.g. for capacity planning across many experiments.
+
+Metrics CSVs contain an x_<metric>, y_<metric> column pair for every metric, padded with NaNs when metrics
+have different numbers of values. The compact form is a DataFrame indexed by the time from the start
+of the experiment in milliseconds (x), with a float32 column of values for every metric.
+"""
+
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+from pandas.errors import EmptyDataError
+
+from neptunelib.utils import defined_points, scatter_on_common_x
+
+HARDWARE_UTILIZATION_AGGREGATIONS = ('mean', 'max', 'min', 'median', 'first', 'last')
+DEFAULT_HARDWARE_UTILIZATION_AGGREGATION = 'mean'
+
+
+def read_hardware_utilization(csv):
+    """Parses a metrics CSV into the compact form.
+
+    Values of all the metrics are aligned on a sorted union of their x values, with NaNs where a metric
+    has no value. When a metric has repeated x values, its last value is kept.
+
+    Args:
+        csv: A file-like object or bytes of a metrics CSV, with a header.
+
+    Returns:
+        `pandas.DataFrame`: DataFrame indexed by x, with a float32 column for every metric.
+    """
+    if isinstance(csv, bytes):
+        csv = BytesIO(csv)
+    try:
+        raw = pd.read_csv(csv, dtype=np.float64)
+    except EmptyDataError:
+        return _compact_frame(np.array([], dtype=np.float64), [], [])
+
+    metrics = [column[2:] for column in raw.columns if column.startswith('y_')]
+    points = [defined_points(raw['x_{}'.format(metric)].values, raw['y_{}'.format(metric)].values)
+              for metric in metrics]
+    common_x, values = scatter_on_common_x([xs for xs, _ in points], [ys for _, ys in points], dtype=np.float32)
+    return _compact_frame(common_x, metrics, values)
+
+
+def resample_hardware_utilization(utilization, interval, aggregation=DEFAULT_HARDWARE_UTILIZATION_AGGREGATION):
+    """Resamples compact hardware utilization to a fixed interval.
+
+    Values are grouped into consecutive intervals starting at x = 0 and aggregated per metric,
+    ignoring NaNs. Intervals without any values are left out.
+
+    Args:
+        utilization(`pandas.DataFrame`): Hardware utilization in the compact form.
+        interval(float): Length of an interval in seconds.
+        aggregation(str or list): Name of the aggregation of values within an interval, one of
+            'mean' (default), 'max', 'min', 'median', 'first' or 'last', or a list of such names.
+
+    Returns:
+        `pandas.DataFrame`: DataFrame indexed by the starts of intervals in milliseconds, with a float32 column
+            for every metric, or for every (metric, aggregation) pair when a list of aggregations is given.
+    """
+    validate_resampling(interval, aggregation)
+
+    interval_ms = interval * 1000.0
+    starts = np.floor(utilization.index.values / interval_ms) * interval_ms
+    resampled = utilization.groupby(pd.Index(starts, name='x')).agg(aggregation)
+    return resampled.astype(np.float32)
+
+
+def validate_resampling(interval, aggregation):
+    """Checks arguments of `resample_hardware_utilization`.
+
+    Raises:
+        ValueError: When the interval is not positive or the aggregation is not supported.
+    """
+    if interval is not None and not interval > 0:
+        raise ValueError('Resampling interval must be positive, got {!r}'.format(interval))
+    for name in aggregation if isinstance(aggregation, list) else [aggregation]:
+        if name not in HARDWARE_UTILIZATION_AGGREGATIONS:
+            raise ValueError('Unknown aggregation {!r}, expected one of: {}'.format(
+                name, ', '.join(HARDWARE_UTILIZATION_AGGREGATIONS)))
+
+
+def _compact_frame(x, metrics, values):
+    return pd.DataFrame(dict(zip(metrics, values)), index=pd.Index(x, name='x'), columns=metrics)
@@ -0,0 +1,226 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Metrics of API requests and of processing their results, e.g. to find out where time goes in a call
+of `Project.get_leaderboard`, or to export them to a monitoring system.
+
+Every API request is recorded under the name of its swagger operation, e.g. getLeaderboard, with:
+
+    - seconds: the time from sending the request until its response was fully processed,
+    - network_seconds: the time spent waiting for the response and reading its body,
+    - decode_seconds: the time spent decoding the body, e.g. unmarshalling JSON or parsing a CSV,
+    - bytes_received: the size of the body as it was received, i.e. compressed when compression is enabled,
+    - retries: the number of retries of the request, e.g. after 503 responses.
+
+Bodies of streamed responses, e.g. CSVs of channels, are decoded while they are being read, so the time spent
+in reading them counts as network time and the time between reads counts as decoding time.
+
+Processing of results, e.g. building DataFrames, is recorded under names of the processing steps.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+clock = getattr(time, 'perf_counter', time.time)
+
+REQUEST_FIELDS = ('seconds', 'network_seconds', 'decode_seconds', 'bytes_received', 'retries')
+
+
+class Instrumentation(object):
+    """Records metrics of API requests and processing steps, aggregated by their names.
+
+    Callbacks are called with every recorded event, as a dict with 'kind' ('request' or 'processing'),
+    'name', 'seconds' and, for requests, the rest of the request metrics and 'error'. They are called
+    in the threads which record the events, so they should be quick and thread-safe.
+
+    Args:
+        callbacks(list): Functions called with every recorded event.
+
+    Examples:
+        >>> from neptunelib.instrumentation import Instrumentation
+        >>> from neptunelib.session import Session
+        >>> session = Session(instrumentation=Instrumentation(callbacks=[print]))
+        >>> project = session.get_projects('neptune-ml')['neptune-ml/Salt-Detection']
+        >>> leaderboard = project.get_leaderboard()
+        >>> session.instrumentation.to_dict()['requests']['getLeaderboard']['network_seconds']
+    """
+
+    def __init__(self, callbacks=None):
+        self.callbacks = list(callbacks or [])
+        self._requests = {}
+        self._processing = {}
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback):
+        self.callbacks.append(callback)
+
+    def record_request(self, operation_name, seconds, network_seconds=0.0, decode_seconds=0.0,
+                       bytes_received=0, retries=0, error=False):
+        """Records a request of an API operation."""
+        event = dict(kind='request', name=operation_name, seconds=seconds, network_seconds=network_seconds,
+                     decode_seconds=decode_seconds, bytes_received=bytes_received, retries=retries, error=error)
+        with self._lock:
+            totals = self._requests.setdefault(operation_name, _empty_totals(REQUEST_FIELDS + ('errors',)))
+            for field in REQUEST_FIELDS:
+                totals[field] += event[field]
+            totals['errors'] += int(error)
+            _count(totals, seconds)
+        self._notify(event)
+
+    def record_processing(self, name, seconds):
+        """Records a processing step of results of requests, e.g. building a DataFrame."""
+        with self._lock:
+            totals = self._processing.setdefault(name, _empty_totals(('seconds',)))
+            totals['seconds'] += seconds
+            _count(totals, seconds)
+        self._notify(dict(kind='processing', name=name, seconds=seconds))
+
+    @contextmanager
+    def timed(self, name):
+        """Records the time spent in the block as a processing step of the given name."""
+        start = clock()
+        try:
+            yield
+        finally:
+            self.record_processing(name, clock() - start)
+
+    def to_dict(self):
+        """Returns the totals of the recorded metrics.
+
+        Returns:
+            dict: Dict with 'requests' and 'processing' dicts, mapping names of operations and processing steps
+                to their 'count', 'max_seconds' and totals of the recorded metrics, e.g.
+                {'requests': {'getLeaderboard': {'count': 3, 'seconds': 1.2, 'network_seconds': 0.9, ...}},
+                 'processing': {'leaderboard_dataframe': {'count': 1, 'seconds': 0.1, 'max_seconds': 0.1}}}
+        """
+        with self._lock:
+            return {
+                'requests': dict((name, dict(totals)) for name, totals in self._requests.items()),
+                'processing': dict((name, dict(totals)) for name, totals in self._processing.items())
+            }
+
+    def reset(self):
+        """Forgets all the recorded metrics."""
+        with self._lock:
+            self._requests.clear()
+            self._processing.clear()
+
+    def _notify(self, event):
+        for callback in self.callbacks:
+            callback(event)
+
+
+class MeteredStream(object):
+    """A binary file-like object recording the request of a streamed response when it is closed.
+
+    Args:
+        raw: The stream of the response body, e.g. `urllib3.response.HTTPResponse`.
+        instrumentation(`Instrumentation`): Instrumentation to record the request with.
+        operation_name(str): Name of the API operation.
+        start(float): Time the request was sent at.
+        network_seconds(float): Time spent waiting for the response headers.
+        retries(int): Number of retries of the request.
+    """
+
+    def __init__(self, raw, instrumentation, operation_name, start, network_seconds, retries):
+        self._raw = raw
+        self._instrumentation = instrumentation
+        self._operation_name = operation_name
+        self._start = start
+        self._network_seconds = network_seconds
+        self._retries = retries
+        self._bytes_read = 0
+        self._recorded = False
+
+    def read(self, *args, **kwargs):
+        return self._metered(self._raw.read, *args, **kwargs)
+
+    def read1(self, *args, **kwargs):
+        return self._metered(self._raw.read1, *args, **kwargs)
+
+    def readinto(self, buffer):
+        start = clock()
+        try:
+            size = self._raw.readinto(buffer)
+        finally:
+            self._network_seconds += clock() - start
+        self._bytes_read += size or 0
+        return size
+
+    def readable(self):
+        return True
+
+    @property
+    def closed(self):
+        return self._raw.closed
+
+    def close(self):
+        try:
+            self._raw.close()
+        finally:
+            self._record()
+
+    def __iter__(self):
+        return iter(lambda: self.read(2 ** 16), b'')
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def _metered(self, read, *args, **kwargs):
+        start = clock()
+        try:
+            data = read(*args, **kwargs)
+        finally:
+            self._network_seconds += clock() - start
+        self._bytes_read += len(data)
+        return data
+
+    def _record(self):
+        if self._recorded:
+            return
+        self._recorded = True
+        seconds = clock() - self._start
+        self._instrumentation.record_request(
+            self._operation_name, seconds, network_seconds=self._network_seconds,
+            decode_seconds=max(seconds - self._network_seconds, 0.0),
+            bytes_received=received_bytes(self._raw, self._bytes_read), retries=self._retries)
+
+
+def received_bytes(raw, default):
+    """Returns the number of bytes of a response body read from the network, before decompressing it."""
+    try:
+        return int(raw.tell())
+    except (AttributeError, IOError, ValueError):
+        return default
+
+
+def retry_count(raw):
+    """Returns the number of retries of the request of a `urllib3.response.HTTPResponse`."""
+    retries = getattr(raw, 'retries', None)
+    return len(retries.history) if retries is not None else 0
+
+
+def _empty_totals(fields):
+    totals = dict((field, 0) for field in fields)
+    totals['count'] = 0
+    totals['max_seconds'] = 0.0
+    return totals
+
+
+def _count(totals, seconds):
+    totals['count'] += 1
+    totals['max_seconds'] = max(totals['max_seconds'], seconds)
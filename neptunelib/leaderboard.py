@@ -0,0 +1,170 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from neptunelib.utils import as_list
+
+COLUMN_PREFIXES = ('channel_', 'parameter_', 'property_')
+
+
+class LeaderboardDataFrameBuilder(object):
+    """Builds the leaderboard DataFrame column by column.
+
+    Values of every column are collected in a single pass over leaderboard entries
+    and the DataFrame is created once, when all the entries are added.
+
+    Columns of numeric channels are converted to float64, any other column, including columns of text
+    and image channels, keeps the type inferred by pandas.
+    Cells of columns not defined by an entry are filled with NaN.
+
+    When `column_names` are given, cells of any other columns are skipped while entries are added,
+    and the selected columns are built even if no entry defines them.
+    """
+
+    def __init__(self, first_row_index=0, column_names=None):
+        self._first_row_index = first_row_index
+        self._row_count = 0
+        self._cells = {}
+        self._numeric_channel_columns = set()
+        self._other_channel_columns = set()
+
+        self._selected_column_names = None
+        self._selected_names = None
+        if column_names is not None:
+            self._selected_column_names = list(column_names)
+            self._selected_names = dict((prefix, []) for prefix in ('',) + COLUMN_PREFIXES)
+            for column_name in self._selected_column_names:
+                prefix = _column_prefix(column_name)
+                self._selected_names[prefix].append(column_name[len(prefix):])
+
+    def add(self, entry):
+        row = self._row_count
+
+        if self._selected_names is None:
+            self._add_cells('', entry.system_properties.items(), row)
+            self._add_channel_cells(entry.channels, row)
+            self._add_cells('parameter_', entry.parameters.items(), row)
+            self._add_cells('property_', entry.properties.items(), row)
+        else:
+            selected_names = self._selected_names
+            self._add_cells('', _selected_items(entry.system_properties, selected_names['']), row)
+            if selected_names['channel_']:
+                channels = entry.channels_dict_by_name
+                self._add_channel_cells([channels[name] for name in selected_names['channel_'] if name in channels],
+                                        row)
+            self._add_cells('parameter_', _selected_items(entry.parameters, selected_names['parameter_']), row)
+            self._add_cells('property_', _selected_items(entry.properties, selected_names['property_']), row)
+
+        self._row_count += 1
+
+    def add_all(self, entries):
+        for entry in entries:
+            self.add(entry)
+        return self
+
+    @property
+    def column_names(self):
+        if self._selected_column_names is not None:
+            return list(self._selected_column_names)
+        return list(self._cells.keys())
+
+    def build(self, column_names=None):
+        if column_names is None:
+            column_names = self.column_names
+
+        data = dict((name, self._column_values(name)) for name in column_names)
+        index = pd.RangeIndex(self._first_row_index, self._first_row_index + self._row_count)
+        return pd.DataFrame(data, index=index, columns=column_names)
+
+    def _add_channel_cells(self, channels, row):
+        channel_cells = []
+        for channel in channels:
+            if channel.type == 'numeric':
+                self._numeric_channel_columns.add('channel_' + channel.name)
+            else:
+                self._other_channel_columns.add('channel_' + channel.name)
+            channel_cells.append((channel.name, channel.trimmed_y))
+        self._add_cells('channel_', channel_cells, row)
+
+    def _add_cells(self, prefix, cells, row):
+        columns = self._cells
+        for name, value in cells:
+            column_name = prefix + name
+            column = columns.get(column_name)
+            if column is None:
+                column = columns[column_name] = ([], [])
+            column[0].append(row)
+            column[1].append(value)
+
+    def _column_values(self, column_name):
+        if column_name not in self._cells:
+            return np.full(self._row_count, np.nan, dtype=np.float64)
+        rows, values = self._cells[column_name]
+
+        if column_name in self._numeric_channel_columns and column_name not in self._other_channel_columns:
+            column = np.full(self._row_count, np.nan, dtype=np.float64)
+            column[rows] = _to_float_array(values)
+            return column
+
+        if len(rows) == self._row_count:
+            return values
+        return pd.Series(values, index=rows).reindex(pd.RangeIndex(self._row_count)).values
+
+
+def leaderboard_column_names(columns=None, parameters=None, channels=None, properties=None):
+    """Returns names of the leaderboard columns picked by any of the selectors, or None when none is given.
+
+    The id column is always picked.
+
+    Args:
+        columns(list): Names of columns, e.g. ['name', 'owner', 'channel_loss', 'parameter_lr'].
+        parameters(list): Names of parameters, e.g. ['lr'] picks the 'parameter_lr' column.
+        channels(list): Names of channels, e.g. ['loss'] picks the 'channel_loss' column.
+        properties(list): Names of user-defined properties, e.g. ['data_version'] picks 'property_data_version'.
+
+    Returns:
+        list: Unique names of the picked columns.
+    """
+    if columns is None and parameters is None and channels is None and properties is None:
+        return None
+
+    column_names = ['id'] + (as_list(columns) or [])
+    for prefix, names in [('parameter_', parameters), ('channel_', channels), ('property_', properties)]:
+        column_names += [prefix + name for name in as_list(names) or []]
+    return list(OrderedDict.fromkeys(column_names))
+
+
+def _column_prefix(column_name):
+    for prefix in COLUMN_PREFIXES:
+        if column_name.startswith(prefix):
+            return prefix
+    return ''
+
+
+def _selected_items(dictionary, names):
+    return [(name, dictionary[name]) for name in names if name in dictionary]
+
+
+def _to_float_array(values):
+    try:
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        # Fast, though not exactly round-tripping, parser that turns malformed values into NaNs.
+        return pd.to_numeric(values, errors='coerce').astype(np.float64)
@@ -0,0 +1,125 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import sqlite3
+
+from neptunelib.model import DATE_TIME_FIELDS, LeaderboardEntry, leaderboard_entry_dto_of_json
+
+# Fields of leaderboard entry DTOs kept in the store, which are all the fields read by `LeaderboardEntry`.
+ENTRY_FIELDS = ('id', 'shortId', 'entryType', 'state', 'name', 'description', 'owner', 'tags',
+                'timeOfCreation', 'timeOfCompletion', 'runningTime', 'size', 'sourceSize',
+                'environment', 'workerType', 'commitId')
+PARAMETER_FIELDS = ('id', 'name', 'parameterType', 'value')
+PROPERTY_FIELDS = ('key', 'value')
+CHANNEL_FIELDS = ('channelId', 'channelName', 'channelType', 'x', 'y')
+
+
+class LeaderboardStore(object):
+    """Local snapshot of leaderboard entries of projects, stored in an SQLite database.
+
+    Entries are stored as JSON, with all the data needed by `LeaderboardEntry`, keyed by project and short id.
+    A single database file may hold snapshots of many projects.
+
+    Changes are committed when the store is closed, which is done on leaving its context.
+
+    Args:
+        path(str): Path of the database file. It is created when missing.
+        project(str): Full id of the project, e.g. 'neptune-ml/Salt-Detection'.
+    """
+
+    def __init__(self, path, project):
+        self.path = path
+        self.project = project
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS leaderboard_entries ('
+            ' project TEXT NOT NULL,'
+            ' id TEXT NOT NULL,'
+            ' finished INTEGER NOT NULL,'
+            ' created TEXT,'
+            ' entry TEXT NOT NULL,'
+            ' PRIMARY KEY (project, id))')
+
+    def ids(self):
+        """Returns short ids of all the stored entries."""
+        return set(row[0] for row in self._connection.execute(
+            'SELECT id FROM leaderboard_entries WHERE project = ?', (self.project,)))
+
+    def unfinished_ids(self):
+        """Returns short ids of the stored entries which were not finished when they were stored."""
+        return [row[0] for row in self._connection.execute(
+            'SELECT id FROM leaderboard_entries WHERE project = ? AND NOT finished ORDER BY created, id',
+            (self.project,))]
+
+    def load(self):
+        """Returns all the stored entries, as `LeaderboardEntry` objects in the order of their creation."""
+        rows = self._connection.execute(
+            'SELECT entry FROM leaderboard_entries WHERE project = ? ORDER BY created, id', (self.project,))
+        return [LeaderboardEntry(leaderboard_entry_dto_of_json(json.loads(row[0]))) for row in rows]
+
+    def save(self, leaderboard_entries):
+        """Stores the entries, replacing the stored ones with the same short ids."""
+        self._connection.executemany(
+            'INSERT OR REPLACE INTO leaderboard_entries (project, id, finished, created, entry)'
+            ' VALUES (?, ?, ?, ?, ?)',
+            [
+                (self.project, entry.id, entry.finished, _sortable(entry.system_properties['created']),
+                 _dumps(entry.project_leaderboard_entry_dto))
+                for entry in leaderboard_entries
+            ])
+
+    def remove(self, ids):
+        """Removes the entries with the given short ids."""
+        self._connection.executemany(
+            'DELETE FROM leaderboard_entries WHERE project = ? AND id = ?', [(self.project, id_) for id_ in ids])
+
+    def close(self):
+        self._connection.commit()
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self._connection.rollback()
+        self.close()
+
+
+def _dumps(entry_dto):
+    return json.dumps(_entry_dto_as_dict(entry_dto))
+
+
+def _entry_dto_as_dict(entry_dto):
+    entry_dict = _fields_as_dict(entry_dto, ENTRY_FIELDS)
+    for field in DATE_TIME_FIELDS:
+        entry_dict[field] = _sortable(entry_dict[field])
+    entry_dict['tags'] = list(entry_dict['tags'] or [])
+    entry_dict['parameters'] = [_fields_as_dict(p, PARAMETER_FIELDS) for p in entry_dto.parameters]
+    entry_dict['properties'] = [_fields_as_dict(p, PROPERTY_FIELDS) for p in entry_dto.properties]
+    entry_dict['channelsLastValues'] = [_fields_as_dict(c, CHANNEL_FIELDS) for c in entry_dto.channelsLastValues]
+    return entry_dict
+
+
+def _fields_as_dict(dto, fields):
+    return dict((field, getattr(dto, field, None)) for field in fields)
+
+
+def _sortable(created):
+    if created is None:
+        return None
+    return created.isoformat() if hasattr(created, 'isoformat') else str(created)
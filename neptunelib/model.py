@@ -14,38 +14,56 @@
 # limitations under the License.
 #
 
-class ChannelWithLastValue(object):
-    def __init__(self, channel_with_value_dto):
-        self.channel_with_value_dto = channel_with_value_dto
+import json
+from datetime import datetime
 
-    @property
-    def id(self):
-        return self.channel_with_value_dto.channelId
+from dateutil.parser import parse as parse_date_time
+from dateutil.tz import tzutc
 
-    @property
-    def name(self):
-        return self.channel_with_value_dto.channelName
+try:
+    # orjson decodes JSON several times faster than the json module, and it is used when installed.
+    from orjson import loads as _orjson_loads
+except ImportError:
+    _orjson_loads = None
 
-    @property
-    def type(self):
-        return self.channel_with_value_dto.channelType
+FINISHED_STATES = ('succeeded', 'failed', 'aborted', 'crashed', 'preempted')
 
-    @property
-    def x(self):
-        return self.channel_with_value_dto.x
+# Fields of leaderboard entries in the date-time format, which swagger models turn into datetime objects.
+DATE_TIME_FIELDS = ('timeOfCreation', 'timeOfCompletion')
+
+
+class ChannelWithLastValue(object):
+    __slots__ = ('channel_with_value_dto', 'id', 'name', 'type', 'x', 'y')
+
+    def __init__(self, channel_with_value_dto):
+        self.channel_with_value_dto = channel_with_value_dto
+        self.id = channel_with_value_dto.channelId
+        self.name = channel_with_value_dto.channelName
+        self.type = channel_with_value_dto.channelType
+        self.x = channel_with_value_dto.x
+        self.y = channel_with_value_dto.y
 
     @property
     def trimmed_y(self):
         return self.y[:255] if self.type == 'text' else self.y
 
-    @property
-    def y(self):
-        return self.channel_with_value_dto.y
-
 
 class LeaderboardEntry(object):
+    """Views of a leaderboard entry DTO.
+
+    Views are computed on first access and reused afterwards, so they must not be modified.
+    """
+
+    __slots__ = ('project_leaderboard_entry_dto', '_system_properties', '_channels', '_channels_dict_by_name',
+                 '_parameters', '_properties')
+
     def __init__(self, project_leaderboard_entry_dto):
         self.project_leaderboard_entry_dto = project_leaderboard_entry_dto
+        self._system_properties = None
+        self._channels = None
+        self._channels_dict_by_name = None
+        self._parameters = None
+        self._properties = None
 
     @property
     def id(self):
@@ -55,46 +73,66 @@ class LeaderboardEntry(object):
     def internal_id(self):
         return self.project_leaderboard_entry_dto.id
 
+    @property
+    def state(self):
+        return self.project_leaderboard_entry_dto.state
+
+    @property
+    def finished(self):
+        return self.state in FINISHED_STATES
+
     @property
     def system_properties(self):
-        entry = self.project_leaderboard_entry_dto
-        return {
-            'id': entry.shortId,
-            'name': entry.name,
-            'created': entry.timeOfCreation,
-            'finished': entry.timeOfCompletion,
-            'running_time': entry.runningTime,
-            'worker_type': entry.workerType,
-            'environment': entry.environment,
-            'source_code_size': entry.sourceSize,
-            'owner': entry.owner,
-            'size': entry.size,
-            'tags': entry.tags,
-            'notes': entry.description,
-            'git_hash': entry.commitId
-        }
+        if self._system_properties is None:
+            entry = self.project_leaderboard_entry_dto
+            self._system_properties = {
+                'id': entry.shortId,
+                'name': entry.name,
+                'created': entry.timeOfCreation,
+                'finished': entry.timeOfCompletion,
+                'running_time': entry.runningTime,
+                'worker_type': entry.workerType,
+                'environment': entry.environment,
+                'source_code_size': entry.sourceSize,
+                'owner': entry.owner,
+                'size': entry.size,
+                'tags': entry.tags,
+                'notes': entry.description,
+                'git_hash': entry.commitId
+            }
+        return self._system_properties
 
     @property
     def channels(self):
-        return [ChannelWithLastValue(ch) for ch in self.project_leaderboard_entry_dto.channelsLastValues]
+        if self._channels is None:
+            self._channels = [
+                ChannelWithLastValue(ch) for ch in self.project_leaderboard_entry_dto.channelsLastValues
+            ]
+        return self._channels
 
     @property
     def channels_dict_by_name(self):
-        return dict(
-            (ch.name, ch) for ch in self.channels
-        )
+        if self._channels_dict_by_name is None:
+            self._channels_dict_by_name = dict(
+                (ch.name, ch) for ch in self.channels
+            )
+        return self._channels_dict_by_name
 
     @property
     def parameters(self):
-        return dict(
-            (p.name, p.value) for p in self.project_leaderboard_entry_dto.parameters
-        )
+        if self._parameters is None:
+            self._parameters = dict(
+                (p.name, p.value) for p in self.project_leaderboard_entry_dto.parameters
+            )
+        return self._parameters
 
     @property
     def properties(self):
-        return dict(
-            (p.key, p.value) for p in self.project_leaderboard_entry_dto.properties
-        )
+        if self._properties is None:
+            self._properties = dict(
+                (p.key, p.value) for p in self.project_leaderboard_entry_dto.properties
+            )
+        return self._properties
 
 
 class Point(object):
@@ -121,3 +159,77 @@ class Points(object):
     @property
     def numeric_ys(self):
         return [p.y.numericValue for p in self.point_dtos]
+
+
+class DictDto(object):
+    """A DTO backed by a dict of its fields, used in place of a swagger model object.
+
+    The dict is adopted as the `__dict__` of the DTO, which is much faster than setting its attributes one by one.
+    Fields missing in the dict are None, as in swagger models.
+    """
+
+    def __getattr__(self, name):
+        # Called only for attributes missing in the dict.
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return None
+
+    @classmethod
+    def of(cls, fields):
+        dto = cls.__new__(cls)
+        dto.__dict__ = fields
+        return dto
+
+
+def leaderboard_entry_dto_of(entry_dict):
+    """Returns a leaderboard entry DTO backed by `entry_dict`, with parameters, properties and channels
+    backed by their dicts as well. The dict is modified in place.
+    """
+    entry_dict['parameters'] = [DictDto.of(p) for p in entry_dict.get('parameters') or []]
+    entry_dict['properties'] = [DictDto.of(p) for p in entry_dict.get('properties') or []]
+    entry_dict['channelsLastValues'] = [DictDto.of(c) for c in entry_dict.get('channelsLastValues') or []]
+    return DictDto.of(entry_dict)
+
+
+def leaderboard_entry_dto_of_json(entry_dict):
+    """Returns a leaderboard entry DTO backed by `entry_dict` decoded from JSON, whose date-time fields
+    are parsed into datetime objects. The dict is modified in place.
+    """
+    for field in DATE_TIME_FIELDS:
+        value = entry_dict.get(field)
+        if value is not None:
+            entry_dict[field] = _parse_date_time(value)
+    return leaderboard_entry_dto_of(entry_dict)
+
+
+def leaderboard_page_from_json(body):
+    """Decodes a JSON page of the getLeaderboard operation into DTOs backed by dicts.
+
+    Values are the same as the ones of swagger models, including datetime objects of date-time fields,
+    but no model objects are built and no values are validated.
+    """
+    page = loads_json(body)
+    page['entries'] = [leaderboard_entry_dto_of_json(entry_dict) for entry_dict in page.get('entries') or []]
+    return DictDto.of(page)
+
+
+def loads_json(body):
+    """Decodes a JSON document given as UTF-8 encoded bytes, with orjson when it is installed."""
+    if _orjson_loads is not None:
+        return _orjson_loads(body)
+    # The json module accepts bytes only since Python 3.6.
+    return json.loads(body.decode('utf-8') if isinstance(body, bytes) else body)
+
+
+def _parse_date_time(value):
+    # datetime.fromisoformat is much faster than dateutil, but it is available only in Python 3.7+,
+    # and does not accept the 'Z' suffix before Python 3.11.
+    if _fromisoformat is not None and value.endswith('Z'):
+        try:
+            return _fromisoformat(value[:-1]).replace(tzinfo=tzutc())
+        except ValueError:
+            pass
+    return parse_date_time(value)
+
+
+_fromisoformat = getattr(datetime, 'fromisoformat', None)
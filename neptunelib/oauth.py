@@ -14,6 +14,7 @@
 # limitations under the License.
 #
 
+import threading
 import time
 
 import jwt
@@ -22,19 +23,97 @@ from oauthlib.oauth2 import TokenExpiredError
 from requests.auth import AuthBase
 from requests_oauthlib import OAuth2Session
 
+# Access tokens are refreshed a bit before they expire, so that they do not expire in flight.
+TOKEN_EXPIRATION_MARGIN = 30
+# Failed refreshes in the background are retried after a while, instead of by every request.
+TOKEN_REFRESH_RETRY_INTERVAL = 5
+
 
 class NeptuneAuth(AuthBase):
+    """Adds the OAuth access token of the session to requests.
+
+    When the access token is about to expire, according to its `exp` claim, it is refreshed in a background
+    thread, while requests keep being sent with the current one. Tokens living shorter than twice the margin
+    are refreshed in the middle of their lifetime. Requests block only when the token has
+    already expired, e.g. after a long idle period, or when the refresh in the background did not make it.
+    Tokens are refreshed once at a time: concurrent requests finding an expired token wait for a single refresh
+    and share its new token.
 
-    def __init__(self, session):
+    Args:
+        session(`requests_oauthlib.OAuth2Session`): Session holding the tokens.
+        expiration_margin(float): Number of seconds before the expiration of the access token
+            at which it is refreshed in the background.
+    """
+
+    def __init__(self, session, expiration_margin=TOKEN_EXPIRATION_MARGIN):
         self.session = session
+        self.expiration_margin = expiration_margin
+        self._refresh_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._refreshing_in_background = False
+        self._next_background_refresh = 0
+        self._decoded_access_token = None
+        self._expires_at = None
+        self._refresh_at = None
 
     def __call__(self, r):
+        access_token = self._access_token()
+        expires_at, refresh_at = self._access_token_expiration(access_token)
+        if expires_at is not None:
+            now = time.time()
+            if now >= expires_at:
+                self._refresh(access_token)
+            elif now >= refresh_at:
+                self._refresh_in_background(access_token, now)
+
         try:
             return self._add_token(r)
         except TokenExpiredError:
-            self.session.refresh_token(self.session.auto_refresh_url)
+            self._refresh(access_token)
             return self._add_token(r)
 
+    def _access_token(self):
+        return (self.session.token or {}).get(u'access_token')
+
+    def _access_token_expiration(self, access_token):
+        with self._state_lock:
+            if access_token != self._decoded_access_token:
+                self._decoded_access_token = access_token
+                self._expires_at = _expiration_of(access_token)
+                if self._expires_at is not None:
+                    self._refresh_at = refresh_time(self._expires_at, self.expiration_margin)
+            return self._expires_at, self._refresh_at
+
+    def _refresh(self, stale_access_token):
+        # Requests waiting for the lock find the token refreshed by the one holding it, and use it.
+        with self._refresh_lock:
+            if self._access_token() == stale_access_token:
+                self.session.refresh_token(self.session.auto_refresh_url)
+
+    def _refresh_in_background(self, stale_access_token, now):
+        with self._state_lock:
+            if self._refreshing_in_background or now < self._next_background_refresh:
+                return
+            self._refreshing_in_background = True
+
+        thread = threading.Thread(target=self._refresh_quietly, args=(stale_access_token,))
+        thread.daemon = True
+        thread.start()
+
+    def _refresh_quietly(self, stale_access_token):
+        refreshed = False
+        try:
+            self._refresh(stale_access_token)
+            refreshed = True
+        except Exception:  # pylint: disable=broad-except
+            # The token is still valid; it is refreshed again by a later request, or before it is used expired.
+            pass
+        finally:
+            with self._state_lock:
+                self._refreshing_in_background = False
+                if not refreshed:
+                    self._next_background_refresh = time.time() + TOKEN_REFRESH_RETRY_INTERVAL
+
     def _add_token(self, r):
         # pylint: disable=protected-access
         r.url, r.headers, r.body = self.session._client.add_token(r.url,
@@ -73,6 +152,22 @@ class NeptuneAuthenticator(Authenticator):
         return request
 
 
+def refresh_time(expires_at, expiration_margin=TOKEN_EXPIRATION_MARGIN):
+    """Returns the time an access token expiring at `expires_at` should be refreshed at.
+
+    Tokens are refreshed `expiration_margin` seconds before they expire, or halfway through their remaining
+    lifetime when it is shorter than twice the margin, so that short-lived tokens are not refreshed continuously.
+    """
+    return expires_at - min(expiration_margin, (expires_at - time.time()) / 2)
+
+
+def _expiration_of(access_token):
+    try:
+        return jwt.decode(access_token, verify=False).get(u'exp')
+    except jwt.InvalidTokenError:
+        return None
+
+
 def _no_token_updater():
     # For unit tests.
     return None
@@ -14,10 +14,18 @@
 # limitations under the License.
 #
 
+from collections import OrderedDict
+
 import pandas as pd
 
+from neptunelib.client import DEFAULT_LEADERBOARD_PAGE_SIZE, DEFAULT_MAX_WORKERS
+from neptunelib.downsampling import DEFAULT_DOWNSAMPLING_METHOD, get_downsampling_method
+from neptunelib.exceptions import ChannelValuesFetchError, HardwareUtilizationFetchError
 from neptunelib.experiment import Experiment
-from neptunelib.utils import as_list, map_keys
+from neptunelib.leaderboard import LeaderboardDataFrameBuilder, leaderboard_column_names
+from neptunelib.leaderboard_store import LeaderboardStore
+from neptunelib.query import merge_server_filters
+from neptunelib.utils import as_list, map_concurrently
 
 
 class Project(object):
@@ -81,7 +89,9 @@ class Project(object):
         project_members = self.client.get_project_members(self.internal_id)
         return [member.registeredMemberInfo.username for member in project_members if member.registeredMemberInfo]
 
-    def get_experiments(self, id=None, group=None, state=None, owner=None, tag=None, min_running_time=None):
+    def get_experiments(self, id=None, group=None, state=None, owner=None, tag=None, min_running_time=None,
+                        page_size=DEFAULT_LEADERBOARD_PAGE_SIZE, max_workers=DEFAULT_MAX_WORKERS, query=None,
+                        sort_by='id', ascending=True, limit=None):
         """Retrieve a list of experiments matching the specified criteria.
 
         All of the parameters of this method are optional, each of them specifies a single criterion.
@@ -102,6 +112,16 @@ class Project(object):
             owner(list): The owner or list of owners of the experiments. This parameter expects usernames.
             tag(list): A tag or a list of experiment tags. E.g. 'solution-1' or ['solution-1', 'solution-2'].
             min_running_time(int): Minimum running time of an experiment in seconds.
+            page_size(int): Number of experiments fetched in a single request.
+            max_workers(int): Maximum number of pages fetched concurrently.
+            query(`neptunelib.query.Query`): An expression on any leaderboard columns the experiments have to match,
+                e.g. `parameter('lr') < 0.01`. Every page of experiments is filtered as soon as it arrives.
+            sort_by(str): Name of the leaderboard column to sort the experiments by, e.g. 'running_time',
+                'channel_loss' or 'parameter_lr'. Native fields, channels, parameters and user-defined properties
+                are supported. Experiments are sorted by the server.
+            ascending(bool): Whether to sort in the ascending order.
+            limit(int): Maximum number of experiments to fetch. Only the first `limit` experiments are fetched,
+                so e.g. the best few experiments by a metric are found without listing the whole project.
 
         Returns:
             list: List of `Experiment` objects
@@ -125,13 +145,26 @@ class Project(object):
              Experiment(SAL-1960),
              Experiment(SAL-2025)]
 
+            Filter on parameters and channels as well:
+
+            >>> from neptunelib.query import channel, parameter
+            >>> project.get_experiments(state='succeeded', query=(parameter('lr') < 0.01) & (channel('auc') > 0.9))
+
+            Get the 20 experiments with the highest validation AUC:
+
+            >>> project.get_experiments(sort_by='channel_val_auc', ascending=False, limit=20)
+
         """
-        leaderboard_entries = self._fetch_leaderboard(id, group, state, owner, tag, min_running_time)
+        leaderboard_entries = self._fetch_leaderboard(id, group, state, owner, tag, min_running_time,
+                                                      page_size, max_workers, query, sort_by, ascending, limit)
         return [
             Experiment(self.client, entry) for entry in leaderboard_entries
         ]
 
-    def get_leaderboard(self, id=None, group=None, state=None, owner=None, tag=None, min_running_time=None):
+    def get_leaderboard(self, id=None, group=None, state=None, owner=None, tag=None, min_running_time=None,
+                        page_size=DEFAULT_LEADERBOARD_PAGE_SIZE, max_workers=DEFAULT_MAX_WORKERS,
+                        columns=None, parameters=None, channels=None, properties=None, query=None,
+                        sort_by='id', ascending=True, limit=None):
         """Fetches Neptune experiment view to pandas DataFrame
 
         Retrieve experiments matching the specified criteria and present them in a form of a DataFrame
@@ -147,6 +180,11 @@ class Project(object):
         For each channel at most one (the last one) value is returned per experiment.
         Text values are trimmed to 255 characters.
 
+        Columns can be picked with the `columns`, `parameters`, `channels` and `properties` selectors.
+        When any of them is given, the DataFrame contains the `id` column and the picked columns only,
+        including the ones not defined by any of the experiments, which are filled with NaN.
+        Cells of other columns are never collected, which saves time and memory for wide projects.
+
         All of the parameters of this method are optional, each of them specifies a single criterion.
 
         Only experiments matching all of the criteria will be returned.
@@ -165,6 +203,20 @@ class Project(object):
             owner(list): The owner or list of owners of the experiments. This parameter expects usernames.
             tag(list): A tag or a list of experiment tags. E.g. 'solution-1' or ['solution-1', 'solution-2'].
             min_running_time(int): Minimum running time of an experiment in seconds.
+            page_size(int): Number of experiments fetched in a single request.
+            max_workers(int): Maximum number of pages fetched concurrently.
+            columns(list): Names of columns to pick, e.g. ['name', 'owner', 'channel_loss'].
+            parameters(list): Names of parameters to pick, e.g. ['lr'] picks the 'parameter_lr' column.
+            channels(list): Names of channels to pick, e.g. ['loss'] picks the 'channel_loss' column.
+            properties(list): Names of user-defined properties to pick.
+            query(`neptunelib.query.Query`): An expression on any leaderboard columns the experiments have to match,
+                e.g. `parameter('lr') < 0.01`. Every page of experiments is filtered as soon as it arrives.
+            sort_by(str): Name of the leaderboard column to sort the rows by, e.g. 'running_time',
+                'channel_loss' or 'parameter_lr'. Native fields, channels, parameters and user-defined properties
+                are supported. Experiments are sorted by the server.
+            ascending(bool): Whether to sort in the ascending order.
+            limit(int): Maximum number of experiments to fetch. Only the first `limit` experiments are fetched,
+                so e.g. the best few experiments by a metric are found without listing the whole project.
 
         Returns:
             `pandas.DataFrame`: Neptune experiment view in the form of a dataframe.
@@ -184,32 +236,309 @@ class Project(object):
 
             >>> project.get_leaderboard(state=['aborted'], owner=['neyo'], min_running_time=100000)
 
+            Pick just a few columns:
+
+            >>> project.get_leaderboard(columns=['name', 'owner'], parameters=['lr'], channels=['epoch_val loss'])
+
+            Keep only the experiments matching a query:
+
+            >>> from neptunelib.query import Column, parameter
+            >>> project.get_leaderboard(query=(parameter('lr') < 0.01) & Column('tags').contains('unet'))
+
+            Get the 20 fastest experiments:
+
+            >>> project.get_leaderboard(sort_by='running_time', limit=20)
+
         Todo:
             tags - is it ok now?
         """
 
-        leaderboard_entries = self._fetch_leaderboard(id, group, state, owner, tag, min_running_time)
+        leaderboard_entries = self._fetch_leaderboard(id, group, state, owner, tag, min_running_time,
+                                                      page_size, max_workers, query, sort_by, ascending, limit)
+        column_names = leaderboard_column_names(columns, parameters, channels, properties)
+        with self.client.instrumentation.timed('leaderboard_dataframe'):
+            return self._leaderboard_entries_to_dataframe(leaderboard_entries, column_names=column_names)
+
+    def iter_experiments(self, id=None, group=None, state=None, owner=None, tag=None, min_running_time=None,
+                         page_size=DEFAULT_LEADERBOARD_PAGE_SIZE, query=None, sort_by='id', ascending=True):
+        """Iterate over experiments matching the specified criteria, one page at a time.
+
+        Works like `get_experiments`, but experiments are yielded as soon as their page arrives,
+        while the next page is being fetched in the background.
+        Only a single page of experiments is held in memory at a time.
+
+        Args:
+            id(list): An ID or list of experiment IDs (e.g. 'SAN-1' or ['SAN-1', 'SAN-2'])
+            group(list): A group or list of groups the returned experiments have to be in.
+                E.g. 'SAN-GRP-1', ['SAN-GRP-1', 'SAN-GRP-2']
+            state(list): A state or list of experiment states.
+                E.g. 'succeeded' or ['succeeded', 'preempted'].
+            owner(list): The owner or list of owners of the experiments. This parameter expects usernames.
+            tag(list): A tag or a list of experiment tags. E.g. 'solution-1' or ['solution-1', 'solution-2'].
+            min_running_time(int): Minimum running time of an experiment in seconds.
+            page_size(int): Number of experiments fetched in a single request.
+            query(`neptunelib.query.Query`): An expression the experiments have to match, as in `get_experiments`.
+            sort_by(str): Name of the leaderboard column to sort the experiments by, as in `get_experiments`.
+            ascending(bool): Whether to sort in the ascending order.
 
-        def make_row(entry):
-            channels = dict(
-                ('channel_{}'.format(ch.name), ch.trimmed_y) for ch in entry.channels
-            )
+        Yields:
+            `Experiment`: Experiments in the order of the `sort_by` column.
 
-            parameters = map_keys('parameter_{}'.format, entry.parameters)
-            properties = map_keys('property_{}'.format, entry.properties)
+        Examples:
+            >>> project = session.get_projects('neptune-ml')['neptune-ml/Salt-Detection']
+            >>> for experiment in project.iter_experiments(state=['succeeded']):
+            ...     print(experiment.id)
 
-            r = {}
-            r.update(entry.system_properties)
-            r.update(channels)
-            r.update(parameters)
-            r.update(properties)
-            return r
+        """
+        for leaderboard_entries in self._iter_leaderboard(id, group, state, owner, tag, min_running_time,
+                                                          page_size, query, sort_by, ascending):
+            for entry in leaderboard_entries:
+                yield Experiment(self.client, entry)
 
-        rows = ((n, make_row(e)) for (n, e) in enumerate(leaderboard_entries))
+    def iter_leaderboard_chunks(self, id=None, group=None, state=None, owner=None, tag=None, min_running_time=None,
+                                page_size=DEFAULT_LEADERBOARD_PAGE_SIZE,
+                                columns=None, parameters=None, channels=None, properties=None, query=None,
+                                sort_by='id', ascending=True):
+        """Iterate over the Neptune experiment view in DataFrame chunks, one page at a time.
 
-        df = pd.DataFrame.from_dict(data=dict(rows), orient='index')
-        df = df.reindex(self._sort_leaderboard_columns(df.columns), axis='columns')
-        return df
+        Works like `get_leaderboard`, but every page of experiments is turned into a DataFrame
+        as soon as it arrives, while the next page is being fetched in the background.
+
+        Each chunk contains only the columns defined by the experiments in it, unless columns are picked
+        with the selectors, as in `get_leaderboard`. Then all the chunks have the same columns.
+        Row labels continue across chunks, so `pandas.concat` of all chunks yields the rows of `get_leaderboard`.
+
+        Args:
+            id(list): An ID or list of experiment IDs (e.g. 'SAN-1' or ['SAN-1', 'SAN-2'])
+            group(list): A group or list of groups the returned experiments have to be in.
+                E.g. 'SAN-GRP-1', ['SAN-GRP-1', 'SAN-GRP-2']
+            state(list): A state or list of experiment states.
+                E.g. 'succeeded' or ['succeeded', 'preempted'].
+            owner(list): The owner or list of owners of the experiments. This parameter expects usernames.
+            tag(list): A tag or a list of experiment tags. E.g. 'solution-1' or ['solution-1', 'solution-2'].
+            min_running_time(int): Minimum running time of an experiment in seconds.
+            page_size(int): Number of experiments fetched in a single request.
+            columns(list): Names of columns to pick, as in `get_leaderboard`.
+            parameters(list): Names of parameters to pick, as in `get_leaderboard`.
+            channels(list): Names of channels to pick, as in `get_leaderboard`.
+            properties(list): Names of user-defined properties to pick, as in `get_leaderboard`.
+            query(`neptunelib.query.Query`): An expression the experiments have to match, as in `get_leaderboard`.
+            sort_by(str): Name of the leaderboard column to sort the rows by, as in `get_leaderboard`.
+            ascending(bool): Whether to sort in the ascending order.
+
+        Yields:
+            `pandas.DataFrame`: A part of the Neptune experiment view.
+
+        Examples:
+            >>> project = session.get_projects('neptune-ml')['neptune-ml/Salt-Detection']
+            >>> for chunk in project.iter_leaderboard_chunks(state=['succeeded'], page_size=500):
+            ...     chunk.to_csv('leaderboard.csv', mode='a')
+
+        """
+        column_names = leaderboard_column_names(columns, parameters, channels, properties)
+        first_row_index = 0
+        for leaderboard_entries in self._iter_leaderboard(id, group, state, owner, tag, min_running_time,
+                                                          page_size, query, sort_by, ascending):
+            with self.client.instrumentation.timed('leaderboard_dataframe'):
+                chunk = self._leaderboard_entries_to_dataframe(leaderboard_entries, first_row_index, column_names)
+            yield chunk
+            first_row_index += len(leaderboard_entries)
+
+    def sync_leaderboard(self, store_path, page_size=DEFAULT_LEADERBOARD_PAGE_SIZE, max_workers=DEFAULT_MAX_WORKERS,
+                         columns=None, parameters=None, channels=None, properties=None):
+        """Synchronizes a local snapshot of the leaderboard with Neptune and returns it as a DataFrame.
+
+        The snapshot is kept in an SQLite database at `store_path`. The first call downloads all the experiments
+        of the project. Every next call downloads only:
+            - experiments which were not finished at the time of the previous call, e.g. 'running' or 'waiting',
+              looked up by their ids,
+            - experiments created since then, found by listing the newest experiments first
+              until an already stored experiment is reached.
+        Finished experiments are not downloaded again, so repeated calls transfer only a small delta.
+        Unfinished experiments which are no longer listed while being refreshed are removed from the snapshot.
+        Finished experiments deleted in Neptune are kept in the snapshot, since finding them would take
+        listing the whole project. Remove the database file to download a fresh snapshot.
+
+        Args:
+            store_path(str): Path of the SQLite database file keeping the snapshot. It is created when missing.
+            page_size(int): Number of experiments fetched in a single request.
+            max_workers(int): Maximum number of pages fetched concurrently.
+            columns(list): Names of columns to pick, as in `get_leaderboard`.
+            parameters(list): Names of parameters to pick, as in `get_leaderboard`.
+            channels(list): Names of channels to pick, as in `get_leaderboard`.
+            properties(list): Names of user-defined properties to pick, as in `get_leaderboard`.
+
+        Returns:
+            `pandas.DataFrame`: Neptune experiment view of all the experiments in the snapshot,
+                in the order of their creation.
+
+        Examples:
+            >>> project = session.get_projects('neptune-ml')['neptune-ml/Salt-Detection']
+            >>> while True:
+            ...     leaderboard = project.sync_leaderboard('salt-detection.sqlite')
+            ...     check_alerts(leaderboard)
+            ...     time.sleep(300)
+
+        """
+        with LeaderboardStore(store_path, self.full_id) as store:
+            self._sync_leaderboard_store(store, page_size, max_workers)
+            leaderboard_entries = store.load()
+
+        column_names = leaderboard_column_names(columns, parameters, channels, properties)
+        with self.client.instrumentation.timed('leaderboard_dataframe'):
+            return self._leaderboard_entries_to_dataframe(leaderboard_entries, column_names=column_names)
+
+    def get_numeric_channels_values(self, experiments_or_filters, *channel_names, **kwargs):
+        """Retrieve values of specified numeric channels of many experiments at once.
+
+        Values of all the (experiment, channel) pairs are downloaded concurrently.
+        Experiments that do not define some of the channels are skipped for these channels.
+
+        By default the returned DataFrame is in the long format, with one row per channel value:
+            experiment_id, channel, x, y
+
+        With `wide=True` the returned DataFrame is indexed by x and contains a column for every
+        (experiment_id, channel) pair. The DataFrame may contain NaNs if channels have different x values.
+
+        Args:
+            experiments_or_filters: An `Experiment`, a list of experiments or a dict of criteria
+                accepted by `get_experiments`, e.g. {'group': 'SAN-GRP-1', 'state': 'succeeded'}.
+            *channel_names: variable length list of names of the channels to retrieve values for.
+            max_workers(int): Keyword-only. Maximum number of channels downloaded concurrently.
+            wide(bool): Keyword-only. Whether to return the DataFrame in the wide format.
+            max_points(int): Keyword-only. Maximum number of values of every channel to keep,
+                as in `Experiment.get_numeric_channels_values`.
+            downsampling(str): Keyword-only. Name of the downsampling method used with `max_points`:
+                'lttb' (default), 'minmax' or 'stride'.
+
+        Returns:
+            `pandas.DataFrame`: Dataframe containing the values of the requested channels of all the experiments.
+
+        Raises:
+            `neptunelib.exceptions.ChannelValuesFetchError`: When values of any of the channels could not be fetched.
+                Its `errors` attribute maps (experiment id, channel name) pairs to the errors that occurred.
+
+        Examples:
+            Instantiate a session.
+
+            >>> from neptunelib.session import Session
+            >>> session = Session()
+
+            Fetch a project.
+
+            >>> project = session.get_projects('neptune-ml')['neptune-ml/Salt-Detection']
+
+            Get the loss curve of every experiment in a group.
+
+            >>> losses = project.get_numeric_channels_values({'group': 'SAL-GRP-1'}, 'unet_0 epoch_val sum loss')
+            >>> losses.groupby('experiment_id')['y'].min()
+
+        """
+        # pylint: disable=protected-access
+        max_workers = kwargs.pop('max_workers', DEFAULT_MAX_WORKERS)
+        wide = kwargs.pop('wide', False)
+        max_points = kwargs.pop('max_points', None)
+        downsampling = kwargs.pop('downsampling', DEFAULT_DOWNSAMPLING_METHOD)
+        if kwargs:
+            raise TypeError('Unexpected keyword arguments: {}'.format(', '.join(kwargs)))
+        get_downsampling_method(downsampling, max_points)
+
+        downloads = [
+            (experiment, channel_name)
+            for experiment in self._as_experiments(experiments_or_filters)
+            for channel_name in OrderedDict.fromkeys(channel_names)
+            if channel_name in experiment.channels
+        ]
+
+        def fetch_channel_values(download):
+            experiment, channel_name = download
+            try:
+                values = experiment._fetch_channel_values(channel_name, experiment._get_channel_id(channel_name),
+                                                          max_points, downsampling)
+                values.columns = ['x', 'y']
+                return values, None
+            except Exception as e:
+                return None, e
+
+        results = map_concurrently(fetch_channel_values, downloads, max_workers=max_workers)
+
+        errors = dict(
+            ((experiment.id, channel_name), error)
+            for (experiment, channel_name), (_, error) in zip(downloads, results) if error is not None
+        )
+        if errors:
+            raise ChannelValuesFetchError(errors)
+
+        keys = [(experiment.id, channel_name) for experiment, channel_name in downloads]
+        values = [values for values, _ in results]
+        with self.client.instrumentation.timed('channels_dataframe'):
+            if wide:
+                return self._channels_values_to_wide_dataframe(keys, values)
+            return self._channels_values_to_long_dataframe(keys, values)
+
+    def get_hardware_utilization(self, experiments_or_filters, **kwargs):
+        """Retrieve RAM, CPU and GPU utilization of many experiments at once, e.g. for capacity planning.
+
+        Metrics of all the experiments are downloaded concurrently, in the compact format
+        of `Experiment.get_hardware_utilization`. The returned DataFrame is indexed by experiment_id and x,
+        the time (in milliseconds) from the experiment start, and contains a float32 column for each metric
+        of any of the experiments, e.g. ram, cpu, gpu_util_0. Metrics missing in an experiment are NaNs.
+
+        Args:
+            experiments_or_filters: An `Experiment`, a list of experiments or a dict of criteria
+                accepted by `get_experiments`, e.g. {'group': 'SAN-GRP-1', 'state': 'succeeded'}.
+            max_workers(int): Keyword-only. Maximum number of experiments downloaded concurrently.
+            interval(float): Keyword-only. Length of resampling intervals in seconds.
+                Metrics are not resampled by default.
+            aggregation(str or list): Keyword-only. Aggregation of values within a resampling interval:
+                'mean' (default), 'max', 'min', 'median', 'first' or 'last', or a list of them.
+
+        Returns:
+            `pandas.DataFrame`: Dataframe containing the hardware utilization metrics of all the experiments.
+
+        Raises:
+            `neptunelib.exceptions.HardwareUtilizationFetchError`: When metrics of any of the experiments
+                could not be fetched. Its `errors` attribute maps experiment ids to the errors that occurred.
+
+        Examples:
+            Instantiate a session.
+
+            >>> from neptunelib.session import Session
+            >>> session = Session()
+
+            Fetch a project.
+
+            >>> project = session.get_projects('neptune-ml')['neptune-ml/Salt-Detection']
+
+            Get the peak RAM usage of succeeded experiments, in 10 second intervals.
+
+            >>> utilization = project.get_hardware_utilization({'state': 'succeeded'}, interval=10, aggregation='max')
+            >>> utilization['ram'].groupby('experiment_id').max()
+
+        """
+        # pylint: disable=protected-access
+        max_workers = kwargs.pop('max_workers', DEFAULT_MAX_WORKERS)
+        kwargs['compact'] = True
+        _, interval, aggregation = Experiment._pop_hardware_utilization_options(kwargs)
+
+        experiments = self._as_experiments(experiments_or_filters)
+
+        def fetch_hardware_utilization(experiment):
+            try:
+                return experiment._fetch_hardware_utilization(interval, aggregation), None
+            except Exception as e:
+                return None, e
+
+        results = map_concurrently(fetch_hardware_utilization, experiments, max_workers=max_workers)
+
+        errors = dict((experiment.id, error) for experiment, (_, error) in zip(experiments, results)
+                      if error is not None)
+        if errors:
+            raise HardwareUtilizationFetchError(errors)
+
+        with self.client.instrumentation.timed('hardware_utilization_dataframe'):
+            return self._hardware_utilization_to_dataframe([experiment.id for experiment in experiments],
+                                                           [utilization for utilization, _ in results])
 
     def get_experiment_groups(self):
         """Retrieve a list of groups in the project.
@@ -272,12 +601,130 @@ class Project(object):
     def __ne__(self, o):
         return not self.__eq__(o)
 
-    def _fetch_leaderboard(self, id, group, state, owner, tag, min_running_time):
+    def _fetch_leaderboard(self, id, group, state, owner, tag, min_running_time, page_size, max_workers,
+                           query=None, sort_by='id', ascending=True, limit=None):
+        filters = self._leaderboard_filters(id, group, state, owner, tag, min_running_time, query)
+        if filters is None:
+            return []
+        if query is not None:
+            filters['select'] = query.select
+
         return self.client.get_leaderboard_entries(
             namespace=self.namespace, project_name=self.name,
-            ids=as_list(id), group_ids=as_list(group), states=as_list(state),
-            owners=as_list(owner), tags=as_list(tag),
-            min_running_time=min_running_time)
+            sort_by=sort_by, ascending=ascending, limit=limit,
+            page_size=page_size, max_workers=max_workers,
+            **filters)
+
+    def _iter_leaderboard(self, id, group, state, owner, tag, min_running_time, page_size, query=None,
+                          sort_by='id', ascending=True):
+        filters = self._leaderboard_filters(id, group, state, owner, tag, min_running_time, query)
+        if filters is None:
+            return
+
+        for leaderboard_entries in self.client.iter_leaderboard_entries(
+                namespace=self.namespace, project_name=self.name,
+                sort_by=sort_by, ascending=ascending, page_size=page_size, **filters):
+            if query is not None:
+                leaderboard_entries = query.select(leaderboard_entries)
+            if leaderboard_entries:
+                yield leaderboard_entries
+
+    def _sync_leaderboard_store(self, store, page_size, max_workers):
+        # Entries are fetched bypassing the request cache, which would serve the ones the store is synced with.
+        stored_ids = store.ids()
+        if not stored_ids:
+            store.save(self.client.fetch_leaderboard_entries(
+                namespace=self.namespace, project_name=self.name,
+                page_size=page_size, max_workers=max_workers))
+            return
+
+        unfinished_ids = store.unfinished_ids()
+        refreshed_entries = [
+            entry
+            for batch_entries in map_concurrently(
+                lambda ids: self.client.fetch_leaderboard_entries(
+                    namespace=self.namespace, project_name=self.name, ids=ids, page_size=page_size, max_workers=1),
+                self._id_batches(unfinished_ids, page_size),
+                max_workers=max_workers)
+            for entry in batch_entries
+        ]
+
+        new_entries = []
+        for leaderboard_entries in self.client.iter_leaderboard_entries(
+                namespace=self.namespace, project_name=self.name,
+                sort_by='created', ascending=False, page_size=page_size, prefetch=False):
+            page_new_entries = [entry for entry in leaderboard_entries if entry.id not in stored_ids]
+            new_entries += page_new_entries
+            if len(page_new_entries) < len(leaderboard_entries):
+                break
+
+        self._update_leaderboard_store(store, unfinished_ids, refreshed_entries, new_entries)
+
+    @staticmethod
+    def _id_batches(ids, page_size):
+        return [ids[i:i + page_size] for i in range(0, len(ids), page_size)]
+
+    @staticmethod
+    def _update_leaderboard_store(store, unfinished_ids, refreshed_entries, new_entries):
+        refreshed_ids = set(entry.id for entry in refreshed_entries)
+        store.remove([entry_id for entry_id in unfinished_ids if entry_id not in refreshed_ids])
+        store.save(refreshed_entries + new_entries)
+
+    @staticmethod
+    def _leaderboard_filters(id, group, state, owner, tag, min_running_time, query):
+        """Returns filters of the leaderboard API, including the ones implied by the query,
+        or None when no experiment can match them."""
+        filters = dict(ids=as_list(id), group_ids=as_list(group), states=as_list(state),
+                       owners=as_list(owner), tags=as_list(tag),
+                       min_running_time=min_running_time)
+        if query is None:
+            return filters
+
+        filters = merge_server_filters(filters, query.server_filters())
+        if any(filters[name] == [] for name in ('ids', 'states', 'owners')):
+            return None
+        return filters
+
+    @classmethod
+    def _leaderboard_entries_to_dataframe(cls, leaderboard_entries, first_row_index=0, column_names=None):
+        builder = LeaderboardDataFrameBuilder(first_row_index, column_names).add_all(leaderboard_entries)
+        return builder.build(cls._sort_leaderboard_columns(builder.column_names))
+
+    def _as_experiments(self, experiments_or_filters):
+        if isinstance(experiments_or_filters, dict):
+            return self.get_experiments(**experiments_or_filters)
+        if isinstance(experiments_or_filters, Experiment):
+            return [experiments_or_filters]
+        return list(experiments_or_filters)
+
+    @staticmethod
+    def _channels_values_to_long_dataframe(keys, values):
+        frames = []
+        for (experiment_id, channel_name), channel_values in zip(keys, values):
+            channel_values.insert(0, 'channel', channel_name)
+            channel_values.insert(0, 'experiment_id', experiment_id)
+            frames.append(channel_values)
+
+        if not frames:
+            return pd.DataFrame(columns=['experiment_id', 'channel', 'x', 'y'])
+        return pd.concat(frames, ignore_index=True)
+
+    @staticmethod
+    def _channels_values_to_wide_dataframe(keys, values):
+        columns = pd.MultiIndex.from_tuples(keys, names=['experiment_id', 'channel'])
+        if not keys:
+            return pd.DataFrame(columns=columns, index=pd.Index([], name='x', dtype=float))
+
+        series = [channel_values.drop_duplicates('x', keep='last').set_index('x')['y'] for channel_values in values]
+        df = pd.concat(series, axis=1, sort=True)
+        df.columns = columns
+        return df
+
+    @staticmethod
+    def _hardware_utilization_to_dataframe(experiment_ids, utilizations):
+        if not experiment_ids:
+            return pd.DataFrame(index=pd.MultiIndex.from_arrays([[], []], names=['experiment_id', 'x']))
+        return pd.concat(utilizations, keys=experiment_ids, names=['experiment_id'], sort=False)
 
     @staticmethod
     def _sort_leaderboard_columns(column_names):
@@ -0,0 +1,324 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Expressions filtering experiments on any leaderboard column.
+
+Expressions are built from `Column` objects, comparisons and `&`, `|`, `~` operators:
+
+    >>> from neptunelib.query import Column, channel, parameter
+    >>> query = (parameter('lr') < 0.01) & (channel('val_auc') > 0.9) & (Column('state') == 'succeeded')
+
+A query is evaluated with vectorized operations over the leaderboard DataFrame of a page of experiments,
+which contains only the columns the query refers to. Filters supported by the leaderboard API
+(id, state, owner, tags and running time) are also sent with the requests when the whole query
+depends on them, so that fewer experiments are downloaded at all.
+"""
+
+import numbers
+import operator
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from neptunelib.leaderboard import LeaderboardDataFrameBuilder
+
+# Columns which are not in the leaderboard, but can be queried, read from attributes of leaderboard entries.
+ENTRY_COLUMNS = ('state',)
+
+SERVER_FILTERS = {
+    'id': 'ids',
+    'state': 'states',
+    'owner': 'owners'
+}
+
+
+class Query(object):
+    """A predicate over leaderboard columns of experiments."""
+
+    @property
+    def column_names(self):
+        """Names of the leaderboard columns the query refers to."""
+        raise NotImplementedError()
+
+    def evaluate(self, leaderboard):
+        """Evaluates the query over rows of a leaderboard DataFrame.
+
+        Args:
+            leaderboard(`pandas.DataFrame`): Leaderboard containing at least the columns of the query.
+
+        Returns:
+            `numpy.ndarray`: Boolean array marking the matching rows.
+        """
+        raise NotImplementedError()
+
+    def server_filters(self):
+        """Returns filters of the leaderboard API matching a superset of the experiments matching the query.
+
+        Returns:
+            dict: Arguments of `neptunelib.client.Client.get_leaderboard_entries`, like `states` or `owners`.
+        """
+        return {}
+
+    def select(self, leaderboard_entries):
+        """Returns the leaderboard entries matching the query."""
+        leaderboard_entries = list(leaderboard_entries)
+        if not leaderboard_entries:
+            return leaderboard_entries
+
+        column_names = [name for name in self.column_names if name not in ENTRY_COLUMNS]
+        leaderboard = LeaderboardDataFrameBuilder(column_names=column_names).add_all(leaderboard_entries).build()
+        for name in ENTRY_COLUMNS:
+            if name in self.column_names:
+                leaderboard[name] = [getattr(entry, name) for entry in leaderboard_entries]
+
+        mask = self.evaluate(leaderboard)
+        return [entry for entry, matches in zip(leaderboard_entries, mask) if matches]
+
+    def __and__(self, other):
+        return _And(self, other)
+
+    def __or__(self, other):
+        return _Or(self, other)
+
+    def __invert__(self):
+        return _Not(self)
+
+
+class Column(object):
+    """A leaderboard column, e.g. `Column('owner')` or `Column('parameter_lr')`, to build queries with.
+
+    Compared with a number, values of the column are converted to numbers first,
+    and values which cannot be converted do not match.
+    Missing values match only `isnull()` and `!=`, and negations of the other queries:
+    `~(Column('parameter_lr') > 0.01)` matches experiments without the parameter, unlike
+    `Column('parameter_lr') <= 0.01`. Combine the negation with `notnull()` to skip them.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __lt__(self, value):
+        return _Comparison(self.name, operator.lt, value)
+
+    def __le__(self, value):
+        return _Comparison(self.name, operator.le, value)
+
+    def __gt__(self, value):
+        return _Comparison(self.name, operator.gt, value)
+
+    def __ge__(self, value):
+        return _Comparison(self.name, operator.ge, value)
+
+    def __eq__(self, value):
+        return _Comparison(self.name, operator.eq, value)
+
+    def __ne__(self, value):
+        return _Comparison(self.name, operator.ne, value)
+
+    __hash__ = None
+
+    def isin(self, values):
+        return _IsIn(self.name, list(values))
+
+    def isnull(self):
+        return _IsNull(self.name)
+
+    def notnull(self):
+        return ~_IsNull(self.name)
+
+    def contains(self, value):
+        """Matches list values, like tags, containing the given value, and text values containing the given text."""
+        return _Contains(self.name, value)
+
+
+def parameter(name):
+    return Column('parameter_' + name)
+
+
+def channel(name):
+    return Column('channel_' + name)
+
+
+def user_property(name):
+    return Column('property_' + name)
+
+
+def merge_server_filters(filters, other_filters):
+    """Merges filters of the leaderboard API, so that experiments have to match both of them.
+
+    Lists of allowed values are intersected, which may leave some of them empty, when nothing can match.
+    """
+    merged = dict(filters)
+    for name, value in other_filters.items():
+        if merged.get(name) is None:
+            merged[name] = value
+        elif value is None:
+            continue
+        elif name == 'min_running_time':
+            merged[name] = max(merged[name], value)
+        elif name == 'tags':
+            # Experiments matching any of the tags are listed, so the tags are not narrowed down.
+            continue
+        else:
+            merged[name] = [v for v in merged[name] if v in value]
+    return merged
+
+
+class _Term(Query):
+
+    def __init__(self, column_name):
+        self.column_name = column_name
+
+    @property
+    def column_names(self):
+        return [self.column_name]
+
+    def evaluate(self, leaderboard):
+        if self.column_name not in leaderboard:
+            return self._evaluate_values(pd.Series([np.nan] * len(leaderboard), index=leaderboard.index))
+        return self._evaluate_values(leaderboard[self.column_name])
+
+    def _evaluate_values(self, values):
+        raise NotImplementedError()
+
+
+class _Comparison(_Term):
+
+    def __init__(self, column_name, compare, value):
+        super(_Comparison, self).__init__(column_name)
+        self.compare = compare
+        self.value = value
+
+    def _evaluate_values(self, values):
+        if _is_number(self.value) and values.dtype == np.object_:
+            values = pd.to_numeric(values, errors='coerce')
+        try:
+            return np.asarray(self.compare(values, self.value), dtype=bool)
+        except TypeError:
+            # Values of other types, e.g. strings compared with numbers, do not match.
+            return np.array([self._compare_value(v) for v in values], dtype=bool)
+
+    def _compare_value(self, value):
+        try:
+            return bool(self.compare(value, self.value))
+        except TypeError:
+            return False
+
+    def server_filters(self):
+        if self.column_name in SERVER_FILTERS and self.compare is operator.eq:
+            return {SERVER_FILTERS[self.column_name]: [self.value]}
+        if self.column_name == 'running_time' and _is_number(self.value):
+            if self.compare is operator.ge:
+                return {'min_running_time': int(np.ceil(self.value))}
+            if self.compare is operator.gt:
+                return {'min_running_time': int(np.floor(self.value)) + 1}
+        return {}
+
+
+class _IsIn(_Term):
+
+    def __init__(self, column_name, values):
+        super(_IsIn, self).__init__(column_name)
+        self.values = values
+
+    def _evaluate_values(self, values):
+        return np.asarray(values.isin(self.values), dtype=bool)
+
+    def server_filters(self):
+        if self.column_name in SERVER_FILTERS:
+            return {SERVER_FILTERS[self.column_name]: list(self.values)}
+        return {}
+
+
+class _IsNull(_Term):
+
+    def _evaluate_values(self, values):
+        return np.asarray(values.isnull(), dtype=bool)
+
+
+class _Contains(_Term):
+
+    def __init__(self, column_name, value):
+        super(_Contains, self).__init__(column_name)
+        self.value = value
+
+    def _evaluate_values(self, values):
+        return np.array([self._contains(v) for v in values], dtype=bool)
+
+    def _contains(self, value):
+        try:
+            return self.value in value
+        except TypeError:
+            return False
+
+    def server_filters(self):
+        if self.column_name == 'tags':
+            return {'tags': [self.value]}
+        return {}
+
+
+class _And(Query):
+
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+
+    @property
+    def column_names(self):
+        return _unique(self.left.column_names + self.right.column_names)
+
+    def evaluate(self, leaderboard):
+        return self.left.evaluate(leaderboard) & self.right.evaluate(leaderboard)
+
+    def server_filters(self):
+        return merge_server_filters(self.left.server_filters(), self.right.server_filters())
+
+
+class _Or(Query):
+
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+
+    @property
+    def column_names(self):
+        return _unique(self.left.column_names + self.right.column_names)
+
+    def evaluate(self, leaderboard):
+        return self.left.evaluate(leaderboard) | self.right.evaluate(leaderboard)
+
+
+class _Not(Query):
+    """Complement of a query, matching all the rows the query does not, including ones with missing values."""
+
+    def __init__(self, query):
+        self.query = query
+
+    @property
+    def column_names(self):
+        return self.query.column_names
+
+    def evaluate(self, leaderboard):
+        return ~self.query.evaluate(leaderboard)
+
+
+def _is_number(value):
+    return isinstance(value, numbers.Number) and not isinstance(value, bool)
+
+
+def _unique(names):
+    return list(OrderedDict.fromkeys(names))
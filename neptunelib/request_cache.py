@@ -0,0 +1,153 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+
+from neptunelib.model import LeaderboardEntry
+
+DEFAULT_REQUEST_CACHE_TTL = 300
+DEFAULT_REQUEST_CACHE_MAX_SIZE = 256
+
+_clock = getattr(time, 'monotonic', time.time)
+
+
+class RequestCache(object):
+    """In-process cache of results of API requests, keyed by the name of a method and its normalized arguments.
+
+    Results are served from the cache for `ttl` seconds after they were fetched. When more than `max_size`
+    results are cached, least recently used ones are evicted. Results may be invalidated explicitly,
+    e.g. after the project was changed by another process.
+
+    Args:
+        ttl(float): Number of seconds a result is served from the cache for.
+        max_size(int): Maximum number of cached results.
+
+    Attributes:
+        hits(int): Number of results served from the cache.
+        misses(int): Number of results fetched, because they were not cached or they expired.
+    """
+
+    def __init__(self, ttl=DEFAULT_REQUEST_CACHE_TTL, max_size=DEFAULT_REQUEST_CACHE_MAX_SIZE, clock=_clock):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, fetch):
+        """Returns the cached result of `key`, or the result of `fetch()` which is cached then.
+
+        Concurrent misses of the same key fetch the result independently, and the last fetched one is cached.
+        """
+        now = self._clock()
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None and cached[0] > now:
+                self._results[key] = self._results.pop(key)
+                self.hits += 1
+                return _copy(cached[1])
+            self.misses += 1
+
+        result = fetch()
+
+        with self._lock:
+            self._results.pop(key, None)
+            self._results[key] = (self._clock() + self.ttl, result)
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+        return _copy(result)
+
+    def invalidate(self, method_name=None):
+        """Removes cached results of the method of the given name, or all the cached results when it is None."""
+        with self._lock:
+            if method_name is None:
+                self._results.clear()
+            else:
+                for key in [key for key in self._results if key[0] == method_name]:
+                    del self._results[key]
+
+    def __len__(self):
+        return len(self._results)
+
+
+def memoized(unordered=()):
+    """Returns a decorator caching results of a `Client` method in the `request_cache` of the client,
+    when it has one.
+
+    Calls are keyed by the name of the method and the values of all its arguments, including default ones.
+    Lists are keyed in order, except for lists of the `unordered` arguments, e.g. filters, which are keyed as sets.
+    Calls with arguments which cannot be keyed, e.g. functions, are not cached.
+
+    Args:
+        unordered(tuple): Names of the arguments whose lists are sets of values.
+    """
+
+    def decorator(method):
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = self.request_cache
+            key = _request_key(method, unordered, self, args, kwargs) if cache is not None else None
+            if key is None:
+                return method(self, *args, **kwargs)
+            return cache.get(key, lambda: method(self, *args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+def _request_key(method, unordered, client, args, kwargs):
+    # pylint: disable=deprecated-method
+    call_args = inspect.getcallargs(method, client, *args, **kwargs)
+    del call_args['self']
+    try:
+        key = (method.__name__,) + tuple(sorted((name, _normalized(value, name in unordered))
+                                                for name, value in call_args.items()))
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _normalized(value, unordered=False):
+    if isinstance(value, (list, tuple, set, frozenset)):
+        if unordered or isinstance(value, (set, frozenset)):
+            try:
+                return tuple(sorted(set(value)))
+            except TypeError:
+                pass
+        return tuple(value)
+    if callable(value):
+        # E.g. selections of entries by queries, which are built anew for every call.
+        raise TypeError('Cannot key a request with {!r}'.format(value))
+    return value
+
+
+def _copy(result):
+    # Cached lists are shared by all the callers, which may modify the lists they get. Leaderboard entries
+    # are copied as well, so that the dicts of values they build lazily are not shared either.
+    # DTOs, which are read-only, are shared.
+    if not isinstance(result, list):
+        return result
+    return [LeaderboardEntry(item.project_leaderboard_entry_dto) if isinstance(item, LeaderboardEntry) else item
+            for item in result]
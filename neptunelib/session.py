@@ -14,9 +14,14 @@
 # limitations under the License.
 #
 
+import os
+
+from neptunelib.channel_cache import ChannelValuesCache, DEFAULT_CHANNEL_CACHE_MAX_SIZE
 from neptunelib.client import Client
 from neptunelib.credentials import Credentials
 from neptunelib.project import Project
+from neptunelib.request_cache import DEFAULT_REQUEST_CACHE_MAX_SIZE, RequestCache
+from neptunelib.swagger_spec_cache import DEFAULT_SWAGGER_SPEC_CACHE_DIR, SwaggerSpecCache
 
 
 class Session(object):
@@ -26,11 +31,37 @@ class Session(object):
 
     Args:
         api_token(str): This is a secret API key that you can retrieve by running
-            `$ neptune account api-token get`.
+            `$ neptune account api-token get`. It is exchanged for access tokens, and thereby validated,
+            only by the first request of the session, so an invalid token is not rejected by the constructor.
+        channel_cache_dir(str): Directory for a persistent cache of channel values. Values of channels
+            of finished experiments are downloaded only once. Channel values are not cached when omitted.
+        channel_cache_max_size(int): Maximum size of the channel values cache in bytes.
+            Least recently used channels are evicted when it is exceeded.
+        channel_cache_mmap(bool): Whether channel values are memory-mapped from the cache files
+            instead of being loaded into memory.
+        swagger_spec_cache_dir(str): Directory for a persistent cache of the API specs, which spares downloading
+            them whenever a session is created. It is `~/.neptune/swagger-specs` by default. Cached specs are
+            downloaded again after a day, or as soon as the API turns out not to match them.
+            Specs are downloaded by every session when it is None.
+        transport(`neptunelib.transport.HttpTransport`): Pool of HTTP connections, retry and compression settings
+            of the requests. It can be shared by many sessions. A default one is created for the session when omitted.
+        raw_leaderboard(bool): Whether pages of leaderboards are decoded straight from JSON into plain objects,
+            instead of swagger models. It is much faster for large leaderboards, but responses are not validated.
+            JSON is decoded with orjson when it is installed.
+        request_cache_ttl(float): Number of seconds for which results of requests of projects, project members,
+            experiment groups and leaderboards are reused by identical calls. Results are not reused when None.
+        request_cache_max_size(int): Maximum number of reused results. Least recently used ones are evicted.
+        instrumentation(`neptunelib.instrumentation.Instrumentation`): Instrumentation recording the latency,
+            transferred bytes and retries of requests, and the time spent building dataframes.
+            A new one is created for the session when omitted.
 
     Attributes:
         credentials (`neptunelib.Credentials`): `Credentials` object instance that authenticates your
             calls to Neptune API.
+        request_cache (`neptunelib.request_cache.RequestCache`): Cache of results of requests,
+            with its hit and miss counters, when `request_cache_ttl` is given. Results may be invalidated with it.
+        instrumentation (`neptunelib.instrumentation.Instrumentation`): Metrics of the requests and processing
+            of the session.
 
     Examples:
         Examples should be written in doctest format, and should illustrate how
@@ -46,13 +77,63 @@ class Session(object):
         and simply go:
 
         >>> session = Session()
+
+        Keep values of channels on disk between sessions:
+
+        >>> session = Session(channel_cache_dir='~/.neptune/channels')
+
+        Share a pool of connections with other sessions, and allow more concurrent requests:
+
+        >>> from neptunelib.transport import HttpTransport
+        >>> session = Session(transport=HttpTransport(pool_size=32))
+
+        Reuse results of identical requests for 10 minutes, e.g. in repeatedly run notebook cells:
+
+        >>> session = Session(request_cache_ttl=600)
+        >>> session.request_cache.hits, session.request_cache.misses
+        >>> session.request_cache.invalidate()
+
+        Find out where the time goes, per API operation:
+
+        >>> session = Session()
+        >>> session.get_projects('neptune-ml')['neptune-ml/Salt-Detection'].get_leaderboard()
+        >>> session.instrumentation.to_dict()
+
+        or follow every request as it completes:
+
+        >>> from neptunelib.instrumentation import Instrumentation
+        >>> session = Session(instrumentation=Instrumentation(callbacks=[print]))
     """
 
-    def __init__(self, api_token=None):
+    def __init__(self, api_token=None, channel_cache_dir=None, channel_cache_max_size=DEFAULT_CHANNEL_CACHE_MAX_SIZE,
+                 channel_cache_mmap=False, swagger_spec_cache_dir=DEFAULT_SWAGGER_SPEC_CACHE_DIR,
+                 transport=None, raw_leaderboard=False, request_cache_ttl=None,
+                 request_cache_max_size=DEFAULT_REQUEST_CACHE_MAX_SIZE, instrumentation=None):
         credentials = Credentials(api_token) if api_token else Credentials.from_env()
 
+        channel_values_cache = None
+        if channel_cache_dir is not None:
+            channel_values_cache = ChannelValuesCache(os.path.expanduser(channel_cache_dir),
+                                                      max_size=channel_cache_max_size,
+                                                      mmap=channel_cache_mmap)
+
+        swagger_spec_cache = None
+        if swagger_spec_cache_dir is not None:
+            swagger_spec_cache = SwaggerSpecCache(os.path.expanduser(swagger_spec_cache_dir))
+
+        self.request_cache = None
+        if request_cache_ttl is not None:
+            self.request_cache = RequestCache(ttl=request_cache_ttl, max_size=request_cache_max_size)
+
         self.credentials = credentials
-        self._client = Client(self.credentials.api_address, self.credentials.api_token)
+        self._client = Client(self.credentials.api_address, self.credentials.api_token,
+                              transport=transport,
+                              channel_values_cache=channel_values_cache,
+                              swagger_spec_cache=swagger_spec_cache,
+                              raw_leaderboard=raw_leaderboard,
+                              request_cache=self.request_cache,
+                              instrumentation=instrumentation)
+        self.instrumentation = self._client.instrumentation
 
     def get_projects(self, namespace):
         """It gets all project and full project names for given namespace
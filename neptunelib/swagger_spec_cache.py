@@ -0,0 +1,102 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from neptunelib.utils import remove_file, replace_file
+
+DEFAULT_SWAGGER_SPEC_CACHE_DIR = os.path.join('~', '.neptune', 'swagger-specs')
+DEFAULT_SWAGGER_SPEC_CACHE_TTL = 24 * 60 * 60
+
+
+class SwaggerSpecCache(object):
+    """Persistent cache of swagger specs, keyed by their URLs.
+
+    Every spec is stored with its SHA-256 hash and the time it was fetched at. A stored spec is served
+    without any requests until it gets older than `ttl` seconds, or until it no longer matches its hash.
+    The hash only detects files corrupted on disk, not specs outdated by changes of the API: clients invalidate
+    a spec, and fetch it again, when the API turns out not to match it.
+    The cache is best effort: when the directory cannot be written, specs are simply fetched every time.
+
+    Args:
+        directory(str): Directory storing the cached specs. It is created when missing.
+        ttl(int): Number of seconds a stored spec is served for, before it is fetched again.
+    """
+
+    def __init__(self, directory, ttl=DEFAULT_SWAGGER_SPEC_CACHE_TTL):
+        self.directory = directory
+        self.ttl = ttl
+
+    def get_spec(self, url, fetch_spec):
+        """Returns a cached spec of a URL, fetching it with `fetch_spec` when it is missing or stale.
+
+        Args:
+            url(str): URL of the spec.
+            fetch_spec(callable): Called without arguments and returning the spec as a dict.
+
+        Returns:
+            dict: The spec.
+        """
+        spec = self.load(url)
+        if spec is not None:
+            return spec
+
+        spec = fetch_spec()
+        self.store(url, spec)
+        return spec
+
+    def load(self, url):
+        """Returns the stored spec of a URL, or None when it is missing or stale."""
+        try:
+            with open(self._path(url), 'r') as f:
+                entry = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+        if entry.get('url') != url or time.time() - entry.get('fetched_at', 0) > self.ttl:
+            return None
+        if entry.get('sha256') != _spec_hash(entry.get('spec')):
+            return None
+        return entry['spec']
+
+    def store(self, url, spec):
+        """Stores the spec of a URL, if the cache directory can be written."""
+        temporary_path = None
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            fd, temporary_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'url': url, 'fetched_at': time.time(), 'sha256': _spec_hash(spec), 'spec': spec}, f)
+            replace_file(temporary_path, self._path(url))
+        except (IOError, OSError):
+            if temporary_path is not None:
+                remove_file(temporary_path)
+
+    def invalidate(self, url):
+        """Removes the stored spec of a URL, so that it is fetched again."""
+        remove_file(self._path(url))
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+
+def _spec_hash(spec):
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode('utf-8')).hexdigest()
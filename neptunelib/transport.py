@@ -0,0 +1,98 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import requests
+from bravado.requests_client import RequestsClient
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_CONNECTION_POOL_SIZE = 16
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_BACKOFF_FACTOR = 0.5
+RETRIED_STATUSES = (429, 502, 503, 504)
+# Methods retried on read errors and retried statuses, the same as the default ones of urllib3's Retry.
+IDEMPOTENT_METHODS = frozenset(['HEAD', 'GET', 'PUT', 'DELETE', 'OPTIONS', 'TRACE'])
+
+
+class HttpTransport(object):
+    """A pool of HTTP connections to Neptune, which can be shared by many sessions.
+
+    All the requests sent through the transport, also concurrent ones and ones of different sessions,
+    reuse a single pool of connections per host. Connections are kept alive between requests by default.
+    Only connections are shared: every HTTP client of the transport has its own `requests.Session`,
+    with its own cookies, headers and authenticator.
+
+    Requests failing to connect, timing out on read, or answered with 429, 502, 503 or 504
+    are retried with an exponential backoff, following the Retry-After header when it is present.
+    Only idempotent requests are retried on read errors and statuses.
+
+    Args:
+        pool_size(int): Maximum number of connections kept alive per host. It should be at least
+            the number of requests sent concurrently, e.g. `max_workers` of fetching methods.
+        pool_block(bool): Whether requests wait for a free connection when the pool is exhausted,
+            instead of opening connections which are discarded right after use.
+        max_retries(int): Maximum number of retries of a request. Requests are not retried when 0.
+        retry_backoff_factor(float): Retries wait `retry_backoff_factor * 2 ** (retry - 1)` seconds.
+        keep_alive(bool): Whether connections are kept alive between requests.
+        compression(bool): Whether gzip and deflate encoded responses are accepted.
+
+    Examples:
+        Share connections between sessions of different users.
+
+        >>> from neptunelib.session import Session
+        >>> from neptunelib.transport import HttpTransport
+        >>> transport = HttpTransport(pool_size=32)
+        >>> session = Session(api_token='YOUR_NEPTUNE_API_TOKEN', transport=transport)
+        >>> other_session = Session(api_token='OTHER_NEPTUNE_API_TOKEN', transport=transport)
+    """
+
+    def __init__(self, pool_size=DEFAULT_CONNECTION_POOL_SIZE, pool_block=False,
+                 max_retries=DEFAULT_MAX_RETRIES, retry_backoff_factor=DEFAULT_RETRY_BACKOFF_FACTOR,
+                 keep_alive=True, compression=True):
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=retry_backoff_factor,
+            status_forcelist=RETRIED_STATUSES,
+            respect_retry_after_header=True,
+            # The last response is returned when retries are exhausted, so that it is reported as an HTTP error.
+            raise_on_status=False)
+        self.adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=pool_block,
+                                   max_retries=retry)
+        self.headers = {
+            'Accept-Encoding': 'gzip, deflate' if compression else 'identity',
+            'Connection': 'keep-alive' if keep_alive else 'close'
+        }
+
+    def new_session(self):
+        """Returns a new `requests.Session` sending requests over the connections of the transport."""
+        session = requests.Session()
+        session.mount('http://', self.adapter)
+        session.mount('https://', self.adapter)
+        session.headers.update(self.headers)
+        return session
+
+    def http_client(self):
+        """Returns a new bravado HTTP client sending requests through the transport.
+
+        Clients have their own sessions and authenticators, so clients of different sessions
+        share connections, but neither credentials nor cookies.
+
+        Returns:
+            `bravado.requests_client.RequestsClient`: The HTTP client.
+        """
+        http_client = RequestsClient()
+        http_client.session = self.new_session()
+        return http_client
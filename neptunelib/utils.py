@@ -15,9 +15,15 @@
 #
 
 import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pandas as pd
+from pandas.errors import EmptyDataError
+
+# Number of CSV rows parsed at a time, when CSVs are read in chunks.
+CSV_CHUNK_SIZE = 2 ** 18
 
 
 def map_values(f_value, dictionary):
@@ -40,8 +46,51 @@ def as_list(value):
 
 
 def align_channels_on_x(dataframe):
-    channel_dfs, common_x = _split_df_by_stems(dataframe)
-    return merge_dataframes([common_x] + channel_dfs, on='x', how='outer')
+    """Aligns channels given as x_<name>, y_<name> column pairs on a common, sorted x column.
+
+    The common x is a sorted union of x values of all channels, which values of every channel are scattered into
+    by `scatter_on_common_x`, so no joins between channels are needed.
+    """
+    stems = get_channel_name_stems(dataframe.columns)
+
+    channels_xs, channels_ys = [], []
+    for stem in stems:
+        xs, ys = defined_points(dataframe['x_{}'.format(stem)].values.astype(float),
+                                dataframe['y_{}'.format(stem)].values.astype(float))
+        if len(np.unique(xs)) != len(xs):
+            # Repeated x values of a channel are joined with every matching row by merges.
+            channel_dfs, common_x = _split_df_by_stems(dataframe)
+            return merge_dataframes([common_x] + channel_dfs, on='x', how='outer')
+        channels_xs.append(xs)
+        channels_ys.append(ys)
+
+    common_x, channels_values = scatter_on_common_x(channels_xs, channels_ys)
+    aligned = dict(zip(stems, channels_values), x=common_x)
+    return pd.DataFrame(aligned, columns=['x'] + stems)
+
+
+def defined_points(xs, ys):
+    """Returns the x and y values of the points of a series where neither of them is NaN."""
+    defined = ~(np.isnan(xs) | np.isnan(ys))
+    return xs[defined], ys[defined]
+
+
+def scatter_on_common_x(series_xs, series_ys, dtype=np.float64):
+    """Aligns series on a sorted union of their x values.
+
+    Values of every series are scattered into it with a single vectorized lookup, with NaNs where the series
+    has no value. When a series has repeated x values, its last value is kept.
+
+    Returns:
+        tuple: The common x values and an array of values of every series.
+    """
+    common_x = np.unique(np.concatenate(series_xs)) if series_xs else np.array([], dtype=np.float64)
+    series_values = []
+    for xs, ys in zip(series_xs, series_ys):
+        values = np.full(len(common_x), np.nan, dtype=dtype)
+        values[np.searchsorted(common_x, xs)] = ys
+        series_values.append(values)
+    return common_x, series_values
 
 
 def get_channel_name_stems(columns):
@@ -64,3 +113,63 @@ def _split_df_by_stems(df):
         x_vals.extend(channel_df['x'].tolist())
     common_x = pd.DataFrame({'x': np.unique(x_vals)}, dtype=float)
     return channel_dfs, common_x
+
+
+def map_concurrently(f, items, max_workers):
+    """Applies `f` to every item using a bounded thread pool and returns the results in the order of `items`."""
+    items = list(items)
+    if max_workers is None or max_workers <= 1 or len(items) <= 1:
+        return [f(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(f, items))
+
+
+def iter_csv_chunks(csv, columns, chunk_size=CSV_CHUNK_SIZE):
+    """Yields consecutive DataFrames of at most `chunk_size` rows of a headerless CSV of float values.
+
+    Rows are parsed only when their chunk is requested, so a stream is read no further than needed.
+    Row labels continue across chunks. An empty CSV yields no chunks.
+    """
+    try:
+        reader = pd.read_csv(csv, header=None, names=columns, dtype=float, chunksize=chunk_size)
+    except EmptyDataError:
+        return
+
+    for chunk in reader:
+        if len(chunk):
+            yield chunk
+
+
+def unique_by_id(items):
+    # Entries may shift between pages when the listing changes while it is being fetched.
+    seen_ids = set()
+    unique_items = []
+    for item in items:
+        if item.id not in seen_ids:
+            seen_ids.add(item.id)
+            unique_items.append(item)
+    return unique_items
+
+
+def replace_file(source, destination):
+    """Moves a file over another one.
+
+    Files written to a temporary file in the directory of the destination first, and moved over it then,
+    are never seen partially written by readers.
+    """
+    replace = getattr(os, 'replace', None)
+    if replace is not None:
+        replace(source, destination)
+        return
+
+    # Python 2 cannot replace files atomically on every platform.
+    remove_file(destination)
+    os.rename(source, destination)
+
+
+def remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
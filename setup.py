@@ -1,4 +1,5 @@
 import os
+import sys
 
 from setuptools import find_packages, setup
 
@@ -16,6 +17,9 @@ def version():
 def main():
     root_dir = os.path.dirname(__file__)
 
+    # The asyncio API uses asynchronous generators, which do not even compile before Python 3.6.
+    excluded_packages = ['neptunelib.aio', 'neptunelib.aio.*'] if sys.version_info < (3, 6) else []
+
     with open(os.path.join(root_dir, 'requirements.txt')) as f:
         requirements = [r.strip() for r in f]
         setup(
@@ -28,7 +32,11 @@ def main():
             long_description='Neptune Python library',
             license='Apache License 2.0',
             install_requires=requirements,
-            packages=find_packages(include=['neptunelib*']),
+            extras_require={
+                'aio': ['aiohttp>=3.0; python_version >= "3.6"'],
+                'fast-json': ['orjson; python_version >= "3.7"'],
+            },
+            packages=find_packages(include=['neptunelib*'], exclude=excluded_packages),
             cmdclass={
                 'git_version': git_version.GitVersion,
             }
@@ -0,0 +1,42 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+
+from mock import MagicMock
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def a_coroutine_function(return_value=None, side_effect=None):
+    """Returns a coroutine function recording its calls in the `mock` attribute."""
+    mock = MagicMock(return_value=return_value, side_effect=side_effect)
+
+    async def coroutine_function(*args, **kwargs):
+        return mock(*args, **kwargs)
+
+    coroutine_function.mock = mock
+    return coroutine_function
+
+
+async def collect(async_iterable):
+    return [item async for item in async_iterable]
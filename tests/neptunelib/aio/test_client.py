@@ -0,0 +1,176 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import unittest
+
+from mock import MagicMock, patch
+
+from neptunelib.aio.client import AsyncClient, _query_params
+from tests.neptunelib.aio.async_utils import a_coroutine_function, collect, run
+from tests.neptunelib.random_utils import a_uuid_string
+from tests.neptunelib.test_client import a_paginated_listing, some_items
+
+
+class TestAsyncClient(unittest.TestCase):
+    # pylint: disable=protected-access
+
+    def test_fetch_planned_portions_in_order(self):
+        # given
+        items = some_items(23)
+        get_portion = a_coroutine_function(side_effect=a_paginated_listing(items))
+
+        # when
+        fetched_items = run(AsyncClient._get_all_items(get_portion, step=5))
+
+        # then
+        self.assertEqual(items, fetched_items)
+        self.assertEqual(5, get_portion.mock.call_count)
+
+    def test_skip_duplicated_items(self):
+        # given
+        items = some_items(10)
+        get_portion = a_coroutine_function(side_effect=a_paginated_listing(items[:5] + items[4:]))
+
+        # when
+        fetched_items = run(AsyncClient._get_all_items(get_portion, step=5))
+
+        # then
+        self.assertEqual(items, fetched_items)
+
+    def test_iterate_over_leaderboard_portions(self):
+        # given
+        entry_dtos = some_items(12)
+        client = AsyncClient('https://app.neptune.ml', a_uuid_string())
+        listing = a_paginated_listing(entry_dtos)
+        client._call = a_coroutine_function(side_effect=lambda *_, **params: listing(params['limit'],
+                                                                                     params['offset']))
+
+        # when
+        portions = run(collect(client.iter_leaderboard_entries('namespace', 'project', page_size=5)))
+
+        # then
+        self.assertEqual([5, 5, 2], [len(portion) for portion in portions])
+        self.assertEqual([e.id for e in entry_dtos], [e.internal_id for portion in portions for e in portion])
+
+    def test_record_requests(self):
+        # given
+        client = AsyncClient('https://app.neptune.ml', a_uuid_string())
+        response = MagicMock(status_code=200, raw_bytes=b'x,y\n1,2\n', retries=1)
+        client._get_operation = a_coroutine_function()
+        client._send_operation = a_coroutine_function(return_value=response)
+
+        # when
+        run(client.get_metrics_csv(a_uuid_string()))
+
+        # then
+        request = client.instrumentation.to_dict()['requests']['getSystemMetricsCSV']
+        self.assertEqual((1, 8, 1, 0), (request['count'], request['bytes_received'], request['retries'],
+                                        request['errors']))
+
+    @patch('neptunelib.aio.client.DEFAULT_RETRY_BACKOFF_FACTOR', 0)
+    def test_retry_only_idempotent_requests_on_statuses(self):
+        # given
+        client = AsyncClient('https://app.neptune.ml', a_uuid_string())
+        http_session = a_http_session_responding(503, 503, 200)
+        client._get_http_session = lambda: http_session
+
+        # when
+        post_response = run(client._send('POST', 'https://app.neptune.ml/api'))
+        get_response = run(client._send('GET', 'https://app.neptune.ml/api'))
+
+        # then
+        self.assertEqual((503, 0), (post_response.status_code, post_response.retries))
+        self.assertEqual((200, 1), (get_response.status_code, get_response.retries))
+
+    @patch('neptunelib.aio.client.swagger_client_from_spec')
+    def test_fetch_cached_spec_again_when_operation_is_missing(self, swagger_client_from_spec):
+        # given
+        swagger_spec_cache = MagicMock()
+        outdated_swagger_client, swagger_client = MagicMock(), MagicMock()
+        outdated_swagger_client.api = MagicMock(spec=[])
+        swagger_client_from_spec.side_effect = [outdated_swagger_client, swagger_client]
+
+        # and
+        client = AsyncClient('https://app.neptune.ml', a_uuid_string(), swagger_spec_cache=swagger_spec_cache)
+        client._fetch_spec = a_coroutine_function()
+
+        # when
+        operation = run(client._get_operation('backend', 'getSystemMetricsCSV'))
+
+        # then
+        self.assertIs(swagger_client.api.getSystemMetricsCSV.operation, operation)
+        swagger_spec_cache.invalidate.assert_called_once_with('https://app.neptune.ml/api/backend/swagger.json')
+
+    @patch('neptunelib.aio.client.AsyncNeptuneAuthenticator')
+    @patch('neptunelib.aio.client.unmarshal_response', MagicMock())
+    @patch('neptunelib.aio.client.swagger_client_from_spec')
+    def test_exchange_api_token_with_outdated_cached_spec(self, swagger_client_from_spec, authenticator_class):
+        # given
+        outdated_swagger_client, swagger_client = MagicMock(), MagicMock()
+        outdated_swagger_client.api = MagicMock(spec=[])
+        swagger_client_from_spec.side_effect = [outdated_swagger_client, swagger_client]
+
+        # and
+        client = AsyncClient('https://app.neptune.ml', a_uuid_string(), swagger_spec_cache=MagicMock())
+        client._fetch_spec = a_coroutine_function()
+        response = MagicMock(status_code=200, raw_bytes=b'{}', retries=0)
+        client._send_operation = a_coroutine_function(return_value=response)
+
+        # when
+        authenticator = run(asyncio.wait_for(client._get_authenticator(), timeout=5))
+
+        # then
+        self.assertIs(authenticator_class.return_value, authenticator)
+        authenticator_class.assert_called_once_with(response.swagger_result)
+        self.assertEqual(swagger_client.api.exchangeApiToken.operation,
+                         client._send_operation.mock.call_args[0][0])
+
+    def test_build_query_params(self):
+        # when
+        params = _query_params({'state': ['running', 'failed'], 'limit': 10, 'owner': None, 'ascending': True})
+
+        # then
+        self.assertEqual([('state', 'running'), ('state', 'failed'), ('limit', '10'), ('ascending', 'true')],
+                         list(params.items()))
+
+
+def a_http_session_responding(*statuses):
+    responses = iter(statuses)
+
+    class Response(object):
+        def __init__(self):
+            self.status = next(responses)
+            self.reason = 'reason'
+            self.headers = {}
+            self.charset = None
+
+        async def read(self):
+            return b''
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *_):
+            return False
+
+    http_session = MagicMock()
+    http_session.request.side_effect = lambda *_, **__: Response()
+    return http_session
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import unittest
+
+import pandas as pd
+from mock import MagicMock
+from pandas.util.testing import assert_frame_equal
+
+from neptunelib.aio.experiment import AsyncExperiment
+from neptunelib.exceptions import ChannelValuesFetchError
+from tests.neptunelib.aio.async_utils import a_coroutine_function, collect, run
+from tests.neptunelib.random_utils import sort_df_by_columns
+from tests.neptunelib.test_experiment import a_leaderboard_entry_mock_with_channels, raise_
+
+
+class TestAsyncExperiment(unittest.TestCase):
+
+    def test_get_numeric_channels_values_of_many_channels(self):
+        # given
+        channels_csv = {
+            'id_batch_loss': b'\n'.join([b'1,0.9', b'2,0.7', b'3,0.4']),
+            'id_epoch_loss': b'3,0.5',
+            'id_empty': b''
+        }
+
+        client = MagicMock()
+        client.get_channel_points_csv = a_coroutine_function(side_effect=lambda _, channel_id: channels_csv[channel_id])
+
+        # and
+        leaderboard_entry = a_leaderboard_entry_mock_with_channels('batch_loss', 'epoch_loss', 'empty')
+        experiment = AsyncExperiment(client, leaderboard_entry)
+
+        # when
+        result = run(experiment.get_numeric_channels_values('batch_loss', 'epoch_loss', 'empty'))
+
+        # then
+        expected_result = pd.DataFrame({'x': [1.0, 2.0, 3.0],
+                                        'batch_loss': [0.9, 0.7, 0.4],
+                                        'epoch_loss': [float('nan'), float('nan'), 0.5],
+                                        'empty': [float('nan')] * 3}, dtype=float)
+        assert_frame_equal(sort_df_by_columns(expected_result), sort_df_by_columns(result))
+
+    def test_report_errors_of_all_failed_channels(self):
+        # given
+        error = IOError('Connection lost')
+        client = MagicMock()
+        client.get_channel_points_csv = a_coroutine_function(
+            side_effect=lambda _, channel_id: b'1,0.9' if channel_id == 'id_loss' else raise_(error))
+
+        # and
+        experiment = AsyncExperiment(client, a_leaderboard_entry_mock_with_channels('loss', 'acc', 'lr'))
+
+        # when
+        with self.assertRaises(ChannelValuesFetchError) as context:
+            run(experiment.get_numeric_channels_values('loss', 'acc', 'lr'))
+
+        # then
+        self.assertEqual({'acc': error, 'lr': error}, context.exception.errors)
+
+    def test_get_hardware_utilization(self):
+        # given
+        client = MagicMock()
+        client.get_metrics_csv = a_coroutine_function(return_value=b'x_cpu,y_cpu\n0,12.5\n1000,50.0')
+        experiment = AsyncExperiment(client, a_leaderboard_entry_mock_with_channels())
+
+        # when
+        result = run(experiment.get_hardware_utilization())
+
+        # then
+        assert_frame_equal(pd.DataFrame({'x_cpu': [0, 1000], 'y_cpu': [12.5, 50.0]}), result)
+
+    def test_get_compact_hardware_utilization(self):
+        # given
+        client = MagicMock()
+        client.get_metrics_csv = a_coroutine_function(return_value=b'x_cpu,y_cpu\n0,12.5\n1000,50.0')
+        experiment = AsyncExperiment(client, a_leaderboard_entry_mock_with_channels())
+
+        # when
+        result = run(experiment.get_hardware_utilization(compact=True))
+
+        # then
+        expected_result = pd.DataFrame({'cpu': [12.5, 50.0]}, index=pd.Index([0.0, 1000.0], name='x'), dtype='float32')
+        assert_frame_equal(expected_result, result)
+
+    def test_iter_channel_values(self):
+        # given
+        client = MagicMock()
+        client.get_channel_points_csv = a_coroutine_function(return_value=b'1,0.9\n2,0.7\n3,0.4')
+        experiment = AsyncExperiment(client, a_leaderboard_entry_mock_with_channels('batch_loss'))
+
+        # when
+        chunks = run(collect(experiment.iter_channel_values('batch_loss', chunk_size=2)))
+
+        # then
+        self.assertEqual([2, 1], [len(chunk) for chunk in chunks])
+        expected_result = pd.DataFrame({'x': [1.0, 2.0, 3.0], 'y': [0.9, 0.7, 0.4]})
+        assert_frame_equal(expected_result, pd.concat(chunks))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import time
+import unittest
+
+from mock import MagicMock, patch
+
+from neptunelib.aio.oauth import AsyncNeptuneAuthenticator
+from tests.neptunelib.aio.async_utils import run
+from tests.neptunelib.oauth_objects_factory import a_refresh_token, an_access_token
+
+
+class TestAsyncNeptuneAuthenticator(unittest.TestCase):
+    # pylint: disable=protected-access
+
+    def test_refresh_short_living_tokens_halfway(self):
+        # given
+        now = time.time()
+        access_token = an_access_token(expires_at=now + 10)
+        authenticator = AsyncNeptuneAuthenticator(MagicMock(accessToken=access_token, refreshToken=a_refresh_token()))
+        authenticator._refresh = MagicMock()
+
+        # when
+        with patch('neptunelib.aio.oauth.time.time', return_value=now + 4):
+            headers = run(authenticator.headers(MagicMock()))
+
+        # then
+        authenticator._refresh.assert_not_called()
+        self.assertEqual({'Authorization': 'Bearer {}'.format(access_token)}, headers)
+
+        # expect
+        with patch('neptunelib.aio.oauth.time.time', return_value=now + 6):
+            self.assertTrue(authenticator._expired())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from mock import MagicMock
+from pandas.util.testing import assert_frame_equal
+
+from neptunelib.aio.experiment import AsyncExperiment
+from neptunelib.aio.project import AsyncProject
+from neptunelib.leaderboard_store import LeaderboardStore
+from neptunelib.model import LeaderboardEntry
+from neptunelib.project import Project
+from tests.neptunelib.aio.async_utils import a_coroutine_function, collect, run
+from tests.neptunelib.api_objects_factory import a_registered_project_member, an_experiment_leaderboard_entry_dto, \
+    an_invited_project_member
+from tests.neptunelib.project_test_fixture import some_exp_entry_dto
+from tests.neptunelib.random_utils import a_string, a_uuid_string
+from tests.neptunelib.test_project import a_leaderboard_entry_with_channel_dtos
+
+
+class TestAsyncProject(unittest.TestCase):
+
+    def setUp(self):
+        super(TestAsyncProject, self).setUp()
+        self.client = MagicMock()
+        self.client.channel_values_cache = None
+        self.project = AsyncProject(client=self.client, internal_id=a_uuid_string(), namespace=a_string(),
+                                    name=a_string())
+
+    def test_get_members(self):
+        # given
+        member = a_registered_project_member()
+        self.client.get_project_members = a_coroutine_function(return_value=[member, an_invited_project_member()])
+
+        # when
+        usernames = run(self.project.get_members())
+
+        # then
+        self.assertEqual([member.registeredMemberInfo.username], usernames)
+
+    def test_get_experiments(self):
+        # given
+        leaderboard_entries = [LeaderboardEntry(some_exp_entry_dto), LeaderboardEntry(some_exp_entry_dto)]
+        self.client.get_leaderboard_entries = a_coroutine_function(return_value=leaderboard_entries)
+
+        # when
+        experiments = run(self.project.get_experiments(state='succeeded'))
+
+        # then
+        self.assertEqual([AsyncExperiment(self.client, entry) for entry in leaderboard_entries], experiments)
+        self.assertEqual(['succeeded'], self.client.get_leaderboard_entries.mock.call_args[1]['states'])
+
+    def test_get_leaderboard_like_project(self):
+        # given
+        leaderboard_entries = [LeaderboardEntry(some_exp_entry_dto)]
+        self.client.get_leaderboard_entries = a_coroutine_function(return_value=leaderboard_entries)
+
+        # when
+        leaderboard = run(self.project.get_leaderboard())
+
+        # then
+        sync_client = MagicMock()
+        sync_client.get_leaderboard_entries.return_value = leaderboard_entries
+        sync_project = Project(sync_client, self.project.internal_id, self.project.namespace, self.project.name)
+        assert_frame_equal(sync_project.get_leaderboard(), leaderboard)
+
+    def test_iter_experiments(self):
+        # given
+        pages = [[LeaderboardEntry(some_exp_entry_dto)] * 2, [LeaderboardEntry(some_exp_entry_dto)]]
+
+        async def iter_leaderboard_entries(**_):
+            for page in pages:
+                yield page
+
+        self.client.iter_leaderboard_entries = iter_leaderboard_entries
+
+        # when
+        experiments = run(collect(self.project.iter_experiments()))
+
+        # then
+        self.assertEqual(3, len(experiments))
+
+    def test_sync_leaderboard(self):
+        # given
+        entry_dtos = [an_experiment_leaderboard_entry_dto() for _ in range(3)]
+        running_dto, finished_dto, new_dto = entry_dtos
+        running_dto.state = 'running'
+
+        # and
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        store_path = os.path.join(directory, 'leaderboard.sqlite')
+
+        # and
+        self.client.get_leaderboard_entries = a_coroutine_function(
+            return_value=[LeaderboardEntry(running_dto), LeaderboardEntry(finished_dto)])
+        run(self.project.sync_leaderboard(store_path))
+
+        # and
+        running_dto.state = 'succeeded'
+        self.client.get_leaderboard_entries = a_coroutine_function(return_value=[LeaderboardEntry(running_dto)])
+        pages = [[LeaderboardEntry(new_dto), LeaderboardEntry(finished_dto)], [LeaderboardEntry(running_dto)]]
+        listed_pages = []
+
+        async def iter_leaderboard_entries(**_):
+            for page in pages:
+                listed_pages.append(page)
+                yield page
+
+        self.client.iter_leaderboard_entries = iter_leaderboard_entries
+
+        # when
+        leaderboard = run(self.project.sync_leaderboard(store_path, columns=['owner']))
+
+        # then
+        self.assertEqual([running_dto.shortId], self.client.get_leaderboard_entries.mock.call_args[1]['ids'])
+        self.assertEqual(pages[:1], listed_pages)
+
+        # and
+        self.assertEqual(sorted(dto.shortId for dto in entry_dtos), sorted(leaderboard['id']))
+        self.assertEqual(['id', 'owner'], list(leaderboard.columns))
+
+        # and
+        with LeaderboardStore(store_path, self.project.full_id) as store:
+            self.assertEqual([], store.unfinished_ids())
+
+    def test_get_numeric_channels_values_of_many_experiments(self):
+        # given
+        experiments = [
+            AsyncExperiment(self.client, a_leaderboard_entry_with_channel_dtos('loss')),
+            AsyncExperiment(self.client, a_leaderboard_entry_with_channel_dtos('acc'))
+        ]
+        self.client.get_channel_points_csv = a_coroutine_function(return_value=b'1,0.5\n2,0.25')
+
+        # when
+        values = run(self.project.get_numeric_channels_values(experiments, 'loss'))
+
+        # then
+        self.assertEqual([experiments[0].id] * 2, list(values['experiment_id']))
+        self.assertEqual([0.5, 0.25], list(values['y']))
+
+    def test_get_hardware_utilization_of_many_experiments(self):
+        # given
+        experiments = [
+            AsyncExperiment(self.client, a_leaderboard_entry_with_channel_dtos()),
+            AsyncExperiment(self.client, a_leaderboard_entry_with_channel_dtos())
+        ]
+        self.client.get_metrics_csv = a_coroutine_function(return_value=b'x_cpu,y_cpu\n0,10\n5000,30')
+
+        # when
+        utilization = run(self.project.get_hardware_utilization(experiments, interval=10))
+
+        # then
+        self.assertEqual([(experiments[0].id, 0.0), (experiments[1].id, 0.0)], list(utilization.index))
+        self.assertEqual([20.0, 20.0], list(utilization['cpu']))
+
+    def test_to_string(self):
+        # expect
+        self.assertEqual('AsyncProject({})'.format(self.project.full_id), str(self.project))
+
+
+if __name__ == '__main__':
+    unittest.main()
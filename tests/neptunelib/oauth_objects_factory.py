@@ -23,8 +23,9 @@ from tests.neptunelib.random_utils import a_string
 SECRET = 'secret'
 
 
-def an_access_token():
-    return jwt.encode({'exp': time.time(), 'azp': a_string(), 'iss': 'http://{}.com'.format(a_string())}, SECRET)
+def an_access_token(expires_at=None):
+    expires_at = time.time() if expires_at is None else expires_at
+    return jwt.encode({'exp': expires_at, 'azp': a_string(), 'iss': 'http://{}.com'.format(a_string())}, SECRET)
 
 
 def a_refresh_token():
@@ -0,0 +1,67 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmarks.suite import SCENARIOS, compare_results, load_results, run_suite, store_results
+
+TINY_PROJECT = dict(experiments=3, channels=2, points=10, metrics_points=10, channel_experiments=2,
+                    latency=0.0, seed=0)
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def setUp(self):
+        super(TestBenchmarkSuite, self).setUp()
+        self.results_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.results_dir)
+        super(TestBenchmarkSuite, self).tearDown()
+
+    def test_run_and_store_all_scenarios(self):
+        # given
+        path = os.path.join(self.results_dir, 'results.json')
+
+        # when
+        results = run_suite(TINY_PROJECT, repeat=1, warmup=0)
+        store_results(results, path)
+
+        # then
+        stored = load_results(path)
+        self.assertEqual([s.name for s in SCENARIOS], list(stored['scenarios']))
+        self.assertEqual(TINY_PROJECT, stored['config'])
+        self.assertEqual({'getChannelValuesCSV': 2}, stored['scenarios']['get_numeric_channels_values']['requests'])
+
+    def test_report_regressions(self):
+        # given
+        baseline = {'scenarios': {'get_leaderboard': {'min_seconds': 1.0}, 'get_experiments': {'min_seconds': 1.0}}}
+        current = {'scenarios': {'get_leaderboard': {'min_seconds': 1.5}, 'get_experiments': {'min_seconds': 1.05},
+                                 'get_hardware_utilization': {'min_seconds': 1.0}}}
+
+        # when
+        comparison = compare_results(baseline, current, tolerance=0.1)
+
+        # then
+        self.assertEqual([('get_leaderboard', True), ('get_experiments', False)],
+                         [(name, regressed) for name, _, _, _, regressed in comparison])
+
+
+if __name__ == '__main__':
+    unittest.main()
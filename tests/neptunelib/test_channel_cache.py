@@ -0,0 +1,145 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from mock import MagicMock, patch
+
+from neptunelib.channel_cache import ChannelValuesCache
+from tests.neptunelib.random_utils import a_uuid_string
+
+
+class TestChannelValuesCache(unittest.TestCase):
+
+    def setUp(self):
+        super(TestChannelValuesCache, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.cache = ChannelValuesCache(self.directory)
+        self.experiment_id, self.channel_id = a_uuid_string(), a_uuid_string()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        super(TestChannelValuesCache, self).tearDown()
+
+    def test_serve_complete_values_from_disk(self):
+        # given
+        values = np.array([[1.0, 2.0], [0.5, 0.4]])
+        fetch_values = MagicMock(return_value=values)
+
+        # when
+        self.cache.get_values(self.experiment_id, self.channel_id, complete=True, fetch_values=fetch_values)
+        cached_values = ChannelValuesCache(self.directory).get_values(
+            self.experiment_id, self.channel_id, complete=True, fetch_values=fetch_values)
+
+        # then
+        np.testing.assert_array_equal(values, cached_values)
+        fetch_values.assert_called_once_with(None)
+
+    def test_refresh_partial_values(self):
+        # given
+        fetch_values = MagicMock(side_effect=[
+            np.array([[1.0], [0.5]]),
+            np.array([[1.0, 2.0], [0.5, 0.4]])
+        ])
+
+        # when
+        self.cache.get_values(self.experiment_id, self.channel_id, complete=False, fetch_values=fetch_values)
+        values = self.cache.get_values(self.experiment_id, self.channel_id, complete=True, fetch_values=fetch_values)
+
+        # then
+        np.testing.assert_array_equal(np.array([[1.0, 2.0], [0.5, 0.4]]), values)
+        self.assertEqual(2, fetch_values.call_count)
+
+        # and
+        self.assertEqual([self.channel_id + ChannelValuesCache.COMPLETE_SUFFIX],
+                         os.listdir(os.path.join(self.directory, self.experiment_id)))
+
+    def test_fetch_new_values_incrementally(self):
+        # given
+        fetch_values = MagicMock(side_effect=[
+            np.array([[1.0, 2.0], [0.5, 0.4]]),
+            np.array([[2.0, 3.0], [0.4, 0.3]])
+        ])
+
+        # when
+        self.cache.get_values(self.experiment_id, self.channel_id, complete=False,
+                              fetch_values=fetch_values, incremental=True)
+        values = self.cache.get_values(self.experiment_id, self.channel_id, complete=False,
+                                       fetch_values=fetch_values, incremental=True)
+
+        # then
+        fetch_values.assert_called_with(2)
+        np.testing.assert_array_equal(np.array([[1.0, 2.0, 3.0], [0.5, 0.4, 0.3]]), values)
+
+    def test_return_memory_mapped_values(self):
+        # given
+        values = np.array([[1.0, 2.0], [0.5, 0.4]])
+        cache = ChannelValuesCache(self.directory, mmap=True)
+
+        # when
+        downloaded_values = cache.get_values(self.experiment_id, self.channel_id, complete=True,
+                                             fetch_values=lambda _: values)
+        cached_values = cache.get_values(self.experiment_id, self.channel_id, complete=True,
+                                         fetch_values=lambda _: None)
+
+        # then
+        for returned_values in [downloaded_values, cached_values]:
+            self.assertIsInstance(returned_values, np.memmap)
+            self.assertFalse(returned_values.flags.writeable)
+            np.testing.assert_array_equal(values, returned_values)
+
+    def test_evict_least_recently_used_values(self):
+        # given
+        values = np.zeros((2, 100))
+        channel_size = len(values.tobytes())
+        cache = ChannelValuesCache(self.directory, max_size=int(2.5 * channel_size))
+
+        # and
+        channel_ids = [a_uuid_string() for _ in range(3)]
+        for age, channel_id in zip([30, 20, 10], channel_ids):
+            cache.get_values(self.experiment_id, channel_id, complete=True, fetch_values=lambda _: values)
+            path = os.path.join(self.directory, self.experiment_id, channel_id + ChannelValuesCache.COMPLETE_SUFFIX)
+            os.utime(path, (os.path.getmtime(path) - age, os.path.getmtime(path) - age))
+
+        # when
+        cache.get_values(self.experiment_id, a_uuid_string(), complete=True, fetch_values=lambda _: values)
+
+        # then
+        remaining_files = os.listdir(os.path.join(self.directory, self.experiment_id))
+        self.assertEqual(2, len(remaining_files))
+        self.assertNotIn(channel_ids[0] + ChannelValuesCache.COMPLETE_SUFFIX, remaining_files)
+        self.assertNotIn(channel_ids[1] + ChannelValuesCache.COMPLETE_SUFFIX, remaining_files)
+
+    def test_scan_directory_only_when_limit_may_be_exceeded(self):
+        # given
+        values = np.zeros((2, 100))
+        cache = ChannelValuesCache(self.directory, max_size=10 * len(values.tobytes()))
+
+        # when
+        with patch('neptunelib.channel_cache.os.walk', wraps=os.walk) as walk:
+            for _ in range(5):
+                cache.get_values(self.experiment_id, a_uuid_string(), complete=True, fetch_values=lambda _: values)
+
+        # then
+        self.assertEqual(1, walk.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from benchmarks.stub_backend import NAMESPACE, PROJECT_NAME, StubBackend, SyntheticProject
+
+# About 25 bytes per point, so the CSV of the long channel takes about 1 GB.
+LONG_CHANNEL_POINTS = 40 * 1000 * 1000
+CHANNEL_POINTS = 2 * 1000 * 1000
+MEMORY_LIMIT_BYTES = 64 * 2 ** 20
+
+# Runs in a fresh interpreter, so that the peak resident set size reflects only the iteration.
+ITERATE_CHANNEL = '''
+import json, resource, sys
+from neptunelib.session import Session
+
+session = Session(api_token=sys.argv[1], swagger_spec_cache_dir=None)
+experiment = session.get_projects('{namespace}')['{namespace}/{project}'].get_experiments()[0]
+
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+points = 0
+for chunk in experiment.iter_channel_values('channel_0'):
+    points += len(chunk)
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+
+print(json.dumps({{'points': points, 'peak_bytes': peak if sys.platform == 'darwin' else peak * 1024}}))
+'''.format(namespace=NAMESPACE, project=PROJECT_NAME)
+
+
+@unittest.skipIf(sys.platform == 'win32', 'resource module is not available')
+class TestChannelStreaming(unittest.TestCase):
+
+    def test_iterate_channel_values_in_constant_memory(self):
+        # expect
+        self.assert_iterated_in_constant_memory(CHANNEL_POINTS)
+
+    @unittest.skipUnless(os.environ.get('NEPTUNELIB_SLOW_TESTS'), 'set NEPTUNELIB_SLOW_TESTS to run slow tests')
+    def test_iterate_1gb_channel_values_in_constant_memory(self):
+        # expect
+        self.assert_iterated_in_constant_memory(LONG_CHANNEL_POINTS)
+
+    def assert_iterated_in_constant_memory(self, points):
+        # given
+        with StubBackend(SyntheticProject(experiments=1, channels=1, points=points)) as backend:
+            # when
+            output = subprocess.check_output([sys.executable, '-c', ITERATE_CHANNEL, backend.api_token])
+
+        # then
+        result = json.loads(output.decode().strip().splitlines()[-1])
+        self.assertEqual(points, result['points'])
+        self.assertLess(result['peak_bytes'], MEMORY_LIMIT_BYTES)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,518 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import unittest
+
+import numpy as np
+from bravado.exception import HTTPNotFound
+from bravado_core.exception import SwaggerMappingError
+from mock import ANY, MagicMock, patch
+
+from neptunelib.client import Client, Pagination, leaderboard_sort_params
+from neptunelib.instrumentation import Instrumentation
+from neptunelib.request_cache import RequestCache
+from tests.neptunelib.random_utils import a_uuid_string
+
+
+class TestGetAllItems(unittest.TestCase):
+    # pylint: disable=protected-access
+
+    def test_fetch_single_incomplete_portion(self):
+        # given
+        items = some_items(3)
+        get_portion = a_paginated_listing(items)
+
+        # when
+        fetched_items = Client._get_all_items(get_portion, step=5, max_workers=4)
+
+        # then
+        self.assertEqual(items, fetched_items)
+        get_portion.assert_called_once_with(limit=5, offset=0)
+
+    def test_fetch_planned_portions_concurrently_in_order(self):
+        # given
+        items = some_items(23)
+        get_portion = a_paginated_listing(items)
+
+        # when
+        fetched_items = Client._get_all_items(get_portion, step=5, max_workers=4)
+
+        # then
+        self.assertEqual(items, fetched_items)
+        self.assertEqual(5, get_portion.call_count)
+
+    def test_fetch_sequentially_without_item_count(self):
+        # given
+        items = some_items(10)
+        get_portion = a_paginated_listing(items, with_item_count=False)
+
+        # when
+        fetched_items = Client._get_all_items(get_portion, step=5, max_workers=4)
+
+        # then
+        self.assertEqual(items, fetched_items)
+        self.assertEqual(3, get_portion.call_count)
+
+    def test_plan_portions_with_item_count_of_any_integer_type(self):
+        # given
+        items = some_items(10)
+        get_portion = a_paginated_listing(items, item_count=np.int64(20))
+
+        # when
+        fetched_items = Client._get_all_items(get_portion, step=5, max_workers=4)
+
+        # then
+        self.assertEqual(items, fetched_items)
+        get_portion.assert_any_call(limit=5, offset=15)
+
+    def test_fetch_items_added_after_probe(self):
+        # given
+        items = some_items(12)
+        get_portion = a_paginated_listing(items, item_count=10)
+
+        # when
+        fetched_items = Client._get_all_items(get_portion, step=5, max_workers=4)
+
+        # then
+        self.assertEqual(items, fetched_items)
+
+    def test_select_items_of_every_portion(self):
+        # given
+        items = some_items(23)
+        get_portion = a_paginated_listing(items)
+
+        # when
+        fetched_items = Client._get_all_items(get_portion, step=5, max_workers=4,
+                                              select=lambda portion: portion[:1])
+
+        # then
+        self.assertEqual(items[::5], fetched_items)
+        self.assertEqual(5, get_portion.call_count)
+
+    def test_stop_after_limit(self):
+        # given
+        items = some_items(23)
+        get_portion = a_paginated_listing(items)
+
+        # when
+        fetched_items = Client._get_all_items(get_portion, step=10, max_workers=4, limit=12)
+
+        # then
+        self.assertEqual(items[:12], fetched_items)
+        self.assertEqual(2, get_portion.call_count)
+
+    def test_fetch_no_larger_portions_than_limit(self):
+        # given
+        items = some_items(23)
+        get_portion = a_paginated_listing(items)
+
+        # when
+        fetched_items = Client._get_all_items(get_portion, step=10, max_workers=4, limit=3)
+
+        # then
+        self.assertEqual(items[:3], fetched_items)
+        get_portion.assert_called_once_with(limit=3, offset=0)
+
+    def test_stop_after_limit_of_selected_items(self):
+        # given
+        items = some_items(23)
+        get_portion = a_paginated_listing(items)
+
+        # when
+        fetched_items = Client._get_all_items(get_portion, step=5, max_workers=4,
+                                              select=lambda portion: portion[::2], limit=4)
+
+        # then
+        self.assertEqual([items[0], items[2], items[4], items[5]], fetched_items)
+        self.assertEqual(2, get_portion.call_count)
+
+    def test_skip_duplicated_items(self):
+        # given
+        items = some_items(10)
+        get_portion = a_paginated_listing(items[:5] + items[4:])
+
+        # when
+        fetched_items = Client._get_all_items(get_portion, step=5, max_workers=4)
+
+        # then
+        self.assertEqual(items, fetched_items)
+
+
+class TestLeaderboardSortParams(unittest.TestCase):
+
+    def test_sort_by_short_id(self):
+        # expect
+        self.assertEqual(
+            dict(sortBy=['shortId'], sortFieldType=['native'], sortDirection=['descending']),
+            leaderboard_sort_params('id', ascending=False))
+
+    def test_break_ties_by_short_id(self):
+        # expect
+        self.assertEqual(
+            dict(sortBy=['runningTime', 'shortId'], sortFieldType=['native', 'native'],
+                 sortDirection=['ascending', 'ascending']),
+            leaderboard_sort_params('running_time', ascending=True))
+
+    def test_sort_by_user_defined_values(self):
+        # expect
+        self.assertEqual(['val auc', 'numericChannels'],
+                         sort_field_of(leaderboard_sort_params('channel_val auc', ascending=False)))
+        self.assertEqual(['lr', 'parameter'], sort_field_of(leaderboard_sort_params('parameter_lr', ascending=False)))
+        self.assertEqual(['data', 'property'], sort_field_of(leaderboard_sort_params('property_data', ascending=False)))
+
+    def test_reject_unknown_columns(self):
+        # expect
+        with self.assertRaises(ValueError):
+            leaderboard_sort_params('tags', ascending=True)
+
+
+class TestIterPortions(unittest.TestCase):
+    # pylint: disable=protected-access
+
+    def test_iterate_over_portions(self):
+        # given
+        items = some_items(12)
+        get_portion = a_paginated_listing(items)
+
+        # when
+        portions = list(Client._iter_portions(get_portion, step=5))
+
+        # then
+        self.assertEqual([items[0:5], items[5:10], items[10:12]], portions)
+
+    def test_skip_trailing_empty_portion(self):
+        # given
+        items = some_items(10)
+        get_portion = a_paginated_listing(items)
+
+        # when
+        portions = list(Client._iter_portions(get_portion, step=5))
+
+        # then
+        self.assertEqual([items[0:5], items[5:10]], portions)
+        self.assertEqual(3, get_portion.call_count)
+
+    def test_prefetch_next_portion(self):
+        # given
+        items = some_items(12)
+        get_portion = a_paginated_listing(items)
+
+        # when
+        portions = Client._iter_portions(get_portion, step=5)
+        first_portion = next(portions)
+        portions.close()
+
+        # then
+        self.assertEqual(items[0:5], first_portion)
+        get_portion.assert_called_with(limit=5, offset=5)
+
+    def test_fetch_portions_on_demand_without_prefetching(self):
+        # given
+        items = some_items(12)
+        get_portion = a_paginated_listing(items)
+
+        # when
+        portions = Client._iter_portions(get_portion, step=5, prefetch=False)
+        first_portion = next(portions)
+        portions.close()
+
+        # then
+        self.assertEqual(items[0:5], first_portion)
+        get_portion.assert_called_once_with(limit=5, offset=0)
+
+        # and
+        self.assertEqual([items[0:5], items[5:10], items[10:12]],
+                         list(Client._iter_portions(get_portion, step=5, prefetch=False)))
+
+
+class TestPagination(unittest.TestCase):
+
+    def test_plan_portions_up_to_matching_item_count(self):
+        # given
+        pagination = Pagination(step=5)
+        first_portion = MagicMock(entries=some_items(5), matchingItemCount=17)
+
+        # when
+        pagination.add(*pagination.select_portion(first_portion.entries))
+
+        # then
+        self.assertEqual([5, 10, 15], pagination.planned_offsets(first_portion))
+
+    def test_end_listing_on_empty_portion(self):
+        # given
+        pagination = Pagination(step=5)
+        pagination.add(*pagination.select_portion(some_items(5)))
+
+        # expect
+        self.assertEqual(5, pagination.next_offset())
+
+        # when
+        pagination.add(*pagination.select_portion([]))
+
+        # then
+        self.assertIsNone(pagination.next_offset())
+
+
+@patch('neptunelib.client.NeptuneAuthenticator', MagicMock())
+@patch('neptunelib.client.SwaggerClient.from_spec')
+@patch('neptunelib.client.load_url')
+class TestSwaggerClients(unittest.TestCase):
+
+    def test_build_swagger_clients_on_first_use(self, load_url, from_spec):
+        # when
+        client = Client('https://app.neptune.ml', a_uuid_string(), instrumentation=MagicMock())
+
+        # then
+        load_url.assert_not_called()
+        from_spec.assert_not_called()
+
+        # when
+        leaderboard_swagger_client = client.leaderboard_swagger_client
+
+        # then
+        self.assertEqual(2, load_url.call_count)
+        from_spec.return_value.api.exchangeApiToken.assert_called_once_with(X_Neptune_Api_Token=client.api_token)
+
+        # when
+        self.assertIs(leaderboard_swagger_client, client.leaderboard_swagger_client)
+        client.backend_swagger_client.api.listProjectsInOrganization(organizationName='neptune-ml')
+
+        # then
+        self.assertEqual(2, load_url.call_count)
+        self.assertEqual(1, from_spec.return_value.api.exchangeApiToken.call_count)
+
+    def test_take_specs_from_cache(self, load_url, _):
+        # given
+        swagger_spec_cache = MagicMock()
+
+        # when
+        client = Client('https://app.neptune.ml', a_uuid_string(), swagger_spec_cache=swagger_spec_cache,
+                        instrumentation=MagicMock())
+        _ = client.backend_swagger_client
+
+        # then
+        swagger_spec_cache.get_spec.assert_called_once_with('https://app.neptune.ml/api/backend/swagger.json',
+                                                            ANY)
+        load_url.assert_not_called()
+
+    def test_fetch_cached_spec_again_when_operation_is_missing(self, _, from_spec):
+        # given
+        swagger_spec_cache = MagicMock()
+        outdated_swagger_client, swagger_client = MagicMock(), MagicMock()
+        outdated_swagger_client.api = MagicMock(spec=[])
+        from_spec.side_effect = [outdated_swagger_client, swagger_client]
+
+        # when
+        client = Client('https://app.neptune.ml', a_uuid_string(), swagger_spec_cache=swagger_spec_cache,
+                        instrumentation=MagicMock())
+        backend_swagger_client = client.backend_swagger_client
+
+        # then
+        self.assertIs(swagger_client, backend_swagger_client)
+        swagger_client.api.exchangeApiToken.assert_called_once_with(X_Neptune_Api_Token=client.api_token)
+        swagger_spec_cache.invalidate.assert_called_once_with('https://app.neptune.ml/api/backend/swagger.json')
+        self.assertEqual(2, swagger_spec_cache.get_spec.call_count)
+
+    def test_fetch_cached_spec_again_when_response_cannot_be_unmarshalled(self, _, from_spec):
+        # given
+        outdated_swagger_client, swagger_client = MagicMock(), MagicMock()
+        list_projects = outdated_swagger_client.api.listProjectsInOrganization
+        list_projects.operation.http_method = 'get'
+        list_projects.return_value.response.side_effect = SwaggerMappingError()
+        from_spec.side_effect = [outdated_swagger_client, swagger_client]
+
+        # and
+        client = Client('https://app.neptune.ml', a_uuid_string(), swagger_spec_cache=MagicMock(),
+                        instrumentation=MagicMock())
+
+        # when
+        projects = client.get_projects('neptune-ml')
+
+        # then
+        result = swagger_client.api.listProjectsInOrganization.return_value.response.return_value.result
+        self.assertIs(result.entries, projects)
+
+    def test_do_not_repeat_non_idempotent_requests_when_response_cannot_be_unmarshalled(self, _, from_spec):
+        # given
+        create_project = from_spec.return_value.api.createProject
+        create_project.operation.http_method = 'post'
+        create_project.return_value.response.side_effect = SwaggerMappingError()
+
+        # and
+        swagger_spec_cache = MagicMock()
+        client = Client('https://app.neptune.ml', a_uuid_string(), swagger_spec_cache=swagger_spec_cache,
+                        instrumentation=MagicMock())
+
+        # expect
+        with self.assertRaises(SwaggerMappingError):
+            client._call(client.backend_swagger_client, 'createProject')  # pylint: disable=protected-access
+        swagger_spec_cache.invalidate.assert_not_called()
+
+
+class TestStreamResponse(unittest.TestCase):
+    # pylint: disable=protected-access
+
+    @patch('neptunelib.client.construct_request', MagicMock())
+    def test_return_raw_response_stream(self):
+        # given
+        client = a_client_with_response(status_code=200)
+
+        # when
+        stream = client.get_channel_points_csv(a_uuid_string(), a_uuid_string())
+
+        # then
+        response = client._http_client.session.send.return_value
+        response.raw.read.return_value = b'1,0.5'
+        self.assertEqual(b'1,0.5', stream.read(5))
+        self.assertTrue(response.raw.decode_content)
+        self.assertEqual(True, client._http_client.session.send.call_args[1]['stream'])
+
+    @patch('neptunelib.client.construct_request', MagicMock())
+    def test_decode_raw_leaderboard_pages(self):
+        # given
+        client = a_client_with_response(status_code=200)
+        client.raw_leaderboard = True
+        response = client._http_client.session.send.return_value
+        response.content = b'{"entries": [{"shortId": "SAL-1"}, {"shortId": "SAL-2"}], "matchingItemCount": 2}'
+
+        # when
+        entries = client.get_leaderboard_entries('neptune-ml', 'Salt-Detection')
+
+        # then
+        self.assertEqual(['SAL-1', 'SAL-2'], [entry.id for entry in entries])
+        self.assertEqual(False, client._http_client.session.send.call_args[1]['stream'])
+        client._swagger_clients['leaderboard'].api.getLeaderboard.assert_not_called()
+
+    @patch('neptunelib.client.construct_request', MagicMock())
+    def test_raise_http_error(self):
+        # given
+        client = a_client_with_response(status_code=404)
+
+        # expect
+        with self.assertRaises(HTTPNotFound):
+            client.get_metrics_csv(a_uuid_string())
+
+
+class TestRequestCaching(unittest.TestCase):
+    # pylint: disable=protected-access
+
+    def test_reuse_cached_results_of_requests(self):
+        # given
+        client = a_client_with_response(status_code=200)
+        client.request_cache = RequestCache()
+        list_projects = client._swagger_clients['backend'].api.listProjectsInOrganization
+
+        # when
+        client.get_projects('neptune-ml')
+        client.get_projects(namespace='neptune-ml')
+
+        # then
+        list_projects.assert_called_once_with(organizationName='neptune-ml')
+        self.assertEqual((1, 1), (client.request_cache.hits, client.request_cache.misses))
+
+    def test_fetch_leaderboard_entries_bypassing_cache(self):
+        # given
+        client = a_client_with_response(status_code=200)
+        client.request_cache = RequestCache()
+        get_leaderboard = client._swagger_clients['leaderboard'].api.getLeaderboard
+        get_leaderboard.return_value.response.return_value.result.entries = []
+
+        # when
+        client.get_leaderboard_entries('neptune-ml', 'Salt-Detection')
+        client.fetch_leaderboard_entries('neptune-ml', 'Salt-Detection')
+        client.get_leaderboard_entries('neptune-ml', 'Salt-Detection')
+
+        # then
+        self.assertEqual(2, get_leaderboard.call_count)
+        self.assertEqual((1, 1), (client.request_cache.hits, client.request_cache.misses))
+
+
+class TestRequestInstrumentation(unittest.TestCase):
+    # pylint: disable=protected-access
+
+    def test_record_requests_of_operations(self):
+        # given
+        client = a_client_with_response(status_code=200)
+        client.instrumentation = Instrumentation()
+        metadata = client._swagger_clients['backend'].api.listProjectsInOrganization.return_value \
+            .response.return_value.metadata
+        metadata.elapsed_time = 0.5
+        metadata.request_elapsed_time = 0.375
+        metadata.incoming_response._delegate.raw.tell.return_value = 1024
+        metadata.incoming_response._delegate.raw.retries.history = [MagicMock()]
+
+        # when
+        client.get_projects('neptune-ml')
+
+        # then
+        request = client.instrumentation.to_dict()['requests']['listProjectsInOrganization']
+        self.assertEqual((1, 0.5, 0.375, 0.125), (request['count'], request['seconds'],
+                                                  request['network_seconds'], request['decode_seconds']))
+        self.assertEqual((1024, 1, 0), (request['bytes_received'], request['retries'], request['errors']))
+
+    @patch('neptunelib.client.construct_request', MagicMock())
+    def test_record_failed_requests(self):
+        # given
+        client = a_client_with_response(status_code=404)
+        client.instrumentation = Instrumentation()
+
+        # when
+        with self.assertRaises(HTTPNotFound):
+            client.get_metrics_csv(a_uuid_string())
+
+        # then
+        self.assertEqual(1, client.instrumentation.to_dict()['requests']['getSystemMetricsCSV']['errors'])
+
+
+def a_client_with_response(status_code):
+    # pylint: disable=protected-access
+    client = Client.__new__(Client)
+    client._swagger_clients = {'backend': MagicMock(), 'leaderboard': MagicMock()}
+    client.raw_leaderboard = False
+    client.request_cache = None
+    client.instrumentation = MagicMock()
+    client._http_client = MagicMock()
+    client._http_client.separate_params.return_value = (MagicMock(), MagicMock())
+    client._http_client.session.send.return_value.status_code = status_code
+    client._http_client.session.send.return_value.text = 'Not found'
+    return client
+
+
+def sort_field_of(sort_params):
+    return [sort_params['sortBy'][0], sort_params['sortFieldType'][0]]
+
+
+def some_items(count):
+    items = []
+    for _ in range(count):
+        item = MagicMock()
+        item.id = a_uuid_string()
+        items.append(item)
+    return items
+
+
+def a_paginated_listing(items, with_item_count=True, item_count=None):
+    def get_portion(limit, offset):
+        portion = MagicMock()
+        portion.entries = items[offset:offset + limit]
+        portion.matchingItemCount = (item_count or len(items)) if with_item_count else None
+        return portion
+
+    return MagicMock(side_effect=get_portion)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import unittest
+from io import StringIO
+
+import numpy as np
+
+from neptunelib.downsampling import StreamingDownsampler, downsample, lttb, minmax, read_downsampled_channel_csv, \
+    stride
+
+
+class TestDownsamplingMethods(unittest.TestCase):
+
+    def setUp(self):
+        super(TestDownsamplingMethods, self).setUp()
+        random = np.random.RandomState(0)
+        self.x = np.arange(1000, dtype=np.float64)
+        self.y = random.uniform(0, 1, size=1000)
+
+    def test_keep_short_series(self):
+        # expect
+        for method in (lttb, minmax, stride):
+            self.assertEqual(list(range(10)), list(method(self.x[:10], self.y[:10], 10)))
+
+    def test_lttb_keeps_first_and_last_points(self):
+        # when
+        indices = lttb(self.x, self.y, 50)
+
+        # then
+        self.assertEqual(50, len(indices))
+        self.assertEqual([0, 999], [indices[0], indices[-1]])
+        self.assertTrue(np.all(np.diff(indices) > 0))
+
+    def test_lttb_picks_largest_triangles(self):
+        # given
+        x = np.arange(7, dtype=np.float64)
+        y = np.array([0, 0, 5, 0, 0, -3, 0], dtype=np.float64)
+
+        # expect
+        self.assertEqual([0, 2, 5, 6], list(lttb(x, y, 4)))
+
+    def test_minmax_keeps_extremes_of_every_bucket(self):
+        # given
+        y = np.array([5, 1, 2, 9, 3, 4, 0, 8, 7, 6], dtype=np.float64)
+
+        # expect
+        self.assertEqual([1, 3, 6, 7], list(minmax(np.arange(10), y, 4)))
+
+    def test_stride(self):
+        # expect
+        self.assertEqual(list(range(0, 1000, 10)), list(stride(self.x, self.y, 100)))
+        self.assertEqual(list(range(0, 1000, 11)), list(stride(self.x, self.y, 99)))
+
+    def test_downsample(self):
+        # when
+        x, y = downsample(self.x, self.y, 100, method='minmax')
+
+        # then
+        self.assertEqual(100, len(x))
+        self.assertEqual(self.y.max(), y.max())
+        self.assertEqual(self.y.min(), y.min())
+
+    def test_reject_unknown_method(self):
+        # expect
+        with self.assertRaises(ValueError):
+            downsample(self.x, self.y, 100, method='average')
+
+    def test_keep_at_most_max_points(self):
+        # expect
+        for method, max_points in [('lttb', 1), ('lttb', 2), ('minmax', 2), ('stride', 1), ('stride', 2)]:
+            self.assertLessEqual(len(downsample(self.x, self.y, max_points, method=method)[0]), max_points)
+
+    def test_reject_single_point_of_minmax(self):
+        # expect
+        with self.assertRaises(ValueError):
+            downsample(self.x, self.y, 1, method='minmax')
+
+    def test_reject_no_points_to_keep(self):
+        # expect
+        for method in ['lttb', 'minmax', 'stride']:
+            with self.assertRaises(ValueError):
+                downsample(self.x, self.y, 0, method=method)
+
+
+class TestStreamingDownsampler(unittest.TestCase):
+
+    def test_keep_extremes_of_whole_series(self):
+        # given
+        random = np.random.RandomState(0)
+        x = np.arange(10000, dtype=np.float64)
+        y = random.uniform(0, 1, size=10000)
+
+        # when
+        downsampler = StreamingDownsampler(100, method='minmax')
+        for start in range(0, 10000, 700):
+            downsampler.add(x[start:start + 700], y[start:start + 700])
+        downsampled_x, downsampled_y = downsampler.result()
+
+        # then
+        self.assertLessEqual(len(downsampled_x), 100)
+        self.assertEqual(y.max(), downsampled_y.max())
+        self.assertEqual(y.min(), downsampled_y.min())
+        self.assertTrue(np.all(np.diff(downsampled_x) > 0))
+
+    def test_lttb_approximates_downsampling_at_once(self):
+        # given
+        x = np.arange(10000, dtype=np.float64)
+        y = np.sin(x / 500)
+
+        # when
+        downsampler = StreamingDownsampler(200, method='lttb')
+        for start in range(0, 10000, 1000):
+            downsampler.add(x[start:start + 1000], y[start:start + 1000])
+        downsampled_x, downsampled_y = downsampler.result()
+
+        # then
+        self.assertEqual(200, len(downsampled_x))
+        self.assertEqual([0, 9999], [downsampled_x[0], downsampled_x[-1]])
+        np.testing.assert_allclose(np.sin(downsampled_x / 500), downsampled_y)
+        self.assertAlmostEqual(1.0, downsampled_y.max(), places=3)
+
+
+class TestReadDownsampledChannelCsv(unittest.TestCase):
+
+    def test_read_in_chunks(self):
+        # given
+        csv = StringIO(u''.join(u'{},{}\n'.format(i, i % 7) for i in range(1000)))
+
+        # when
+        df = read_downsampled_channel_csv(csv, ['x_loss', 'y_loss'], 50, method='stride', chunk_size=100)
+
+        # then
+        self.assertEqual(['x_loss', 'y_loss'], list(df.columns))
+        self.assertLessEqual(len(df), 50)
+        self.assertTrue(np.all(df['y_loss'] == df['x_loss'] % 7))
+
+    def test_read_empty_csv(self):
+        # when
+        df = read_downsampled_channel_csv(StringIO(u''), ['x_loss', 'y_loss'], 50)
+
+        # then
+        self.assertEqual(['x_loss', 'y_loss'], list(df.columns))
+        self.assertEqual(0, len(df))
+
+    def test_reject_no_points_to_keep(self):
+        # given
+        csv = StringIO(u'0,1\n1,2\n')
+
+        # expect
+        with self.assertRaises(ValueError):
+            read_downsampled_channel_csv(csv, ['x_loss', 'y_loss'], 0, method='stride')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,22 +14,36 @@
 # limitations under the License.
 #
 
-from io import StringIO
+from io import BytesIO, StringIO
+import shutil
+import tempfile
 import unittest
 
 from mock import MagicMock
+import numpy as np
 import pandas as pd
 from pandas.util.testing import assert_frame_equal
 
+from neptunelib.channel_cache import ChannelValuesCache
+from neptunelib.exceptions import ChannelValuesFetchError
 from neptunelib.experiment import Experiment
 from tests.neptunelib.random_utils import sort_df_by_columns
 
 
 class TestExperiment(unittest.TestCase):
 
+    def setUp(self):
+        super(TestExperiment, self).setUp()
+        self.cache_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_directory)
+        super(TestExperiment, self).tearDown()
+
     def test_get_numeric_channels_values(self):
         # when
         client = MagicMock()
+        client.channel_values_cache = None
         client.get_channel_points_csv.return_value = StringIO(u'\n'.join(['0.3,2.5', '1,2']))
 
         leaderboard_entry = MagicMock()
@@ -50,6 +64,233 @@ class TestExperiment(unittest.TestCase):
 
         assert_frame_equal(expected_result, result)
 
+    def test_get_numeric_channels_values_of_many_channels(self):
+        # given
+        channels_csv = {
+            'id_batch_loss': u'\n'.join(['1,0.9', '2,0.7', '3,0.4']),
+            'id_epoch_loss': u'\n'.join(['3,0.5']),
+            'id_empty': u''
+        }
+
+        client = MagicMock()
+        client.channel_values_cache = None
+        client.get_channel_points_csv.side_effect = lambda _, channel_id, offset: StringIO(channels_csv[channel_id])
+
+        # and
+        leaderboard_entry = a_leaderboard_entry_mock_with_channels('batch_loss', 'epoch_loss', 'empty')
+
+        # when
+        experiment = Experiment(client, leaderboard_entry)
+        result = experiment.get_numeric_channels_values('batch_loss', 'epoch_loss', 'empty', max_workers=3)
+
+        # then
+        expected_result = pd.DataFrame({'x': [1.0, 2.0, 3.0],
+                                        'batch_loss': [0.9, 0.7, 0.4],
+                                        'epoch_loss': [np.nan, np.nan, 0.5],
+                                        'empty': [np.nan, np.nan, np.nan]}, dtype=float)
+
+        assert_frame_equal(sort_df_by_columns(expected_result), sort_df_by_columns(result))
+
+    def test_report_errors_of_every_failed_channel(self):
+        # given
+        error = IOError()
+
+        client = MagicMock()
+        client.channel_values_cache = None
+        client.get_channel_points_csv.side_effect = \
+            lambda _, channel_id, offset: StringIO(u'1,2') if channel_id == 'id_valid' else raise_(error)
+
+        # and
+        leaderboard_entry = a_leaderboard_entry_mock_with_channels('valid', 'invalid_1', 'invalid_2')
+
+        # when
+        experiment = Experiment(client, leaderboard_entry)
+        with self.assertRaises(ChannelValuesFetchError) as context:
+            experiment.get_numeric_channels_values('valid', 'invalid_1', 'invalid_2')
+
+        # then
+        self.assertEqual({'invalid_1': error, 'invalid_2': error}, context.exception.errors)
+
+    def test_get_numeric_channels_values_from_cache(self):
+        # given
+        client = MagicMock()
+        client.get_channel_points_csv.return_value = StringIO(u'\n'.join(['0.3,2.5', '1,2']))
+        client.supports_channel_points_offset = False
+        client.channel_values_cache = ChannelValuesCache(self.cache_directory)
+
+        # and
+        leaderboard_entry = a_leaderboard_entry_mock_with_channels('epoch_loss')
+        leaderboard_entry.finished = True
+
+        # when
+        experiment = Experiment(client, leaderboard_entry)
+        experiment.get_numeric_channels_values('epoch_loss')
+        result = experiment.get_numeric_channels_values('epoch_loss')
+
+        # then
+        expected_result = pd.DataFrame({'x': [0.3, 1.0],
+                                        'epoch_loss': [2.5, 2.0]}, dtype=float)
+        assert_frame_equal(sort_df_by_columns(expected_result), sort_df_by_columns(result))
+
+        # and
+        client.get_channel_points_csv.assert_called_once_with(0, 'id_epoch_loss', offset=None)
+
+    def test_get_numeric_channels_arrays_memory_mapped(self):
+        # given
+        client = MagicMock()
+        client.get_channel_points_csv.return_value = StringIO(u'\n'.join(['0.3,2.5', '1,2']))
+        client.supports_channel_points_offset = False
+        client.channel_values_cache = ChannelValuesCache(self.cache_directory, mmap=True)
+
+        # and
+        leaderboard_entry = a_leaderboard_entry_mock_with_channels('epoch_loss')
+        leaderboard_entry.finished = True
+
+        # when
+        experiment = Experiment(client, leaderboard_entry)
+        arrays = experiment.get_numeric_channels_arrays('epoch_loss')
+        frames = experiment.get_numeric_channels_frames('epoch_loss')
+
+        # then
+        np.testing.assert_array_equal(np.array([[0.3, 1.0], [2.5, 2.0]]), arrays['epoch_loss'])
+        self.assertTrue(is_memory_mapped(arrays['epoch_loss']))
+
+        # and
+        assert_frame_equal(pd.DataFrame({'x': [0.3, 1.0], 'y': [2.5, 2.0]}), frames['epoch_loss'])
+        self.assertTrue(is_memory_mapped(frames['epoch_loss']['y'].values))
+
+
+    def test_get_downsampled_numeric_channels_values(self):
+        # given
+        client = MagicMock()
+        client.channel_values_cache = None
+        client.get_channel_points_csv.return_value = StringIO(u''.join(
+            u'{},{}\n'.format(x, 1.0 if x == 500 else 0.0) for x in range(1000)))
+
+        # when
+        experiment = Experiment(client, a_leaderboard_entry_mock_with_channels('batch_loss'))
+        result = experiment.get_numeric_channels_values('batch_loss', max_points=10, downsampling='minmax')
+
+        # then
+        self.assertLessEqual(len(result), 10)
+        self.assertEqual(1.0, result['batch_loss'].max())
+        self.assertIn(500.0, list(result['x']))
+
+    def test_downsample_cached_numeric_channels_values(self):
+        # given
+        client = MagicMock()
+        client.get_channel_points_csv.return_value = StringIO(u''.join(
+            u'{},{}\n'.format(x, x) for x in range(100)))
+        client.supports_channel_points_offset = False
+        client.channel_values_cache = ChannelValuesCache(self.cache_directory)
+
+        # and
+        leaderboard_entry = a_leaderboard_entry_mock_with_channels('batch_loss')
+        leaderboard_entry.finished = True
+
+        # when
+        experiment = Experiment(client, leaderboard_entry)
+        frames = experiment.get_numeric_channels_frames('batch_loss', max_points=10, downsampling='stride')
+
+        # then
+        expected_values = np.arange(0, 100, 10, dtype=float)
+        assert_frame_equal(pd.DataFrame({'x': expected_values, 'y': expected_values}), frames['batch_loss'])
+
+    def test_reject_unknown_downsampling_method(self):
+        # given
+        experiment = Experiment(MagicMock(), a_leaderboard_entry_mock_with_channels('batch_loss'))
+
+        # expect
+        with self.assertRaises(ValueError):
+            experiment.get_numeric_channels_values('batch_loss', max_points=10, downsampling='average')
+
+    def test_iter_channel_values(self):
+        # given
+        client = MagicMock()
+        client.get_channel_points_csv.return_value = StringIO(u''.join(
+            u'{},{}\n'.format(x, 2 * x) for x in range(5)))
+
+        # when
+        experiment = Experiment(client, a_leaderboard_entry_mock_with_channels('batch_loss'))
+        chunks = list(experiment.iter_channel_values('batch_loss', chunk_size=2))
+
+        # then
+        self.assertEqual([2, 2, 1], [len(chunk) for chunk in chunks])
+        expected_values = np.arange(5, dtype=float)
+        assert_frame_equal(pd.DataFrame({'x': expected_values, 'y': 2 * expected_values}), pd.concat(chunks))
+        client.get_channel_points_csv.assert_called_once_with(0, 'id_batch_loss')
+
+    def test_iter_empty_channel_values(self):
+        # given
+        client = MagicMock()
+        client.get_channel_points_csv.return_value = StringIO(u'')
+
+        # when
+        experiment = Experiment(client, a_leaderboard_entry_mock_with_channels('batch_loss'))
+
+        # then
+        self.assertEqual([], list(experiment.iter_channel_values('batch_loss')))
+
+    def test_close_channel_csv_when_iteration_is_abandoned(self):
+        # given
+        csv = MagicMock(wraps=StringIO(u''.join(u'{},{}\n'.format(x, x) for x in range(10))))
+        client = MagicMock()
+        client.get_channel_points_csv.return_value = csv
+
+        # when
+        experiment = Experiment(client, a_leaderboard_entry_mock_with_channels('batch_loss'))
+        chunks = experiment.iter_channel_values('batch_loss', chunk_size=2)
+        next(chunks)
+        chunks.close()
+
+        # then
+        csv.close.assert_called_once_with()
+
+    def test_get_compact_hardware_utilization(self):
+        # given
+        client = MagicMock()
+        client.get_metrics_csv.return_value = BytesIO(b'x_ram,y_ram,x_cpu,y_cpu\n0,1.5,0,10\n5000,2.5,5000,20')
+
+        # when
+        experiment = Experiment(client, a_leaderboard_entry_mock_with_channels())
+        utilization = experiment.get_hardware_utilization(compact=True, interval=10, aggregation='max')
+
+        # then
+        expected_utilization = pd.DataFrame({'ram': [2.5], 'cpu': [20.0]}, index=pd.Index([0.0], name='x'),
+                                            columns=['ram', 'cpu'], dtype=np.float32)
+        assert_frame_equal(expected_utilization, utilization)
+
+    def test_reject_resampling_of_not_compact_hardware_utilization(self):
+        # given
+        experiment = Experiment(MagicMock(), a_leaderboard_entry_mock_with_channels())
+
+        # expect
+        with self.assertRaises(ValueError):
+            experiment.get_hardware_utilization(interval=10)
+
+
+def a_leaderboard_entry_mock_with_channels(*channel_names):
+    leaderboard_entry = MagicMock()
+    leaderboard_entry.internal_id = 0
+    leaderboard_entry.channels_dict_by_name = {}
+    for channel_name in channel_names:
+        channel = MagicMock()
+        channel.id = 'id_' + channel_name
+        leaderboard_entry.channels_dict_by_name[channel_name] = channel
+    return leaderboard_entry
+
+
+def is_memory_mapped(array):
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = getattr(array, 'base', None)
+    return False
+
+
+def raise_(error):
+    raise error
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,92 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from io import BytesIO
+import unittest
+
+import numpy as np
+import pandas as pd
+from pandas.util.testing import assert_frame_equal
+
+from neptunelib.hardware_utilization import read_hardware_utilization, resample_hardware_utilization
+
+METRICS_CSV = b'\n'.join([
+    b'x_ram,y_ram,x_cpu,y_cpu',
+    b'0,1.5,0,10',
+    b'5000,2.5,6000,20',
+    b'12000,3.5,,'
+])
+
+
+class TestHardwareUtilization(unittest.TestCase):
+
+    def test_read_hardware_utilization(self):
+        # when
+        utilization = read_hardware_utilization(BytesIO(METRICS_CSV))
+
+        # then
+        expected_utilization = pd.DataFrame({
+            'ram': [1.5, 2.5, np.nan, 3.5],
+            'cpu': [10.0, np.nan, 20.0, np.nan]
+        }, index=pd.Index([0.0, 5000.0, 6000.0, 12000.0], name='x'), columns=['ram', 'cpu'], dtype=np.float32)
+        assert_frame_equal(expected_utilization, utilization)
+
+    def test_read_empty_hardware_utilization(self):
+        # when
+        utilization = read_hardware_utilization(b'')
+
+        # then
+        self.assertTrue(utilization.empty)
+        self.assertEqual('x', utilization.index.name)
+
+    def test_resample_hardware_utilization(self):
+        # given
+        utilization = read_hardware_utilization(METRICS_CSV)
+
+        # when
+        resampled = resample_hardware_utilization(utilization, interval=10, aggregation='max')
+
+        # then
+        expected_resampled = pd.DataFrame({
+            'ram': [2.5, 3.5],
+            'cpu': [20.0, np.nan]
+        }, index=pd.Index([0.0, 10000.0], name='x'), columns=['ram', 'cpu'], dtype=np.float32)
+        assert_frame_equal(expected_resampled, resampled)
+
+    def test_resample_hardware_utilization_with_many_aggregations(self):
+        # given
+        utilization = read_hardware_utilization(METRICS_CSV)
+
+        # when
+        resampled = resample_hardware_utilization(utilization, interval=10, aggregation=['mean', 'max'])
+
+        # then
+        self.assertEqual([('ram', 'mean'), ('ram', 'max'), ('cpu', 'mean'), ('cpu', 'max')], list(resampled.columns))
+        self.assertEqual([2.0, 3.5], list(resampled[('ram', 'mean')]))
+
+    def test_reject_invalid_resampling(self):
+        # given
+        utilization = read_hardware_utilization(METRICS_CSV)
+
+        # expect
+        with self.assertRaises(ValueError):
+            resample_hardware_utilization(utilization, interval=0)
+        with self.assertRaises(ValueError):
+            resample_hardware_utilization(utilization, interval=10, aggregation='sum')
+
+
+if __name__ == '__main__':
+    unittest.main()
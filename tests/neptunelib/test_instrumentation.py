@@ -0,0 +1,164 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import io
+import unittest
+
+from mock import MagicMock
+
+from neptunelib.instrumentation import Instrumentation, MeteredStream
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_aggregate_requests_by_operation(self):
+        # given
+        instrumentation = Instrumentation()
+
+        # when
+        instrumentation.record_request('getLeaderboard', 2.0, network_seconds=1.5, decode_seconds=0.5,
+                                       bytes_received=100, retries=1)
+        instrumentation.record_request('getLeaderboard', 1.0, network_seconds=0.5, decode_seconds=0.5,
+                                       bytes_received=50, error=True)
+        instrumentation.record_request('listProjectMembers', 0.5)
+
+        # then
+        requests = instrumentation.to_dict()['requests']
+        self.assertEqual({
+            'count': 2,
+            'seconds': 3.0,
+            'max_seconds': 2.0,
+            'network_seconds': 2.0,
+            'decode_seconds': 1.0,
+            'bytes_received': 150,
+            'retries': 1,
+            'errors': 1
+        }, requests['getLeaderboard'])
+        self.assertEqual(1, requests['listProjectMembers']['count'])
+
+    def test_time_processing_steps(self):
+        # given
+        instrumentation = Instrumentation()
+
+        # when
+        with instrumentation.timed('leaderboard_dataframe'):
+            pass
+        instrumentation.record_processing('leaderboard_dataframe', 1.0)
+
+        # then
+        processing = instrumentation.to_dict()['processing']['leaderboard_dataframe']
+        self.assertEqual(2, processing['count'])
+        self.assertEqual(1.0, processing['max_seconds'])
+        self.assertGreaterEqual(processing['seconds'], 1.0)
+
+    def test_time_failed_processing_steps(self):
+        # given
+        instrumentation = Instrumentation()
+
+        # expect
+        with self.assertRaises(KeyError):
+            with instrumentation.timed('channels_dataframe'):
+                raise KeyError()
+        self.assertEqual(1, instrumentation.to_dict()['processing']['channels_dataframe']['count'])
+
+    def test_notify_callbacks(self):
+        # given
+        callback = MagicMock()
+        instrumentation = Instrumentation(callbacks=[callback])
+
+        # when
+        instrumentation.record_request('getLeaderboard', 1.0, bytes_received=10)
+        instrumentation.record_processing('align_channels', 0.5)
+
+        # then
+        self.assertEqual('request', callback.call_args_list[0][0][0]['kind'])
+        self.assertEqual(10, callback.call_args_list[0][0][0]['bytes_received'])
+        self.assertEqual(dict(kind='processing', name='align_channels', seconds=0.5), callback.call_args[0][0])
+
+    def test_reset(self):
+        # given
+        instrumentation = Instrumentation()
+        instrumentation.record_request('getLeaderboard', 1.0)
+        instrumentation.record_processing('align_channels', 0.5)
+
+        # when
+        instrumentation.reset()
+
+        # then
+        self.assertEqual({'requests': {}, 'processing': {}}, instrumentation.to_dict())
+
+
+class TestMeteredStream(unittest.TestCase):
+
+    def test_record_request_once_closed(self):
+        # given
+        instrumentation = Instrumentation()
+        raw = io.BytesIO(b'x,y\n1,2\n')
+        stream = MeteredStream(raw, instrumentation, 'getChannelValuesCSV', start=0.0, network_seconds=0.0,
+                               retries=2)
+
+        # when
+        data = stream.read(4) + stream.read()
+
+        # then
+        self.assertEqual(b'x,y\n1,2\n', data)
+        self.assertEqual({}, instrumentation.to_dict()['requests'])
+
+        # when
+        stream.close()
+        stream.close()
+
+        # then
+        request = instrumentation.to_dict()['requests']['getChannelValuesCSV']
+        self.assertEqual(1, request['count'])
+        self.assertEqual(2, request['retries'])
+        self.assertTrue(stream.closed)
+
+    def test_count_received_bytes_before_decompression(self):
+        # given
+        instrumentation = Instrumentation()
+        raw = MagicMock()
+        raw.read.return_value = b'decompressed body'
+        raw.tell.return_value = 5
+        stream = MeteredStream(raw, instrumentation, 'getChannelValuesCSV', start=0.0, network_seconds=0.0,
+                               retries=0)
+
+        # when
+        stream.read()
+        stream.close()
+
+        # then
+        self.assertEqual(5, instrumentation.to_dict()['requests']['getChannelValuesCSV']['bytes_received'])
+
+    def test_count_read_bytes_when_stream_cannot_tell(self):
+        # given
+        instrumentation = Instrumentation()
+        raw = MagicMock()
+        raw.read.return_value = b'body'
+        raw.tell.side_effect = IOError()
+        stream = MeteredStream(raw, instrumentation, 'getChannelValuesCSV', start=0.0, network_seconds=0.0,
+                               retries=0)
+
+        # when
+        stream.read()
+        stream.close()
+
+        # then
+        self.assertEqual(4, instrumentation.to_dict()['requests']['getChannelValuesCSV']['bytes_received'])
+
+
+if __name__ == '__main__':
+    unittest.main()
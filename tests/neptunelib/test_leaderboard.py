@@ -0,0 +1,173 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import unittest
+
+import numpy as np
+
+from neptunelib.leaderboard import LeaderboardDataFrameBuilder, leaderboard_column_names
+from neptunelib.model import LeaderboardEntry
+from tests.neptunelib.api_objects_factory import a_channel_value, an_experiment_leaderboard_entry_dto
+
+
+class TestLeaderboardDataFrameBuilder(unittest.TestCase):
+
+    def test_numeric_channels_as_float(self):
+        # given
+        entry_dto = an_experiment_leaderboard_entry_dto()
+
+        # when
+        df = LeaderboardDataFrameBuilder().add_all([LeaderboardEntry(entry_dto)]).build()
+
+        # then
+        for channel_dto in entry_dto.channelsLastValues:
+            column = df['channel_' + channel_dto.channelName]
+            self.assertEqual(np.float64, column.dtype)
+            self.assertEqual(float(channel_dto.y), column[0])
+
+    def test_text_channels_as_trimmed_objects(self):
+        # given
+        text_channel_dto = a_channel_value()
+        text_channel_dto.channelType = 'text'
+        text_channel_dto.y = 'a' * 300
+
+        # and
+        entry_dto = an_experiment_leaderboard_entry_dto()
+        entry_dto.channelsLastValues = [text_channel_dto]
+
+        # when
+        df = LeaderboardDataFrameBuilder().add_all([LeaderboardEntry(entry_dto)]).build()
+
+        # then
+        column = df['channel_' + text_channel_dto.channelName]
+        self.assertEqual(np.object_, column.dtype)
+        self.assertEqual('a' * 255, column[0])
+
+    def test_image_channels_as_objects(self):
+        # given
+        image_channel_dto = a_channel_value()
+        image_channel_dto.channelType = 'image'
+        image_channel_dto.y = '{"name": "mask", "url": "https://neptune.ml/mask.png"}'
+
+        # and
+        entry_dto = an_experiment_leaderboard_entry_dto()
+        entry_dto.channelsLastValues = [image_channel_dto]
+
+        # when
+        df = LeaderboardDataFrameBuilder().add_all([LeaderboardEntry(entry_dto)]).build()
+
+        # then
+        column = df['channel_' + image_channel_dto.channelName]
+        self.assertEqual(np.object_, column.dtype)
+        self.assertEqual(image_channel_dto.y, column[0])
+
+    def test_fill_missing_cells_with_nan(self):
+        # given
+        entry_dtos = [an_experiment_leaderboard_entry_dto(), an_experiment_leaderboard_entry_dto()]
+
+        # when
+        df = LeaderboardDataFrameBuilder(first_row_index=10).add_all(
+            [LeaderboardEntry(dto) for dto in entry_dtos]).build()
+
+        # then
+        self.assertEqual([10, 11], list(df.index))
+
+        # and
+        first_parameter = entry_dtos[0].parameters[0]
+        self.assertEqual(first_parameter.value, df['parameter_' + first_parameter.name][10])
+        self.assertTrue(np.isnan(df['parameter_' + first_parameter.name][11]))
+
+        # and
+        last_property = entry_dtos[1].properties[-1]
+        self.assertTrue(np.isnan(df['property_' + last_property.key][10]))
+        self.assertEqual(last_property.value, df['property_' + last_property.key][11])
+
+    def test_select_columns(self):
+        # given
+        entry_dto = an_experiment_leaderboard_entry_dto()
+
+        # when
+        df = LeaderboardDataFrameBuilder().add_all([LeaderboardEntry(entry_dto)]).build(['owner', 'id'])
+
+        # then
+        self.assertEqual(['owner', 'id'], list(df.columns))
+        self.assertEqual(entry_dto.shortId, df['id'][0])
+
+    def test_collect_only_selected_columns(self):
+        # given
+        entry_dto = an_experiment_leaderboard_entry_dto()
+        channel_dto, parameter_dto = entry_dto.channelsLastValues[0], entry_dto.parameters[0]
+        column_names = ['id', 'owner', 'channel_' + channel_dto.channelName, 'parameter_' + parameter_dto.name]
+
+        # when
+        builder = LeaderboardDataFrameBuilder(column_names=column_names).add_all([LeaderboardEntry(entry_dto)])
+        df = builder.build()
+
+        # then
+        self.assertEqual(column_names, list(df.columns))
+        self.assertEqual(column_names, builder.column_names)
+        self.assertEqual(float(channel_dto.y), df['channel_' + channel_dto.channelName][0])
+        self.assertEqual(parameter_dto.value, df['parameter_' + parameter_dto.name][0])
+        self.assertEqual(entry_dto.owner, df['owner'][0])
+
+    def test_fill_selected_columns_missing_in_all_entries_with_nan(self):
+        # given
+        entry_dtos = [an_experiment_leaderboard_entry_dto(), an_experiment_leaderboard_entry_dto()]
+
+        # when
+        df = LeaderboardDataFrameBuilder(column_names=['id', 'channel_missing', 'property_missing']).add_all(
+            [LeaderboardEntry(dto) for dto in entry_dtos]).build()
+
+        # then
+        self.assertEqual(np.float64, df['channel_missing'].dtype)
+        self.assertTrue(df['channel_missing'].isnull().all())
+        self.assertTrue(df['property_missing'].isnull().all())
+
+    def test_keep_selected_text_channels_as_objects(self):
+        # given
+        text_channel_dto = a_channel_value()
+        text_channel_dto.channelType = 'text'
+
+        # and
+        entry_dto = an_experiment_leaderboard_entry_dto()
+        entry_dto.channelsLastValues = [text_channel_dto]
+
+        # when
+        df = LeaderboardDataFrameBuilder(column_names=['channel_' + text_channel_dto.channelName]).add_all(
+            [LeaderboardEntry(entry_dto)]).build()
+
+        # then
+        self.assertEqual(np.object_, df['channel_' + text_channel_dto.channelName].dtype)
+
+
+class TestLeaderboardColumnNames(unittest.TestCase):
+
+    def test_pick_all_columns_without_selectors(self):
+        # expect
+        self.assertIsNone(leaderboard_column_names())
+
+    def test_pick_columns_of_all_selectors(self):
+        # when
+        column_names = leaderboard_column_names(columns=['name', 'parameter_lr'], parameters=['lr', 'batch_size'],
+                                                channels='loss', properties=['data'])
+
+        # then
+        self.assertEqual(['id', 'name', 'parameter_lr', 'parameter_batch_size', 'channel_loss', 'property_data'],
+                         column_names)
+
+
+if __name__ == '__main__':
+    unittest.main()
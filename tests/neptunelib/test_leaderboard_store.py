@@ -0,0 +1,112 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from neptunelib.leaderboard_store import LeaderboardStore
+from neptunelib.model import LeaderboardEntry
+from tests.neptunelib.api_objects_factory import an_experiment_leaderboard_entry_dto
+
+
+class TestLeaderboardStore(unittest.TestCase):
+
+    def setUp(self):
+        super(TestLeaderboardStore, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'leaderboard.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        super(TestLeaderboardStore, self).tearDown()
+
+    def test_load_saved_entries(self):
+        # given
+        entries = [LeaderboardEntry(an_experiment_leaderboard_entry_dto()) for _ in range(3)]
+
+        # when
+        with LeaderboardStore(self.path, 'namespace/project') as store:
+            store.save(entries)
+        with LeaderboardStore(self.path, 'namespace/project') as store:
+            loaded_entries = store.load()
+
+        # then
+        expected_entries = sorted(entries, key=lambda e: (e.system_properties['created'], e.id))
+        self.assertEqual([e.id for e in expected_entries], [e.id for e in loaded_entries])
+        for expected_entry, loaded_entry in zip(expected_entries, loaded_entries):
+            self.assertEqual(expected_entry.internal_id, loaded_entry.internal_id)
+            self.assertEqual(expected_entry.state, loaded_entry.state)
+            self.assertEqual(expected_entry.system_properties, loaded_entry.system_properties)
+            self.assertEqual(expected_entry.parameters, loaded_entry.parameters)
+            self.assertEqual(expected_entry.properties, loaded_entry.properties)
+            self.assertEqual([(c.id, c.name, c.type, c.x, c.y) for c in expected_entry.channels],
+                             [(c.id, c.name, c.type, c.x, c.y) for c in loaded_entry.channels])
+
+    def test_store_entries_as_json(self):
+        # given
+        entry = LeaderboardEntry(an_experiment_leaderboard_entry_dto())
+
+        # when
+        with LeaderboardStore(self.path, 'namespace/project') as store:
+            store.save([entry])
+
+        # then
+        connection = sqlite3.connect(self.path)
+        self.addCleanup(connection.close)
+        stored_entry = json.loads(connection.execute('SELECT entry FROM leaderboard_entries').fetchone()[0])
+        self.assertEqual(entry.id, stored_entry['shortId'])
+        self.assertEqual(entry.system_properties['created'].isoformat(), stored_entry['timeOfCreation'])
+
+    def test_replace_and_remove_entries(self):
+        # given
+        entry_dtos = [an_experiment_leaderboard_entry_dto() for _ in range(3)]
+        entry_dtos[0].state = 'running'
+        entry_dtos[1].state = 'running'
+
+        # and
+        store = LeaderboardStore(self.path, 'namespace/project')
+        store.save([LeaderboardEntry(dto) for dto in entry_dtos])
+
+        # when
+        entry_dtos[0].state = 'succeeded'
+        store.save([LeaderboardEntry(entry_dtos[0])])
+        store.remove([entry_dtos[2].shortId])
+
+        # then
+        self.assertEqual({entry_dtos[0].shortId, entry_dtos[1].shortId}, store.ids())
+        self.assertEqual([entry_dtos[1].shortId], store.unfinished_ids())
+        store.close()
+
+    def test_keep_projects_apart(self):
+        # given
+        entry = LeaderboardEntry(an_experiment_leaderboard_entry_dto())
+
+        # when
+        with LeaderboardStore(self.path, 'namespace/project') as store:
+            store.save([entry])
+
+        # then
+        with LeaderboardStore(self.path, 'namespace/other-project') as store:
+            self.assertEqual(set(), store.ids())
+            self.assertEqual([], store.load())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import unittest
+from datetime import datetime
+
+from dateutil.tz import tzutc
+from mock import MagicMock, patch
+
+from neptunelib.model import ChannelWithLastValue, DictDto, LeaderboardEntry, leaderboard_page_from_json, loads_json
+from tests.neptunelib.api_objects_factory import a_channel_value, an_experiment_leaderboard_entry_dto
+
+
+class TestChannelWithLastValue(unittest.TestCase):
+
+    def test_copy_dto_fields(self):
+        # given
+        channel_dto = a_channel_value()
+
+        # when
+        channel = ChannelWithLastValue(channel_dto)
+
+        # then
+        self.assertEqual(
+            (channel_dto.channelId, channel_dto.channelName, channel_dto.channelType, channel_dto.x, channel_dto.y),
+            (channel.id, channel.name, channel.type, channel.x, channel.y))
+        self.assertIs(channel_dto, channel.channel_with_value_dto)
+
+    def test_trim_text_values(self):
+        # given
+        channel_dto = a_channel_value()
+        channel_dto.channelType = 'text'
+        channel_dto.y = 'a' * 300
+
+        # expect
+        self.assertEqual('a' * 255, ChannelWithLastValue(channel_dto).trimmed_y)
+
+
+class TestLeaderboardEntry(unittest.TestCase):
+
+    def setUp(self):
+        super(TestLeaderboardEntry, self).setUp()
+        self.entry_dto = an_experiment_leaderboard_entry_dto()
+        self.entry = LeaderboardEntry(self.entry_dto)
+
+    def test_views(self):
+        # expect
+        self.assertEqual(self.entry_dto.shortId, self.entry.system_properties['id'])
+        self.assertEqual([ch.channelId for ch in self.entry_dto.channelsLastValues],
+                         [ch.id for ch in self.entry.channels])
+        self.assertEqual(dict((p.name, p.value) for p in self.entry_dto.parameters), self.entry.parameters)
+        self.assertEqual(dict((p.key, p.value) for p in self.entry_dto.properties), self.entry.properties)
+
+    def test_reuse_computed_views(self):
+        # expect
+        self.assertIs(self.entry.system_properties, self.entry.system_properties)
+        self.assertIs(self.entry.channels, self.entry.channels)
+        self.assertIs(self.entry.channels_dict_by_name, self.entry.channels_dict_by_name)
+        self.assertIs(self.entry.parameters, self.entry.parameters)
+        self.assertIs(self.entry.properties, self.entry.properties)
+
+    def test_channels_dict_by_name_reuses_channels(self):
+        # when
+        channels_dict_by_name = self.entry.channels_dict_by_name
+
+        # then
+        for channel in self.entry.channels:
+            self.assertIs(channel, channels_dict_by_name[channel.name])
+
+
+class TestLeaderboardPageFromJson(unittest.TestCase):
+
+    def test_decode_entries(self):
+        # given
+        body = json.dumps({
+            'entries': [{
+                'id': 'a8c9f3e2', 'shortId': 'SAL-1', 'state': 'succeeded', 'runningTime': 3600,
+                'timeOfCreation': '2019-01-01T10:00:00.123Z', 'timeOfCompletion': '2019-01-01T11:00:00+02:00',
+                'tags': ['unet'],
+                'parameters': [{'name': 'lr', 'value': '0.01', 'parameterType': 'double'}],
+                'properties': [{'key': 'seed', 'value': '7'}],
+                'channelsLastValues': [{'channelId': 'c1', 'channelName': 'loss', 'channelType': 'numeric',
+                                        'x': 9.0, 'y': '0.25'}]
+            }],
+            'matchingItemCount': 1
+        }).encode('utf-8')
+
+        # when
+        page = leaderboard_page_from_json(body)
+        entry = LeaderboardEntry(page.entries[0])
+
+        # then
+        self.assertEqual(1, page.matchingItemCount)
+        self.assertEqual(('SAL-1', 'a8c9f3e2', True), (entry.id, entry.internal_id, entry.finished))
+        self.assertEqual(datetime(2019, 1, 1, 10, 0, 0, 123000, tzinfo=tzutc()), entry.system_properties['created'])
+        self.assertEqual(datetime(2019, 1, 1, 9, 0, tzinfo=tzutc()), entry.system_properties['finished'])
+        self.assertEqual(3600, entry.system_properties['running_time'])
+        self.assertEqual(['unet'], entry.system_properties['tags'])
+        self.assertEqual({'lr': '0.01'}, entry.parameters)
+        self.assertEqual({'seed': '7'}, entry.properties)
+        self.assertEqual(('c1', 'loss', 9.0, '0.25'), (entry.channels[0].id, entry.channels[0].name,
+                                                       entry.channels[0].x, entry.channels[0].y))
+
+    def test_missing_fields_are_none(self):
+        # when
+        page = leaderboard_page_from_json(b'{"entries": [{"shortId": "SAL-1"}]}')
+        entry = LeaderboardEntry(page.entries[0])
+
+        # then
+        self.assertIsNone(page.matchingItemCount)
+        self.assertIsNone(entry.system_properties['finished'])
+        self.assertIsNone(entry.system_properties['git_hash'])
+        self.assertEqual({}, entry.parameters)
+        self.assertEqual([], entry.channels)
+
+    @patch('neptunelib.model._orjson_loads', None)
+    @patch('neptunelib.model.json')
+    def test_decode_bytes_to_text_without_orjson(self, json_module):
+        # given
+        json_module.loads = MagicMock(return_value={})
+
+        # when
+        loads_json(u'{"name": "\u017c\xf3\u0142w"}'.encode('utf-8'))
+
+        # then
+        json_module.loads.assert_called_once_with(u'{"name": "\u017c\xf3\u0142w"}')
+
+    def test_dict_dto_does_not_make_up_special_attributes(self):
+        # expect
+        self.assertFalse(hasattr(DictDto.of({}), '__length_hint__'))
+
+
+if __name__ == '__main__':
+    unittest.main()
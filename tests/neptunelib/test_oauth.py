@@ -14,6 +14,7 @@
 # limitations under the License.
 #
 
+import threading
 import time
 import unittest
 
@@ -79,6 +80,124 @@ class TestNeptuneAuth(unittest.TestCase):
         self.assertEqual(self.updated_body, updated_request.body)
 
 
+class TestNeptuneAuthTokenRefresh(unittest.TestCase):
+    # pylint: disable=protected-access
+
+    def setUp(self):
+        super(TestNeptuneAuthTokenRefresh, self).setUp()
+        self.session = MagicMock()
+        self.session._client.add_token.side_effect = lambda url, http_method, body, headers: (url, headers, body)
+        self.refreshed = threading.Event()
+        self.now = time.time()
+        time_patcher = patch('neptunelib.oauth.time')
+        time_patcher.start().time.side_effect = lambda: self.now
+        self.addCleanup(time_patcher.stop)
+
+    def test_keep_valid_token(self):
+        # given
+        self.session.token = {'access_token': an_access_token(expires_at=self.now + 3600)}
+        neptune_auth = NeptuneAuth(self.session)
+
+        # when
+        neptune_auth(a_request())
+        self.now += 3500
+
+        # and
+        neptune_auth(a_request())
+
+        # then
+        self.session.refresh_token.assert_not_called()
+
+    def test_refresh_expiring_token_in_background(self):
+        # given
+        self.session.token = {'access_token': an_access_token(expires_at=self.now + 3600)}
+        release_refresh = threading.Event()
+        self.session.refresh_token.side_effect = self.a_refresh(before=release_refresh.wait)
+        neptune_auth = NeptuneAuth(self.session)
+        neptune_auth(a_request())
+
+        # when
+        self.now += 3590
+        neptune_auth(a_request())
+        neptune_auth(a_request())
+
+        # then
+        self.assertEqual(3, self.session._client.add_token.call_count)
+        self.assertFalse(self.refreshed.is_set())
+
+        # when
+        release_refresh.set()
+
+        # then
+        self.assertTrue(self.refreshed.wait(5))
+        neptune_auth(a_request())
+        self.session.refresh_token.assert_called_once_with(self.session.auto_refresh_url)
+
+    def test_refresh_short_living_tokens_halfway(self):
+        # given
+        self.session.token = {'access_token': an_access_token(expires_at=self.now + 10)}
+        self.session.refresh_token.side_effect = self.a_refresh(before=lambda: None)
+        neptune_auth = NeptuneAuth(self.session, expiration_margin=30)
+        neptune_auth(a_request())
+
+        # when
+        self.now += 4
+        neptune_auth(a_request())
+
+        # then
+        self.session.refresh_token.assert_not_called()
+
+        # when
+        self.now += 2
+        neptune_auth(a_request())
+
+        # then
+        self.assertTrue(self.refreshed.wait(5))
+
+    def test_refresh_expired_token_once_for_concurrent_requests(self):
+        # given
+        self.session.token = {'access_token': an_access_token(expires_at=self.now - 1)}
+        self.session.refresh_token.side_effect = self.a_refresh(before=lambda: time.sleep(0.1))
+        neptune_auth = NeptuneAuth(self.session)
+
+        # when
+        threads = [threading.Thread(target=neptune_auth, args=(a_request(),)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # then
+        self.session.refresh_token.assert_called_once_with(self.session.auto_refresh_url)
+        self.assertEqual(8, self.session._client.add_token.call_count)
+
+    def test_postpone_failed_background_refresh(self):
+        # given
+        self.session.token = {'access_token': an_access_token(expires_at=self.now + 3600)}
+        self.session.refresh_token.side_effect = IOError()
+        neptune_auth = NeptuneAuth(self.session)
+        neptune_auth(a_request())
+
+        # when
+        self.now += 3590
+        neptune_auth(a_request())
+        while neptune_auth._refreshing_in_background:
+            time.sleep(0.01)
+        neptune_auth(a_request())
+
+        # then
+        self.assertEqual(1, self.session.refresh_token.call_count)
+        self.assertEqual(3, self.session._client.add_token.call_count)
+
+    def a_refresh(self, before):
+        def refresh(_):
+            before()
+            self.session.token = {'access_token': an_access_token(expires_at=self.now + 3600)}
+            self.refreshed.set()
+
+        return refresh
+
+
 class TestNeptuneAuthenticator(unittest.TestCase):
 
     @patch('neptunelib.oauth.OAuth2Session')
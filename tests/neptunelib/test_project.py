@@ -14,17 +14,27 @@
 # limitations under the License.
 #
 
+import os
+import shutil
+import tempfile
 import unittest
+from io import BytesIO, StringIO
 from random import randint
 
+import numpy as np
 import pandas as pd
 from mock import MagicMock
+from pandas.util.testing import assert_frame_equal
 
+from neptunelib.client import DEFAULT_LEADERBOARD_PAGE_SIZE, DEFAULT_MAX_WORKERS
+from neptunelib.exceptions import ChannelValuesFetchError, HardwareUtilizationFetchError
 from neptunelib.experiment import Experiment
+from neptunelib.leaderboard_store import LeaderboardStore
 from neptunelib.model import LeaderboardEntry
 from neptunelib.project import Project
-from tests.neptunelib.api_objects_factory import a_group_leaderboard_entry_dto, a_registered_project_member, \
-    an_invited_project_member
+from neptunelib.query import Column, parameter
+from tests.neptunelib.api_objects_factory import a_channel_value, a_group_leaderboard_entry_dto, \
+    a_registered_project_member, an_experiment_leaderboard_entry_dto, an_invited_project_member
 from tests.neptunelib.project_test_fixture import some_exp_entry_dto, some_exp_entry_row, some_grp_entry_dto, \
     some_grp_entry_row
 from tests.neptunelib.random_utils import a_string, a_string_list, a_uuid_string
@@ -34,6 +44,7 @@ class TestProject(unittest.TestCase):
     def setUp(self):
         super(TestProject, self).setUp()
         self.client = MagicMock()
+        self.client.channel_values_cache = None
         self.project = Project(client=self.client, internal_id=a_uuid_string(), namespace=a_string(), name=a_string())
 
     def test_get_members(self):
@@ -66,7 +77,9 @@ class TestProject(unittest.TestCase):
             namespace=self.project.namespace, project_name=self.project.name,
             ids=None, group_ids=None,
             states=None, owners=None, tags=None,
-            min_running_time=None)
+            min_running_time=None,
+            sort_by='id', ascending=True, limit=None,
+            page_size=DEFAULT_LEADERBOARD_PAGE_SIZE, max_workers=DEFAULT_MAX_WORKERS)
 
         # and
         expected_experiments = [Experiment(self.client, entry) for entry in leaderboard_entries]
@@ -91,7 +104,9 @@ class TestProject(unittest.TestCase):
             namespace=self.project.namespace, project_name=self.project.name,
             ids=[params['id']], group_ids=[params['group']],
             states=[params['state']], owners=[params['owner']], tags=[params['tag']],
-            min_running_time=params['min_running_time']
+            min_running_time=params['min_running_time'],
+            sort_by='id', ascending=True, limit=None,
+            page_size=DEFAULT_LEADERBOARD_PAGE_SIZE, max_workers=DEFAULT_MAX_WORKERS
         )
         self.client.get_leaderboard_entries.assert_called_once_with(**expected_params)
 
@@ -118,7 +133,9 @@ class TestProject(unittest.TestCase):
             namespace=self.project.namespace, project_name=self.project.name,
             ids=params['id'], group_ids=params['group'],
             states=params['state'], owners=params['owner'], tags=params['tag'],
-            min_running_time=params['min_running_time']
+            min_running_time=params['min_running_time'],
+            sort_by='id', ascending=True, limit=None,
+            page_size=DEFAULT_LEADERBOARD_PAGE_SIZE, max_workers=DEFAULT_MAX_WORKERS
         )
         self.client.get_leaderboard_entries.assert_called_once_with(**expected_params)
 
@@ -126,6 +143,39 @@ class TestProject(unittest.TestCase):
         expected_experiments = [Experiment(self.client, entry) for entry in leaderboard_entries]
         self.assertEqual(expected_experiments, experiments)
 
+    def test_get_experiments_with_query(self):
+        # given
+        leaderboard_entries = [MagicMock() for _ in range(0, 2)]
+        self.client.get_leaderboard_entries.return_value = leaderboard_entries
+
+        # and
+        query = (Column('state').isin(['succeeded', 'failed'])) & (parameter('lr') < 0.01)
+
+        # when
+        experiments = self.project.get_experiments(state=['failed', 'aborted'], query=query)
+
+        # then
+        self.client.get_leaderboard_entries.assert_called_once_with(
+            namespace=self.project.namespace, project_name=self.project.name,
+            ids=None, group_ids=None,
+            states=['failed'], owners=None, tags=None,
+            min_running_time=None,
+            sort_by='id', ascending=True, limit=None,
+            page_size=DEFAULT_LEADERBOARD_PAGE_SIZE, max_workers=DEFAULT_MAX_WORKERS,
+            select=query.select)
+
+        # and
+        expected_experiments = [Experiment(self.client, entry) for entry in leaderboard_entries]
+        self.assertEqual(expected_experiments, experiments)
+
+    def test_get_experiments_with_query_matching_nothing(self):
+        # when
+        experiments = self.project.get_experiments(state='succeeded', query=Column('state') == 'failed')
+
+        # then
+        self.assertEqual([], experiments)
+        self.client.get_leaderboard_entries.assert_not_called()
+
     def test_get_leaderboard(self):
         # given
         self.client.get_leaderboard_entries.return_value = [
@@ -139,7 +189,9 @@ class TestProject(unittest.TestCase):
             namespace=self.project.namespace, project_name=self.project.name,
             ids=None, group_ids=None,
             states=None, owners=None, tags=None,
-            min_running_time=None)
+            min_running_time=None,
+            sort_by='id', ascending=True, limit=None,
+            page_size=DEFAULT_LEADERBOARD_PAGE_SIZE, max_workers=DEFAULT_MAX_WORKERS)
 
         # and
         expected_data = {0: some_exp_entry_row, 1: some_grp_entry_row}
@@ -150,6 +202,226 @@ class TestProject(unittest.TestCase):
 
         self.assertTrue(leaderboard.equals(expected_leaderboard))
 
+    def test_get_leaderboard_with_selected_columns(self):
+        # given
+        self.client.get_leaderboard_entries.return_value = [
+            LeaderboardEntry(some_exp_entry_dto), LeaderboardEntry(some_grp_entry_dto)]
+
+        # and
+        parameter_name = some_exp_entry_dto.parameters[0].name
+        channel_name = some_exp_entry_dto.channelsLastValues[0].channelName
+
+        # when
+        leaderboard = self.project.get_leaderboard(columns=['owner'], parameters=[parameter_name],
+                                                   channels=[channel_name])
+
+        # then
+        expected_columns = ['id', 'owner', 'channel_' + channel_name, 'parameter_' + parameter_name]
+        full_leaderboard = self.project.get_leaderboard()
+        self.assertTrue(full_leaderboard[expected_columns].equals(leaderboard))
+
+    def test_iter_experiments(self):
+        # given
+        leaderboard_entries = [MagicMock() for _ in range(0, 3)]
+        self.client.iter_leaderboard_entries.return_value = iter([leaderboard_entries[:2], leaderboard_entries[2:]])
+
+        # when
+        experiments = list(self.project.iter_experiments(state='succeeded', page_size=2))
+
+        # then
+        self.client.iter_leaderboard_entries.assert_called_once_with(
+            namespace=self.project.namespace, project_name=self.project.name,
+            ids=None, group_ids=None,
+            states=['succeeded'], owners=None, tags=None,
+            min_running_time=None,
+            sort_by='id', ascending=True,
+            page_size=2)
+
+        # and
+        expected_experiments = [Experiment(self.client, entry) for entry in leaderboard_entries]
+        self.assertEqual(expected_experiments, experiments)
+
+    def test_iter_leaderboard_chunks(self):
+        # given
+        self.client.iter_leaderboard_entries.return_value = iter([
+            [LeaderboardEntry(some_exp_entry_dto)], [LeaderboardEntry(some_grp_entry_dto)]])
+
+        # when
+        chunks = list(self.project.iter_leaderboard_chunks())
+
+        # then
+        self.assertEqual(2, len(chunks))
+
+        # and
+        expected_data = {0: some_exp_entry_row, 1: some_grp_entry_row}
+        expected_leaderboard = pd.DataFrame.from_dict(data=expected_data, orient='index')
+        expected_leaderboard = expected_leaderboard.reindex(
+            # pylint: disable=protected-access
+            self.project._sort_leaderboard_columns(expected_leaderboard.columns), axis='columns')
+
+        leaderboard = pd.concat(chunks, sort=False).reindex(expected_leaderboard.columns, axis='columns')
+        self.assertTrue(leaderboard.equals(expected_leaderboard))
+
+    def test_iter_experiments_with_query(self):
+        # given
+        leaderboard_entries = [MagicMock() for _ in range(0, 3)]
+        self.client.iter_leaderboard_entries.return_value = iter([leaderboard_entries[:2], leaderboard_entries[2:]])
+
+        # and
+        query = MagicMock()
+        query.server_filters.return_value = {}
+        query.select.side_effect = lambda entries: [entry for entry in entries if entry is not leaderboard_entries[2]]
+
+        # when
+        experiments = list(self.project.iter_experiments(query=query))
+
+        # then
+        expected_experiments = [Experiment(self.client, entry) for entry in leaderboard_entries[:2]]
+        self.assertEqual(expected_experiments, experiments)
+
+    def test_sync_leaderboard(self):
+        # given
+        entry_dtos = [an_experiment_leaderboard_entry_dto() for _ in range(3)]
+        running_dto, finished_dto, new_dto = entry_dtos
+        running_dto.state = 'running'
+
+        # and
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        store_path = os.path.join(directory, 'leaderboard.sqlite')
+
+        # and
+        self.client.fetch_leaderboard_entries.return_value = [
+            LeaderboardEntry(running_dto), LeaderboardEntry(finished_dto)]
+        self.project.sync_leaderboard(store_path)
+
+        # when
+        running_dto.state = 'succeeded'
+        self.client.fetch_leaderboard_entries.return_value = [LeaderboardEntry(running_dto)]
+        self.client.iter_leaderboard_entries.return_value = iter([
+            [LeaderboardEntry(new_dto), LeaderboardEntry(finished_dto)],
+            [LeaderboardEntry(running_dto)]
+        ])
+        leaderboard = self.project.sync_leaderboard(store_path, columns=['owner'])
+
+        # then
+        self.client.fetch_leaderboard_entries.assert_called_with(
+            namespace=self.project.namespace, project_name=self.project.name,
+            ids=[running_dto.shortId], page_size=DEFAULT_LEADERBOARD_PAGE_SIZE, max_workers=1)
+        self.client.iter_leaderboard_entries.assert_called_once_with(
+            namespace=self.project.namespace, project_name=self.project.name,
+            sort_by='created', ascending=False, page_size=DEFAULT_LEADERBOARD_PAGE_SIZE, prefetch=False)
+
+        # and
+        self.assertEqual(sorted(dto.shortId for dto in entry_dtos), sorted(leaderboard['id']))
+        self.assertEqual(['id', 'owner'], list(leaderboard.columns))
+
+        # and
+        with LeaderboardStore(store_path, self.project.full_id) as store:
+            self.assertEqual([], store.unfinished_ids())
+
+    def test_get_numeric_channels_values_in_long_format(self):
+        # given
+        first_entry, second_entry = self._given_experiments_with_channels_values()
+
+        # when
+        values = self.project.get_numeric_channels_values(
+            [Experiment(self.client, first_entry), Experiment(self.client, second_entry)], 'loss', 'acc')
+
+        # then
+        expected_values = pd.DataFrame({
+            'experiment_id': [first_entry.id] * 3 + [second_entry.id],
+            'channel': ['loss', 'loss', 'acc', 'loss'],
+            'x': [1.0, 2.0, 1.0, 1.0],
+            'y': [0.5, 0.4, 0.7, 0.9]
+        }, columns=['experiment_id', 'channel', 'x', 'y'])
+        assert_frame_equal(expected_values, values)
+
+    def test_get_numeric_channels_values_in_wide_format(self):
+        # given
+        first_entry, second_entry = self._given_experiments_with_channels_values()
+        self.client.get_leaderboard_entries.return_value = [first_entry, second_entry]
+
+        # when
+        values = self.project.get_numeric_channels_values({'state': 'succeeded'}, 'loss', 'acc', wide=True)
+
+        # then
+        self.assertEqual(['succeeded'], self.client.get_leaderboard_entries.call_args[1]['states'])
+
+        # and
+        expected_values = pd.DataFrame(
+            [[0.5, 0.7, 0.9], [0.4, np.nan, np.nan]],
+            index=pd.Index([1.0, 2.0], name='x'),
+            columns=pd.MultiIndex.from_tuples(
+                [(first_entry.id, 'loss'), (first_entry.id, 'acc'), (second_entry.id, 'loss')],
+                names=['experiment_id', 'channel']))
+        assert_frame_equal(expected_values, values)
+
+    def test_get_numeric_channels_values_report_errors(self):
+        # given
+        first_entry, second_entry = self._given_experiments_with_channels_values()
+        error = IOError()
+        self.client.get_channel_points_csv.side_effect = error
+
+        # when
+        with self.assertRaises(ChannelValuesFetchError) as context:
+            self.project.get_numeric_channels_values(
+                [Experiment(self.client, first_entry), Experiment(self.client, second_entry)], 'loss')
+
+        # then
+        self.assertEqual({(first_entry.id, 'loss'): error, (second_entry.id, 'loss'): error},
+                         context.exception.errors)
+
+    def _given_experiments_with_channels_values(self):
+        first_entry = a_leaderboard_entry_with_channel_dtos('loss', 'acc')
+        second_entry = a_leaderboard_entry_with_channel_dtos('loss')
+
+        channels_csv = {
+            (first_entry.internal_id, first_entry.channels_dict_by_name['loss'].id): u'1,0.5\n2,0.4',
+            (first_entry.internal_id, first_entry.channels_dict_by_name['acc'].id): u'1,0.7',
+            (second_entry.internal_id, second_entry.channels_dict_by_name['loss'].id): u'1,0.9'
+        }
+        self.client.get_channel_points_csv.side_effect = \
+            lambda experiment_id, channel_id, offset: StringIO(channels_csv[(experiment_id, channel_id)])
+
+        return first_entry, second_entry
+
+    def test_get_hardware_utilization(self):
+        # given
+        first_entry, second_entry = a_leaderboard_entry_with_channel_dtos(), a_leaderboard_entry_with_channel_dtos()
+        metrics_csv = {
+            first_entry.internal_id: b'x_ram,y_ram,x_cpu,y_cpu\n0,1.5,0,10\n5000,2.5,5000,20',
+            second_entry.internal_id: b'x_ram,y_ram,x_gpu_util_0,y_gpu_util_0\n0,4.0,0,90'
+        }
+        self.client.get_metrics_csv.side_effect = lambda experiment_id: BytesIO(metrics_csv[experiment_id])
+        self.client.get_leaderboard_entries.return_value = [first_entry, second_entry]
+
+        # when
+        utilization = self.project.get_hardware_utilization({'state': 'succeeded'}, interval=10, aggregation='max')
+
+        # then
+        expected_utilization = pd.DataFrame({
+            'ram': [2.5, 4.0],
+            'cpu': [20.0, np.nan],
+            'gpu_util_0': [np.nan, 90.0]
+        }, index=pd.MultiIndex.from_tuples([(first_entry.id, 0.0), (second_entry.id, 0.0)],
+                                           names=['experiment_id', 'x']),
+            columns=['ram', 'cpu', 'gpu_util_0'], dtype=np.float32)
+        assert_frame_equal(expected_utilization, utilization)
+
+    def test_get_hardware_utilization_report_errors(self):
+        # given
+        entry = a_leaderboard_entry_with_channel_dtos()
+        error = IOError()
+        self.client.get_metrics_csv.side_effect = error
+
+        # when
+        with self.assertRaises(HardwareUtilizationFetchError) as context:
+            self.project.get_hardware_utilization([Experiment(self.client, entry)])
+
+        # then
+        self.assertEqual({entry.id: error}, context.exception.errors)
+
     def test_sort_leaderboard_columns(self):
         # given
         columns_in_expected_order = [
@@ -197,5 +469,13 @@ class TestProject(unittest.TestCase):
         self.assertEqual('Project({})'.format(self.project.full_id), repr(self.project))
 
 
+def a_leaderboard_entry_with_channel_dtos(*channel_names):
+    entry_dto = an_experiment_leaderboard_entry_dto()
+    entry_dto.channelsLastValues = [a_channel_value() for _ in channel_names]
+    for channel_dto, channel_name in zip(entry_dto.channelsLastValues, channel_names):
+        channel_dto.channelName = channel_name
+    return LeaderboardEntry(entry_dto)
+
+
 if __name__ == '__main__':
     unittest.main()
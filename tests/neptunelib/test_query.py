@@ -0,0 +1,156 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from neptunelib.model import LeaderboardEntry
+from neptunelib.query import Column, channel, merge_server_filters, parameter
+from tests.neptunelib.api_objects_factory import a_channel_value, a_parameter, an_experiment_leaderboard_entry_dto
+
+
+class TestQuery(unittest.TestCase):
+
+    def test_compare_numbers(self):
+        # given
+        leaderboard = pd.DataFrame({'parameter_lr': ['0.1', '0.001', 'auto', np.nan]})
+
+        # expect
+        self.assertEqual([False, True, False, False], list((parameter('lr') < 0.01).evaluate(leaderboard)))
+        self.assertEqual([True, False, False, False], list((parameter('lr') >= 0.01).evaluate(leaderboard)))
+        self.assertEqual([False, False, True, False], list((parameter('lr') == 'auto').evaluate(leaderboard)))
+
+    def test_combine_queries(self):
+        # given
+        leaderboard = pd.DataFrame({
+            'channel_auc': [0.95, 0.8, 0.99, np.nan],
+            'owner': ['neyo', 'neyo', 'kamil', 'neyo']
+        })
+
+        # when
+        query = (channel('auc') > 0.9) & (Column('owner') == 'neyo') | ~Column('channel_auc').notnull()
+
+        # then
+        self.assertEqual([True, False, False, True], list(query.evaluate(leaderboard)))
+        self.assertEqual(['channel_auc', 'owner'], query.column_names)
+
+    def test_missing_column_matches_only_nulls(self):
+        # given
+        leaderboard = pd.DataFrame({'owner': ['neyo', 'kamil']})
+
+        # expect
+        self.assertEqual([False, False], list((parameter('lr') > 0).evaluate(leaderboard)))
+        self.assertEqual([True, True], list(parameter('lr').isnull().evaluate(leaderboard)))
+
+    def test_missing_values_match_only_isnull_and_not_equal(self):
+        # given
+        leaderboard = pd.DataFrame({'parameter_lr': [0.1, np.nan]})
+
+        # expect
+        self.assertEqual([True, False], list((parameter('lr') > 0.01).evaluate(leaderboard)))
+        self.assertEqual([False, False], list((parameter('lr') <= 0.01).evaluate(leaderboard)))
+        self.assertEqual([False, False], list((parameter('lr') == 0.01).evaluate(leaderboard)))
+        self.assertEqual([False, False], list(parameter('lr').isin([0.01]).evaluate(leaderboard)))
+        self.assertEqual([True, True], list((parameter('lr') != 0.01).evaluate(leaderboard)))
+        self.assertEqual([False, True], list(parameter('lr').isnull().evaluate(leaderboard)))
+
+    def test_negation_matches_missing_values(self):
+        # given
+        leaderboard = pd.DataFrame({'parameter_lr': [0.1, 0.001, np.nan]})
+
+        # expect
+        self.assertEqual([False, True, True], list((~(parameter('lr') > 0.01)).evaluate(leaderboard)))
+        self.assertEqual([False, True, False],
+                         list((~(parameter('lr') > 0.01) & parameter('lr').notnull()).evaluate(leaderboard)))
+
+    def test_contains(self):
+        # given
+        leaderboard = pd.DataFrame({'tags': [['unet', 'tta'], [], np.nan]})
+
+        # expect
+        self.assertEqual([True, False, False], list(Column('tags').contains('unet').evaluate(leaderboard)))
+
+    def test_select_leaderboard_entries(self):
+        # given
+        entry_dtos = [an_experiment_leaderboard_entry_dto() for _ in range(3)]
+        for entry_dto, lr, state in zip(entry_dtos, ['0.1', '0.001', '0.0001'], ['succeeded', 'succeeded', 'failed']):
+            lr_parameter = a_parameter()
+            lr_parameter.name = 'lr'
+            lr_parameter.value = lr
+            entry_dto.parameters = [lr_parameter]
+            entry_dto.state = state
+
+        # and
+        entries = [LeaderboardEntry(entry_dto) for entry_dto in entry_dtos]
+
+        # when
+        selected_entries = ((parameter('lr') < 0.01) & (Column('state') == 'succeeded')).select(entries)
+
+        # then
+        self.assertEqual([entries[1]], selected_entries)
+
+    def test_select_on_channels(self):
+        # given
+        entry_dtos = [an_experiment_leaderboard_entry_dto() for _ in range(2)]
+        for entry_dto, auc in zip(entry_dtos, ['0.8', '0.95']):
+            auc_channel = a_channel_value()
+            auc_channel.channelName = 'auc'
+            auc_channel.y = auc
+            entry_dto.channelsLastValues = [auc_channel]
+
+        # and
+        entries = [LeaderboardEntry(entry_dto) for entry_dto in entry_dtos]
+
+        # expect
+        self.assertEqual([entries[1]], (channel('auc') > 0.9).select(entries))
+
+    def test_server_filters_of_conjunction(self):
+        # given
+        query = (Column('state').isin(['succeeded', 'failed'])) & (Column('owner') == 'neyo') \
+                & (Column('running_time') > 59.5) & Column('tags').contains('unet') & (parameter('lr') < 0.1)
+
+        # expect
+        self.assertEqual({
+            'states': ['succeeded', 'failed'],
+            'owners': ['neyo'],
+            'min_running_time': 60,
+            'tags': ['unet']
+        }, query.server_filters())
+
+    def test_no_server_filters_of_alternative_and_negation(self):
+        # given
+        state = Column('state')
+
+        # expect
+        self.assertEqual({}, ((state == 'succeeded') | (state == 'failed')).server_filters())
+        self.assertEqual({}, (~(state == 'succeeded')).server_filters())
+        self.assertEqual({}, (state != 'succeeded').server_filters())
+
+    def test_merge_server_filters(self):
+        # when
+        filters = merge_server_filters(
+            {'states': ['succeeded', 'failed'], 'owners': None, 'tags': ['a'], 'min_running_time': 10},
+            {'states': ['failed', 'aborted'], 'owners': ['neyo'], 'tags': ['b'], 'min_running_time': 20})
+
+        # then
+        self.assertEqual({
+            'states': ['failed'],
+            'owners': ['neyo'],
+            'tags': ['a'],
+            'min_running_time': 20
+        }, filters)
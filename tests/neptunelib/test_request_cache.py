@@ -0,0 +1,164 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import unittest
+
+from mock import MagicMock
+
+from neptunelib.model import LeaderboardEntry
+from neptunelib.request_cache import RequestCache, memoized
+from tests.neptunelib.api_objects_factory import an_experiment_leaderboard_entry_dto
+
+
+class TestRequestCache(unittest.TestCase):
+
+    def setUp(self):
+        super(TestRequestCache, self).setUp()
+        self.now = 0.0
+        self.cache = RequestCache(ttl=10, max_size=2, clock=lambda: self.now)
+
+    def test_serve_cached_results_until_they_expire(self):
+        # given
+        fetch = MagicMock(side_effect=['first', 'second'])
+
+        # when
+        results = [self.cache.get('key', fetch), self.cache.get('key', fetch)]
+
+        # then
+        self.assertEqual(['first', 'first'], results)
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+
+        # when
+        self.now = 10.0
+
+        # then
+        self.assertEqual('second', self.cache.get('key', fetch))
+        self.assertEqual((1, 2), (self.cache.hits, self.cache.misses))
+
+    def test_evict_least_recently_used_results(self):
+        # given
+        self.cache.get('a', lambda: 'a')
+        self.cache.get('b', lambda: 'b')
+        self.cache.get('a', lambda: 'not cached')
+
+        # when
+        self.cache.get('c', lambda: 'c')
+
+        # then
+        self.assertEqual(2, len(self.cache))
+        self.assertEqual('a', self.cache.get('a', lambda: 'not cached'))
+        self.assertEqual('refetched', self.cache.get('b', lambda: 'refetched'))
+
+    def test_invalidate_results_of_method(self):
+        # given
+        self.cache.get(('get_projects', 'a'), lambda: 'projects')
+        self.cache.get(('get_project_members', 'a'), lambda: 'members')
+
+        # when
+        self.cache.invalidate('get_projects')
+
+        # then
+        self.assertEqual('refetched', self.cache.get(('get_projects', 'a'), lambda: 'refetched'))
+        self.assertEqual('members', self.cache.get(('get_project_members', 'a'), lambda: 'not cached'))
+
+        # when
+        self.cache.invalidate()
+
+        # then
+        self.assertEqual(0, len(self.cache))
+
+    def test_return_copies_of_cached_lists(self):
+        # given
+        self.cache.get('key', lambda: [1, 2]).append(3)
+
+        # expect
+        self.assertEqual([1, 2], self.cache.get('key', lambda: None))
+
+    def test_return_copies_of_cached_leaderboard_entries(self):
+        # given
+        entry = LeaderboardEntry(an_experiment_leaderboard_entry_dto())
+        self.cache.get('key', lambda: [entry])[0].parameters.clear()
+
+        # when
+        cached_entry = self.cache.get('key', lambda: None)[0]
+
+        # then
+        self.assertIsNot(entry, cached_entry)
+        self.assertTrue(cached_entry.parameters)
+
+
+class TestMemoized(unittest.TestCase):
+
+    def setUp(self):
+        super(TestMemoized, self).setUp()
+        self.client = ClientStub(RequestCache())
+
+    def test_key_calls_by_normalized_arguments(self):
+        # when
+        self.client.get_entries('project', states=['running', 'failed'])
+        self.client.get_entries(project='project', states=['failed', 'running'], select=None)
+
+        # then
+        self.assertEqual(1, self.client.fetch.call_count)
+
+        # when
+        self.client.get_entries('project', states=['failed'])
+
+        # then
+        self.assertEqual(2, self.client.fetch.call_count)
+
+    def test_key_calls_by_lists_of_ordered_arguments_in_order(self):
+        # when
+        self.client.get_entries('project', columns=['owner', 'tags'])
+        self.client.get_entries('project', columns=['tags', 'owner'])
+
+        # then
+        self.assertEqual(2, self.client.fetch.call_count)
+
+    def test_do_not_cache_calls_with_functions(self):
+        # when
+        self.client.get_entries('project', select=list)
+        self.client.get_entries('project', select=list)
+
+        # then
+        self.assertEqual(2, self.client.fetch.call_count)
+        self.assertEqual(0, len(self.client.request_cache))
+
+    def test_do_not_cache_without_cache(self):
+        # given
+        self.client.request_cache = None
+
+        # when
+        self.client.get_entries('project')
+        self.client.get_entries('project')
+
+        # then
+        self.assertEqual(2, self.client.fetch.call_count)
+
+
+class ClientStub(object):
+
+    def __init__(self, request_cache):
+        self.request_cache = request_cache
+        self.fetch = MagicMock(return_value=[])
+
+    @memoized(unordered=('states',))
+    def get_entries(self, project, states=None, columns=None, select=None):
+        return self.fetch(project, states, columns, select)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -26,7 +26,7 @@ API_TOKEN = 'eyJhcGlfYWRkcmVzcyI6Imh0dHBzOi8vYXBwLnN0YWdlLm5lcHR1bmUubWwiLCJ' \
             'hcGlfa2V5IjoiOTJhNzhiOWQtZTc3Ni00ODlhLWI5YzEtNzRkYmI1ZGVkMzAyIn0='
 
 
-@patch('neptunelib.client.SwaggerClient.from_url', MagicMock())
+@patch('neptunelib.client.load_url', MagicMock())
 @patch('neptunelib.client.NeptuneAuthenticator', MagicMock())
 class TestSession(unittest.TestCase):
     # pylint: disable=protected-access,no-member
@@ -0,0 +1,126 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from mock import MagicMock
+
+from neptunelib.swagger_spec_cache import SwaggerSpecCache
+from tests.neptunelib.random_utils import a_string
+
+SPEC_URL = 'https://app.neptune.ml/api/backend/swagger.json'
+
+
+class TestSwaggerSpecCache(unittest.TestCase):
+
+    def setUp(self):
+        super(TestSwaggerSpecCache, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.spec = {'swagger': '2.0', 'info': {'title': a_string()}}
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        super(TestSwaggerSpecCache, self).tearDown()
+
+    def test_serve_spec_from_disk(self):
+        # given
+        fetch_spec = MagicMock(return_value=self.spec)
+
+        # when
+        SwaggerSpecCache(self.directory).get_spec(SPEC_URL, fetch_spec)
+        spec = SwaggerSpecCache(self.directory).get_spec(SPEC_URL, fetch_spec)
+
+        # then
+        self.assertEqual(self.spec, spec)
+        fetch_spec.assert_called_once_with()
+
+    def test_fetch_stale_spec_again(self):
+        # given
+        fetch_spec = MagicMock(return_value=self.spec)
+        cache = SwaggerSpecCache(self.directory, ttl=-1)
+
+        # when
+        cache.get_spec(SPEC_URL, fetch_spec)
+        cache.get_spec(SPEC_URL, fetch_spec)
+
+        # then
+        self.assertEqual(2, fetch_spec.call_count)
+
+    def test_fetch_modified_spec_again(self):
+        # given
+        fetch_spec = MagicMock(return_value=self.spec)
+        cache = SwaggerSpecCache(self.directory)
+        cache.get_spec(SPEC_URL, fetch_spec)
+
+        # and
+        path = os.path.join(self.directory, os.listdir(self.directory)[0])
+        with open(path) as f:
+            entry = json.load(f)
+        entry['spec']['info']['title'] = a_string()
+        with open(path, 'w') as f:
+            json.dump(entry, f)
+
+        # when
+        spec = cache.get_spec(SPEC_URL, fetch_spec)
+
+        # then
+        self.assertEqual(self.spec, spec)
+        self.assertEqual(2, fetch_spec.call_count)
+
+    def test_fetch_invalidated_spec_again(self):
+        # given
+        fetch_spec = MagicMock(return_value=self.spec)
+        cache = SwaggerSpecCache(self.directory)
+        cache.get_spec(SPEC_URL, fetch_spec)
+
+        # when
+        cache.invalidate(SPEC_URL)
+        cache.get_spec(SPEC_URL, fetch_spec)
+
+        # then
+        self.assertEqual(2, fetch_spec.call_count)
+
+    def test_keep_specs_of_different_urls_apart(self):
+        # given
+        other_spec = {'swagger': '2.0', 'info': {'title': a_string()}}
+        cache = SwaggerSpecCache(self.directory)
+
+        # when
+        cache.get_spec(SPEC_URL, lambda: self.spec)
+        spec = cache.get_spec(SPEC_URL.replace('backend', 'leaderboard'), lambda: other_spec)
+
+        # then
+        self.assertEqual(other_spec, spec)
+
+    def test_fetch_spec_when_directory_cannot_be_created(self):
+        # given
+        blocking_file = os.path.join(self.directory, 'file')
+        open(blocking_file, 'w').close()
+        cache = SwaggerSpecCache(os.path.join(blocking_file, 'specs'))
+
+        # when
+        spec = cache.get_spec(SPEC_URL, lambda: self.spec)
+
+        # then
+        self.assertEqual(self.spec, spec)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+#
+# Copyright (c) 2019, Neptune Labs Sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import unittest
+
+from neptunelib.client import Client
+from neptunelib.transport import HttpTransport
+from tests.neptunelib.random_utils import a_uuid_string
+
+API_ADDRESS = 'https://app.neptune.ml'
+
+
+class TestHttpTransport(unittest.TestCase):
+
+    def test_share_connections_between_clients(self):
+        # given
+        transport = HttpTransport()
+
+        # when
+        client = Client(API_ADDRESS, a_uuid_string(), transport=transport)
+        other_client = Client(API_ADDRESS, a_uuid_string(), transport=transport)
+
+        # then
+        # pylint: disable=protected-access
+        session, other_session = client._http_client.session, other_client._http_client.session
+        self.assertIs(session.get_adapter(API_ADDRESS), other_session.get_adapter(API_ADDRESS))
+        self.assertIsNot(client._http_client, other_client._http_client)
+
+    def test_keep_sessions_of_clients_apart(self):
+        # given
+        transport = HttpTransport()
+        session, other_session = transport.http_client().session, transport.http_client().session
+
+        # when
+        session.cookies.set('token', 'secret')
+        session.headers['X-Custom'] = 'value'
+
+        # then
+        self.assertIsNot(session, other_session)
+        self.assertEqual(0, len(other_session.cookies))
+        self.assertNotIn('X-Custom', other_session.headers)
+
+    def test_size_connection_pool_of_client(self):
+        # when
+        client = Client(API_ADDRESS, a_uuid_string(), connection_pool_size=4)
+
+        # then
+        # pylint: disable=protected-access
+        self.assertEqual(4, client.transport.adapter._pool_maxsize)
+
+        # expect
+        with self.assertRaises(ValueError):
+            Client(API_ADDRESS, a_uuid_string(), transport=HttpTransport(), connection_pool_size=4)
+
+    def test_configure_connection_pool(self):
+        # when
+        transport = HttpTransport(pool_size=32, pool_block=True)
+
+        # then
+        adapter = transport.new_session().get_adapter(API_ADDRESS)
+        # pylint: disable=protected-access
+        self.assertEqual(32, adapter._pool_connections)
+        self.assertEqual(32, adapter._pool_maxsize)
+        self.assertTrue(adapter._pool_block)
+
+    def test_retry_with_backoff(self):
+        # when
+        transport = HttpTransport(max_retries=5, retry_backoff_factor=2)
+
+        # then
+        retry = transport.new_session().get_adapter(API_ADDRESS).max_retries
+        self.assertEqual(5, retry.total)
+        self.assertEqual(2, retry.backoff_factor)
+        self.assertIn(503, retry.status_forcelist)
+
+    def test_negotiate_compression(self):
+        # expect
+        self.assertEqual('gzip, deflate', HttpTransport().new_session().headers['Accept-Encoding'])
+        self.assertEqual('identity', HttpTransport(compression=False).new_session().headers['Accept-Encoding'])
+
+    def test_keep_connections_alive(self):
+        # expect
+        self.assertEqual('keep-alive', HttpTransport().new_session().headers['Connection'])
+        self.assertEqual('close', HttpTransport(keep_alive=False).new_session().headers['Connection'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -21,7 +21,7 @@ import pandas as pd
 from pandas.util.testing import assert_frame_equal
 
 from neptunelib.utils import map_keys, map_values, as_list, align_channels_on_x, get_channel_name_stems, \
-    merge_dataframes
+    merge_dataframes, _split_df_by_stems
 from tests.neptunelib.random_utils import sort_df_by_columns
 
 
@@ -159,6 +159,53 @@ class TestAlignChannelsOnX(unittest.TestCase):
 
         assert_frame_equal(result, expected_result)
 
+    def test_same_as_merges(self):
+        # given
+        np.random.seed(1234)
+        df = pd.DataFrame({'x_batch_channel': np.random.permutation(100),
+                           'y_batch_channel': np.random.random(100),
+                           'x_epoch_channel': np.r_[np.random.choice(200, 30, replace=False), [np.nan] * 70],
+                           'y_epoch_channel': np.r_[np.random.random(30), [np.nan] * 70]}, dtype=float)
+
+        # and
+        # pylint: disable=protected-access
+        channel_dfs, common_x = _split_df_by_stems(df)
+        expected_result = sort_df_by_columns(merge_dataframes([common_x] + channel_dfs, on='x', how='outer'))
+
+        # when
+        result = sort_df_by_columns(align_channels_on_x(df))
+
+        # then
+        assert_frame_equal(result, expected_result)
+
+    def test_repeated_x(self):
+        # given
+        df = pd.DataFrame({'x_batch_channel': [1, 1, 2],
+                           'y_batch_channel': [3, 4, 5],
+                           'x_epoch_channel': [1, 2, np.nan],
+                           'y_epoch_channel': [6, 7, np.nan]}, dtype=float)
+
+        expected_result = pd.DataFrame({'x': [1, 1, 2],
+                                        'batch_channel': [3, 4, 5],
+                                        'epoch_channel': [6, 6, 7]}, dtype=float)
+        expected_result = sort_df_by_columns(expected_result)
+
+        # when
+        result = sort_df_by_columns(align_channels_on_x(df))
+
+        # then
+        assert_frame_equal(result, expected_result)
+
+    def test_no_values(self):
+        # given
+        df = pd.DataFrame(columns=['x_batch_channel', 'y_batch_channel'], dtype=float)
+
+        # when
+        result = align_channels_on_x(df)
+
+        # then
+        assert_frame_equal(result, pd.DataFrame(columns=['x', 'batch_channel'], dtype=float), check_index_type=False)
+
 
 class TestGetChannelNameStems(unittest.TestCase):
 